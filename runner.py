@@ -2,8 +2,11 @@ import argparse
 import json
 import os
 
+from spear.analysis.alias.memory_profile import MemoryProfiler
 from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.optimizer import Optimizer
 from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.alias.timing import PhaseTimer
 
 if __name__ == "__main__":
     print("Welcome to Spear!")
@@ -41,6 +44,26 @@ if __name__ == "__main__":
                             will be included. If in module mode, only modules under current directory will be 
                             included."""
                            )
+    argparser.add_argument("-O", "--optimize",
+                           action="store_true",
+                           default=False,
+                           help="Run copy propagation and dead temporary removal on the IR before Point-to Analysis."
+                           )
+    argparser.add_argument("--memory-profile",
+                           metavar="REPORT",
+                           help="Trace memory with tracemalloc and write a JSON report of traced memory, live "
+                                "objects of each Spear type and the top allocation sites after lowering, "
+                                "solving and export. The analysis gets several times slower."
+                           )
+    argparser.add_argument("--timing",
+                           metavar="REPORT",
+                           help="Write wall and CPU time of each phase (lower, optimize, solve, export) as JSON."
+                           )
+    argparser.add_argument("--profile",
+                           metavar="DIR",
+                           help="Profile each phase with cProfile, and write the stats to DIR/<phase>.pstats, "
+                                "which can be read with pstats."
+                           )
     argparser.add_argument("--include",
                            help="Specify a string, then output callgraph only contains callers that "
                                 "start with this string."
@@ -52,36 +75,54 @@ if __name__ == "__main__":
         print("Error: No entry point is provided.")
         exit()
 
+    profiler = MemoryProfiler() if args.memory_profile else None
+    timer = PhaseTimer(args.profile)
     # mm = ModuleManager(args.path, verbose=True, dependency=not args.no_dependency)
-    mm = ModuleManager(args.path, verbose=True)
-    try:
-        if args.all_files:
-            for file in os.listdir(args.path):
-                _, ext = os.path.splitext(file)
-                if ext == ".py":
+    with timer.phase("lower"):
+        mm = ModuleManager(args.path, verbose=True)
+        try:
+            if args.all_files:
+                for file in os.listdir(args.path):
+                    _, ext = os.path.splitext(file)
+                    if ext == ".py":
+                        mm.addEntry(file=file)
+            if args.files:
+                for file in args.files:
                     mm.addEntry(file=file)
-        if args.files:
-            for file in args.files:
-                mm.addEntry(file=file)
-        if args.modules:
-            for module in args.modules:
-                mm.addEntry(module=module)
-    # except ModuleNotFoundException as e:
-    #    print(f"Error: {e}")
-    #    exit()
-    except ValueError as e:
-        print(f"Error: {e}")
-        exit()
+            if args.modules:
+                for module in args.modules:
+                    mm.addEntry(module=module)
+        # except ModuleNotFoundException as e:
+        #    print(f"Error: {e}")
+        #    exit()
+        except ValueError as e:
+            print(f"Error: {e}")
+            exit()
+        mm.progress.clear()
+
+    if args.optimize:
+        code_blocks = mm.allCodeBlocks(nested=True)
+        before = sum(len(cb.stmts) for cb in code_blocks)
+        with timer.phase("optimize"):
+            Optimizer(code_blocks).start()
+        after = sum(len(cb.stmts) for cb in code_blocks)
+        print(f"IR optimization removed {before - after} of {before} statements.")
 
+    if profiler:
+        profiler.snapshot("lower")
     print("IR generation is done, start Point-to Analysis...                ")
     analysis = Analysis(verbose=True)
     # analysis = Analysis(verbose=True)
 
     entrys = mm.getEntrys()
-    analysis.analyze(entrys)
+    with timer.phase("solve"):
+        analysis.analyze(entrys)
+    if profiler:
+        profiler.snapshot("solve", analysis)
     print("Point-to Analysis is done, start writing to file                ")
 
-    print(analysis.pointToSet.to_json())
+    with timer.phase("export"):
+        print(analysis.pointToSet.to_json())
 
     # fp = open(args.output, "w")
     # callgraph = analysis.callgraph.export()  # In some version of Python3, no export() method?
@@ -90,4 +131,16 @@ if __name__ == "__main__":
     # json.dump(callgraph, fp, indent=4)
     # fp.close()
 
+    if profiler:
+        profiler.snapshot("export", analysis)
+        profiler.stop()
+        profiler.dump(args.memory_profile)
+        print(profiler.summary())
+        print(f"Memory profile is written to {args.memory_profile}")
+
+    print(timer.summary())
+    if args.timing:
+        timer.dump(args.timing)
+        print(f"Timing report is written to {args.timing}")
+
     print("All done.")
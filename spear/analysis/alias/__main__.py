@@ -2,8 +2,16 @@ import argparse
 import json
 import os
 
+from spear.analysis.alias.entries import solveEntries
+from spear.analysis.alias.memory_profile import MemoryProfiler
 from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.optimizer import Optimizer
 from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.alias.timing import PhaseTimer
+from spear.analysis.alias.pta import snapshot
+from spear.analysis.alias.slicer import Slicer
+from spear.analysis.callgraph.assignment_graph import AssignmentGraph
+from spear.analysis.callgraph.unification import Unification
 
 if __name__ == "__main__":
     argparser = argparse.ArgumentParser()
@@ -28,7 +36,27 @@ if __name__ == "__main__":
                            )
     argparser.add_argument("-o", "--output",
                            required=True,
-                           help="The file path where output callgraph will be stored. The output format will be json."
+                           help="The file path where output callgraph will be stored. The output format will be json. "
+                                "With --per-entry, the directory where the callgraph of each entry will be stored."
+                           )
+    argparser.add_argument("--per-entry",
+                           action="store_true",
+                           default=False,
+                           help="Solve each entry point on its own and write its callgraph to OUTPUT/<entry>.json, "
+                                "where scripts are named by their path and modules by their name. Modules are lowered "
+                                "once, and entries are solved in forked processes sharing the IR."
+                           )
+    argparser.add_argument("-j", "--jobs",
+                           type=int,
+                           help="With --per-entry, the number of entries solved at the same time. "
+                                "Defaults to the number of CPUs."
+                           )
+    argparser.add_argument("--format",
+                           choices=["json", "binary"],
+                           default="json",
+                           help="Output format. \"binary\" writes a memory-mappable snapshot holding both "
+                                "point-to sets and the callgraph, which can be read with "
+                                "spear.analysis.alias.pta.snapshot.SnapshotReader."
                            )
     argparser.add_argument("-nd", "--no-dependency",
                            action="store_true",
@@ -37,6 +65,62 @@ if __name__ == "__main__":
                             will be included. If in module mode, only modules under current directory will be 
                             included."""
                            )
+    argparser.add_argument("--engine",
+                           choices=["pta", "assignment", "unification"],
+                           default="pta",
+                           help="\"pta\" runs the full Point-to Analysis. \"assignment\" builds a cheaper and less "
+                                "precise call graph by propagating only functions, classes and modules over the "
+                                "assignment graph of the IR, in the style of PyCG. \"unification\" builds an "
+                                "over-approximate call graph in near-linear time by unifying everything that is "
+                                "assigned, in the style of Steensgaard, for very large code bases."
+                           )
+    argparser.add_argument("--partition",
+                           metavar="REPORT",
+                           help="With the unification engine, write the equivalence class of each variable as JSON, "
+                                "a map from variable id to class index."
+                           )
+    argparser.add_argument("--collapse-literals",
+                           type=int,
+                           default=0,
+                           metavar="N",
+                           help="Lower literals made only of constants with more than N elements, counting nested "
+                                "ones, to a single object, which shrinks the IR of data tables. No callee is lost, "
+                                "but whatever is stored into one of its nested literals is seen in all of them."
+                           )
+    argparser.add_argument("--tuple-index-limit",
+                           type=int,
+                           default=0,
+                           metavar="N",
+                           help="Only track the first and last N elements of a tuple by index, the others share a "
+                                "single field. Large tuples and deep unpacking get fewer attribute pointers."
+                           )
+    argparser.add_argument("-O", "--optimize",
+                           action="store_true",
+                           default=False,
+                           help="Run copy propagation and dead temporary removal on the IR before Point-to Analysis."
+                           )
+    argparser.add_argument("--slice",
+                           action="store_true",
+                           default=False,
+                           help="Drop IR statements that cannot affect which functions are called before solving. "
+                                "The callgraph is the same, but point-to sets are only complete for variables it "
+                                "depends on."
+                           )
+    argparser.add_argument("--memory-profile",
+                           metavar="REPORT",
+                           help="Trace memory with tracemalloc and write a JSON report of traced memory, live "
+                                "objects of each Spear type and the top allocation sites after lowering, "
+                                "solving and export. The analysis gets several times slower."
+                           )
+    argparser.add_argument("--timing",
+                           metavar="REPORT",
+                           help="Write wall and CPU time of each phase (lower, optimize, slice, solve, export) as JSON."
+                           )
+    argparser.add_argument("--profile",
+                           metavar="DIR",
+                           help="Profile each phase with cProfile, and write the stats to DIR/<phase>.pstats, "
+                                "which can be read with pstats."
+                           )
     argparser.add_argument("--include",
                            help="Specify a string, then output callgraph only contains callers that "
                                 "start with this string."
@@ -47,40 +131,102 @@ if __name__ == "__main__":
     if not args.files and not args.modules and not args.all_files:
         print("Error: No entry point is provided.")
         exit()
+    if args.format == "binary" and args.engine != "pta":
+        print("Error: Only the pta engine has point-to sets to write in binary format.")
+        exit()
+    if args.partition and args.engine != "unification":
+        print("Error: Only the unification engine has a partition to write.")
+        exit()
+    if args.per_entry and (args.format == "binary" or args.partition or args.memory_profile):
+        print("Error: --per-entry only writes callgraphs, and can't be used with binary format, --partition or "
+              "--memory-profile.")
+        exit()
 
-    fp = open(args.output, "w")
-
-    mm = ModuleManager(args.path, verbose=True, dependency=not args.no_dependency)
-    try:
-        if args.all_files:
-            for file in os.listdir(args.path):
-                _, ext = os.path.splitext(file)
-                if ext == ".py":
+    profiler = MemoryProfiler() if args.memory_profile else None
+    timer = PhaseTimer(args.profile)
+    # external modules are one level deeper than those under PATH
+    with timer.phase("lower"):
+        mm = ModuleManager(args.path, max_depth=0 if args.no_dependency else 9999, verbose=True,
+                           literal_limit=args.collapse_literals, tuple_index_limit=args.tuple_index_limit)
+        try:
+            if args.all_files:
+                for file in os.listdir(args.path):
+                    _, ext = os.path.splitext(file)
+                    if ext == ".py":
+                        mm.addEntry(file=file)
+            if args.files:
+                for file in args.files:
                     mm.addEntry(file=file)
-        if args.files:
-            for file in args.files:
-                mm.addEntry(file=file)
-        if args.modules:
-            for module in args.modules:
-                mm.addEntry(module=module)
-    # except ModuleNotFoundException as e:
-    #    print(f"Error: {e}")
-    #    exit()
-    except ValueError as e:
-        print(f"Error: {e}")
-        exit()
+            if args.modules:
+                for module in args.modules:
+                    mm.addEntry(module=module)
+        # except ModuleNotFoundException as e:
+        #    print(f"Error: {e}")
+        #    exit()
+        except ValueError as e:
+            print(f"Error: {e}")
+            exit()
+        mm.progress.clear()
 
+    if args.optimize:
+        code_blocks = mm.allCodeBlocks(nested=True)
+        before = sum(len(cb.stmts) for cb in code_blocks)
+        with timer.phase("optimize"):
+            Optimizer(code_blocks).start()
+        after = sum(len(cb.stmts) for cb in code_blocks)
+        print(f"IR optimization removed {before - after} of {before} statements.")
+
+    if args.slice:
+        code_blocks = mm.allCodeBlocks(nested=True)
+        before = sum(len(cb.stmts) for cb in code_blocks)
+        with timer.phase("slice"):
+            Slicer(code_blocks).start()
+        after = sum(len(cb.stmts) for cb in code_blocks)
+        print(f"IR slicing removed {before - after} of {before} statements.")
+
+    if profiler:
+        profiler.snapshot("lower")
     print("IR generation is done, start Point-to Analysis...                ")
-    analysis = Analysis(verbose=True)
+    engine = {"pta": Analysis, "assignment": AssignmentGraph, "unification": Unification}[args.engine]
+    if args.per_entry:
+        with timer.phase("solve"):
+            results = solveEntries(mm, args.output, engine, args.jobs, args.include)
+        for res in results:
+            print(f"{res['entry']}: {res['callgraph_edges']} edges, solved in {res['solve_seconds']:.2f}s, "
+                  f"written to {res['output']}")
+    else:
+        analysis = engine(verbose=True)
+        entrys = mm.getEntrys()
+        with timer.phase("solve"):
+            analysis.analyze(entrys)
+        if profiler:
+            profiler.snapshot("solve", analysis)
+        print("Point-to Analysis is done, start writing to file                ")
+
+        with timer.phase("export"):
+            callgraph = {k: list(v) for k, v in analysis.callgraph.items()}
+            if args.include:
+                callgraph = {k: v for k, v in callgraph.items() if k.startswith(args.include)}
+            if args.format == "binary":
+                with open(args.output, "wb") as fp:
+                    snapshot.dump(analysis.pointToSet, callgraph, fp)
+            else:
+                with open(args.output, "w") as fp:
+                    json.dump(callgraph, fp, indent=4)
+            if args.partition:
+                with open(args.partition, "w") as fp:
+                    json.dump(analysis.partition(), fp, indent=4)
 
-    entrys = mm.getEntrys()
-    analysis.analyze(entrys)
-    print("Point-to Analysis is done, start writing to file                ")
+        if profiler:
+            profiler.snapshot("export", analysis)
+            profiler.stop()
+            profiler.dump(args.memory_profile)
+            print(profiler.summary())
+            print(f"Memory profile is written to {args.memory_profile}")
 
-    callgraph = analysis.callgraph.export()
-    if args.include:
-        callgraph = {k: v for k, v in callgraph.items() if k.startswith(args.include)}
-    json.dump(callgraph, fp, indent=4)
-    fp.close()
+    print(timer.summary())
+    if args.timing:
+        timer.dump(args.timing)
+        print(f"Timing report is written to {args.timing}")
 
     print("All done.")
@@ -0,0 +1,188 @@
+"""
+Analyze a corpus of projects in one invocation.
+
+The manifest is a JSON file listing the projects, each with its path (relative to the manifest) and its entry
+points, given like -f, -m and -a of spear.analysis.alias:
+    {"projects": [{"name": "service", "path": "repos/service", "files": ["main.py"], "modules": ["tool"]},
+                  {"name": "scripts", "path": "repos/scripts", "all_files": true}]}
+
+Projects are scheduled on a pool of worker processes, which live across projects. Each worker keeps the modules it
+lowered from the external path, mostly the standard library, and reuses them in later projects. A project is
+stopped after --timeout seconds, and a worker whose address space grows over --memory-limit fails its project and
+drops its cache. The callgraph of each project is written to OUTPUT/<name>.json, and a summary of all of them to
+OUTPUT/summary.json.
+
+Usage:
+    python -m spear.analysis.alias.corpus MANIFEST -o OUTPUT [-j JOBS] [--timeout SECONDS] [--memory-limit MB]
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import resource
+import signal
+import time
+
+from spear.analysis.alias.module_manager import LoweringCache, ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.callgraph.assignment_graph import AssignmentGraph
+from spear.analysis.callgraph.unification import Unification
+
+ENGINES = {"pta": Analysis, "assignment": AssignmentGraph, "unification": Unification}
+
+# per worker process, set by initWorker
+_cache: LoweringCache = None
+_settings: dict = None
+
+
+class ProjectTimeout(Exception):
+    pass
+
+
+def _alarm(signum, frame):
+    raise ProjectTimeout()
+
+
+def initWorker(settings: dict):
+    global _cache, _settings
+    _cache = LoweringCache()
+    _settings = settings
+    signal.signal(signal.SIGALRM, _alarm)
+    if settings["memory_limit"]:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (settings["memory_limit"], hard))
+
+
+def addEntries(module_manager: ModuleManager, project: dict):
+    if project.get("all_files"):
+        for file in sorted(os.listdir(module_manager.cwd)):
+            if os.path.splitext(file)[1] == ".py":
+                module_manager.addEntry(file=file)
+    for file in project.get("files", ()):
+        module_manager.addEntry(file=file)
+    for module in project.get("modules", ()):
+        module_manager.addEntry(module=module)
+    if not module_manager.entrys:
+        raise ValueError("No entry point is provided.")
+
+
+def analyzeProject(project: dict) -> dict:
+    global _cache
+    res = {"name": project["name"], "status": "ok"}
+    hits, misses = _cache.hits, _cache.misses
+    signal.alarm(_settings["timeout"])
+    try:
+        start = time.perf_counter()
+        module_manager = ModuleManager(project["path"], max_depth=0 if _settings["no_dependency"] else 9999,
+                                       cache=_cache)
+        addEntries(module_manager, project)
+        res["lower_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        analysis = ENGINES[_settings["engine"]]()
+        analysis.analyze(module_manager.getEntrys())
+        res["solve_seconds"] = time.perf_counter() - start
+        signal.alarm(0)
+
+        callgraph = {k: list(v) for k, v in analysis.callgraph.items()}
+        with open(os.path.join(_settings["output"], f"{project['name']}.json"), "w") as fp:
+            json.dump(callgraph, fp, indent=4)
+        res["modules"] = len(module_manager.modules)
+        res["callgraph_edges"] = sum(len(callees) for callees in callgraph.values())
+    except ProjectTimeout:
+        res["status"] = "timeout"
+    except MemoryError:
+        res["status"] = "memory"
+        # the cache is the bulk of what a worker keeps, start over without it
+        _cache = LoweringCache()
+        gc.collect()
+    except Exception as e:
+        res["status"] = "error"
+        res["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        signal.alarm(0)
+    res["cached_modules"] = _cache.hits - hits
+    res["lowered_modules"] = _cache.misses - misses
+    return res
+
+
+def analyzeCorpus(projects: list, output: str, jobs: int = None, timeout: int = 0, memory_limit: int = 0,
+                  engine: str = "pta", no_dependency: bool = False) -> list:
+    os.makedirs(output, exist_ok=True)
+    settings = {
+        "output": output,
+        "timeout": timeout,
+        "memory_limit": memory_limit,
+        "engine": engine,
+        "no_dependency": no_dependency,
+    }
+    with multiprocessing.Pool(jobs or os.cpu_count(), initializer=initWorker, initargs=(settings,)) as pool:
+        results = list(pool.imap_unordered(analyzeProject, projects))
+    order = {project["name"]: i for i, project in enumerate(projects)}
+    results.sort(key=lambda res: order[res["name"]])
+    return results
+
+
+def summary(results: list) -> str:
+    lines = [f"{'project':<24} {'status':<8} {'modules':>8} {'edges':>8} {'lower':>8} {'solve':>8} "
+             f"{'cached':>7} {'lowered':>8}"]
+    for res in results:
+        lines.append(f"{res['name']:<24} {res['status']:<8} {res.get('modules', '-'):>8} "
+                     f"{res.get('callgraph_edges', '-'):>8} {res.get('lower_seconds', 0):>7.2f}s "
+                     f"{res.get('solve_seconds', 0):>7.2f}s {res['cached_modules']:>7} {res['lowered_modules']:>8}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("manifest",
+                           help="A JSON file listing the projects to analyze."
+                           )
+    argparser.add_argument("-o", "--output",
+                           required=True,
+                           help="The directory where the callgraph of each project and the summary will be stored."
+                           )
+    argparser.add_argument("-j", "--jobs",
+                           type=int,
+                           help="The number of worker processes. Defaults to the number of CPUs."
+                           )
+    argparser.add_argument("--timeout",
+                           type=int,
+                           default=0,
+                           help="Stop a project after this many seconds. No limit by default."
+                           )
+    argparser.add_argument("--memory-limit",
+                           type=int,
+                           default=0,
+                           metavar="MB",
+                           help="Limit the address space of each worker, including its cache. No limit by default."
+                           )
+    argparser.add_argument("--engine",
+                           choices=list(ENGINES),
+                           default="pta",
+                           help="The call graph engine, see spear.analysis.alias."
+                           )
+    argparser.add_argument("-nd", "--no-dependency",
+                           action="store_true",
+                           default=False,
+                           help="Only analyze modules under the path of each project."
+                           )
+    args = argparser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    root = os.path.dirname(os.path.abspath(args.manifest))
+    projects = [dict(project, path=os.path.join(root, project["path"])) for project in manifest["projects"]]
+
+    start = time.perf_counter()
+    results = analyzeCorpus(projects, args.output, args.jobs, args.timeout, args.memory_limit * 2 ** 20,
+                            args.engine, args.no_dependency)
+    with open(os.path.join(args.output, "summary.json"), "w") as fp:
+        json.dump(results, fp, indent=4)
+
+    print(summary(results))
+    failed = sum(res["status"] != "ok" for res in results)
+    print(f"{len(results) - failed} of {len(results)} projects analyzed in {time.perf_counter() - start:.2f}s, "
+          f"summary is written to {os.path.join(args.output, 'summary.json')}")
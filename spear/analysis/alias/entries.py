@@ -0,0 +1,80 @@
+import gc
+import json
+import multiprocessing
+import os
+import time
+from typing import List
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+
+# Set in the parent right before forking, so that workers inherit the lowered IR instead of receiving a copy.
+_moduleManager: ModuleManager = None
+_engine = None
+_outputDir: str = None
+_include: str = None
+
+
+# file name of the callgraph of an entry, scripts by their path under the working directory and modules by name
+def entryName(module_manager: ModuleManager, index: int) -> str:
+    m = module_manager.entrys[index]
+    if m.__name__.startswith("__main") and m.__file__:
+        name = os.path.splitext(os.path.relpath(m.__file__, module_manager.cwd))[0]
+        return name.replace(os.sep, ".")
+    return m.__name__
+
+
+# scripts after the first are loaded as __main1__, __main2__, ..., but each one runs as __main__ on its own
+def renameMain(callgraph: dict, module_name: str) -> dict:
+    def rename(name: str) -> str:
+        if name == module_name or name.startswith(module_name + "."):
+            return "__main__" + name[len(module_name):]
+        return name
+
+    return {rename(caller): [rename(callee) for callee in callees] for caller, callees in callgraph.items()}
+
+
+def solveEntry(index: int) -> dict:
+    entry = _moduleManager.entrys[index].__codeBlock__
+    analysis = _engine()
+    start = time.perf_counter()
+    analysis.analyze([entry])
+    seconds = time.perf_counter() - start
+
+    callgraph = {k: list(v) for k, v in analysis.callgraph.items()}
+    if entry.readable_name.startswith("__main"):
+        callgraph = renameMain(callgraph, entry.readable_name)
+    if _include:
+        callgraph = {k: v for k, v in callgraph.items() if k.startswith(_include)}
+    name = entryName(_moduleManager, index)
+    path = os.path.join(_outputDir, f"{name}.json")
+    with open(path, "w") as fp:
+        json.dump(callgraph, fp, indent=4)
+    return {
+        "entry": name,
+        "output": path,
+        "callgraph_edges": sum(len(callees) for callees in callgraph.values()),
+        "solve_seconds": seconds,
+    }
+
+
+# Solve every entry of module_manager on its own, and write its callgraph to OUTPUT_DIR/<entry>.json.
+# Workers are forked after lowering and share the IR copy-on-write. The solver appends statements to the IR
+# it analyzes, so each worker solves only one entry and exits, and the next one is forked from the clean IR.
+def solveEntries(module_manager: ModuleManager, output_dir: str, engine=Analysis, jobs: int = None,
+                 include: str = None) -> List[dict]:
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise RuntimeError("Solving entries separately needs the fork start method, which isn't available here.")
+    global _moduleManager, _engine, _outputDir, _include
+    _moduleManager, _engine, _outputDir, _include = module_manager, engine, output_dir, include
+    os.makedirs(output_dir, exist_ok=True)
+
+    # objects moved to the permanent generation are never scanned by the collector, so their pages stay shared
+    gc.freeze()
+    try:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(jobs or os.cpu_count(), maxtasksperchild=1) as pool:
+            return list(pool.imap(solveEntry, range(len(module_manager.entrys))))
+    finally:
+        gc.unfreeze()
+        _moduleManager = _engine = _outputDir = _include = None
@@ -1,3 +1,5 @@
+import itertools
+import sys
 import typing
 from typing import Any, Dict, List, Tuple, Union
 
@@ -7,11 +9,19 @@ if typing.TYPE_CHECKING:
     from spear.analysis.alias.ir.class_code_block import ClassCodeBlock
     from spear.analysis.alias.ir.module_code_block import ModuleCodeBlock
 
+# Every variable and statement gets a globally unique integer when created, which is used in hashing and
+# comparing, so that putting them into sets and dicts never formats a string.
+_uids = itertools.count()
 
+
+# Variables and statements are the bulk of the IR, so they are slotted. Names are interned, and the
+# qualified id and readable name of a variable are only formatted when they are asked for.
 class Variable:
-    id: str  # include belongsTo's id
+    __slots__ = ("name", "belongsTo", "uid", "isTmp", "_id")
+
+    name: str
+    uid: int
     belongsTo: 'CodeBlock'  # 'CodeBlock' to which it belongs
-    readable_name: str
     isTmp: bool
 
     def __str__(self):
@@ -21,39 +31,59 @@ class Variable:
         return f"Variable: {self.id}"
 
     def __init__(self, name: str, belongs_to: 'CodeBlock', temp=False):
-        # self.name = name
+        self.name = sys.intern(name)
         self.belongsTo = belongs_to
-        self.readable_name = f"{name}@{belongs_to.readable_name}"
-        self.id = f"{name}@{belongs_to.id}"
+        self.uid = next(_uids)
         self.isTmp = temp
+        self._id = None
+
+    # include belongsTo's id
+    @property
+    def id(self) -> str:
+        if self._id is None:
+            self._id = f"{self.name}@{self.belongsTo.id}"
+        return self._id
+
+    @property
+    def readable_name(self) -> str:
+        return f"{self.name}@{self.belongsTo.readable_name}"
 
     def __eq__(self, other):
-        return isinstance(other, Variable) and self.id == self.id
+        return isinstance(other, Variable) and self.uid == other.uid
 
     def __hash__(self):
-        return hash((self.id, self.belongsTo))
+        return self.uid
 
 
 # Every stmt has a id
 # If that stmt is NewFunction, NewClass, then stmt's id is used in codeblock's id.
 class IRStmt:
+    __slots__ = ("belongsTo", "id", "uid")
+
     belongsTo: 'CodeBlock'  # 'CodeBlock' to which this IR belongs
     srcPos: Tuple[int]
-    id: int
+    id: int  # unique inside belongsTo
+    uid: int  # globally unique
 
     def __init__(self, belongs_to: 'CodeBlock', id: int):
         self.belongsTo = belongs_to
         belongs_to.addIR(self)
         self.id = id
+        self.uid = next(_uids)
 
     def __repr__(self):
         return f"IRStmt: {str(self)}"
 
+    def __eq__(self, other):
+        return isinstance(other, IRStmt) and self.uid == other.uid
+
     def __hash__(self):
-        return hash((self.belongsTo, str(self)))
+        return self.uid
 
 
 class Assign(IRStmt):
+    __slots__ = ("target", "source")
+
     target: Variable
     source: Variable
 
@@ -68,6 +98,8 @@ class Assign(IRStmt):
 
 # target.attr = source
 class SetAttr(IRStmt):
+    __slots__ = ("target", "source", "attr")
+
     target: Variable
     source: Variable
     attr: str
@@ -76,7 +108,7 @@ class SetAttr(IRStmt):
         super().__init__(belongs_to, id)
         self.target = target
         self.source = source
-        self.attr = attr
+        self.attr = sys.intern(attr)
         # $global.attr = v
         if target == belongs_to.module.globalVariable:
             target.belongsTo.module.globalNames.add(attr)
@@ -87,6 +119,8 @@ class SetAttr(IRStmt):
 
 # target = source.attr
 class GetAttr(IRStmt):
+    __slots__ = ("target", "source", "attr")
+
     target: Variable
     source: Variable
     attr: str
@@ -95,7 +129,7 @@ class GetAttr(IRStmt):
         super().__init__(belongs_to, id)
         self.target = target
         self.source = source
-        self.attr = attr
+        self.attr = sys.intern(attr)
 
     def __str__(self):
         return f"{self.target} = {self.source}.{self.attr}"
@@ -103,6 +137,8 @@ class GetAttr(IRStmt):
 
 # target = New ...
 class New(IRStmt):
+    __slots__ = ("target", "objType")
+
     target: Variable
     objType: str  # module, function, class, method, instance, builtin
 
@@ -114,6 +150,8 @@ class New(IRStmt):
 
 
 class NewModule(New):
+    __slots__ = ("module",)
+
     module: Union['ModuleCodeBlock', str]
 
     def __init__(self, target: Variable, module: 'CodeBlock', belongs_to: 'CodeBlock', id: int):
@@ -125,6 +163,8 @@ class NewModule(New):
 
 
 class NewFunction(New):
+    __slots__ = ("codeBlock",)
+
     codeBlock: 'FunctionCodeBlock'
 
     def __init__(self, target: Variable, code_block: 'CodeBlock', belongs_to: 'CodeBlock', id: int):
@@ -136,6 +176,8 @@ class NewFunction(New):
 
 
 class NewClass(New):
+    __slots__ = ("codeBlock", "bases")
+
     codeBlock: 'ClassCodeBlock'
     bases: List[Variable]  # variables that points to a class object
 
@@ -151,6 +193,8 @@ class NewClass(New):
 
 
 class NewBuiltin(New):
+    __slots__ = ("type", "value")
+
     type: str
     value: Any  # optional, for example the value of str, int, double can be use
 
@@ -164,6 +208,8 @@ class NewBuiltin(New):
 
 
 class NewStaticMethod(New):
+    __slots__ = ("func",)
+
     func: Variable
 
     def __init__(self, target: Variable, func: Variable, belongs_to: 'CodeBlock', id: int):
@@ -176,6 +222,8 @@ class NewStaticMethod(New):
 
 class NewClassMethod(New):
     """FIXME """
+    __slots__ = ("func",)
+
     func: Variable
 
     def __init__(self, target: Variable, func: Variable, belongs_to: 'CodeBlock', id: int):
@@ -187,6 +235,8 @@ class NewClassMethod(New):
 
 
 class NewSuper(New):
+    __slots__ = ("type", "bound")
+
     type: Variable
     bound: Variable
 
@@ -203,6 +253,8 @@ class NewSuper(New):
 # Important: calling a class object equarls to creating an instance!
 # adding a function/module code block should add all class code block inside!
 class Call(IRStmt):
+    __slots__ = ("target", "callee", "posargs", "kwargs")
+
     target: Variable
     callee: Variable
     posargs: List[Variable]
@@ -225,13 +277,15 @@ class Call(IRStmt):
 
 
 class DelAttr(IRStmt):
+    __slots__ = ("var", "attr")
+
     var: Variable
     attr: str
 
     def __init__(self, v: Variable, attr: str, belongs_to: 'CodeBlock', id: int):
         super().__init__(belongs_to, id)
         self.var = v
-        self.attr = attr
+        self.attr = sys.intern(attr)
 
     def __str__(self):
         return f"Del {self.var}.{self.attr}"
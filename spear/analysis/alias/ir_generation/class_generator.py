@@ -3,14 +3,13 @@ This module contains the ClassGenerator class, which is responsible for generati
 """
 
 import ast
-from typing import Set
+from typing import Dict, Set
 import typing
 
 from spear.analysis.alias.ir.ir_stmts import Variable
 from spear.analysis.alias.ir.class_code_block import ClassCodeBlock
 
-from spear.analysis.alias.ir_generation.declaration_scanner import DeclarationScanner
-from spear.analysis.alias.ir_generation.binding_scanner import BindingScanner
+from spear.analysis.alias.ir_generation.scope_scanner import Scope
 
 from spear.analysis.alias.ir_generation.code_generator import Attribute, CodeBlockGenerator, \
     isLoad, isStore, resolveName
@@ -23,8 +22,8 @@ class ClassGenerator(CodeBlockGenerator):
     codeBlock: ClassCodeBlock
     attributes: Set[str]
 
-    def __init__(self, code_block, module_manager: 'ModuleManager'):
-        super().__init__(module_manager)
+    def __init__(self, code_block, module_manager: 'ModuleManager', scopes: Dict[ast.AST, Scope] = None):
+        super().__init__(module_manager, scopes)
         self.codeBlock = code_block
 
     def parse(self, node: ast.AST):
@@ -33,17 +32,9 @@ class ClassGenerator(CodeBlockGenerator):
 
     def preprocess(self, node: ast.ClassDef):
         super().preprocess(node)
-        ds = DeclarationScanner()
-        for stmt in node.body:
-            ds.visit(stmt)
-
-        self.codeBlock.declaredGlobal = ds.declaredGlobal
-        declared_names = ds.declaredGlobal | ds.declaredNonlocal
-
-        ls = BindingScanner(declared_names)
-        for stmt in node.body:
-            ls.visit(stmt)
-        self.codeBlock.attributes = ls.boundNames
+        scope = self.getScope(node)
+        self.codeBlock.declaredGlobal = scope.declaredGlobal
+        self.codeBlock.attributes = scope.boundNames
 
     # for name loaded, because our analysis is flow-insensitive,
     # we can't tell if this name is loaded before its first assignment.
@@ -5,6 +5,7 @@ from spear.analysis.alias.ir.code_block import CodeBlock
 from spear.analysis.alias.ir.function_code_block import FunctionCodeBlock
 from spear.analysis.alias.ir.class_code_block import ClassCodeBlock
 from spear.analysis.alias.ir.ir_stmts import *
+from spear.analysis.alias.ir_generation.scope_scanner import Scope, ScopeScanner
 
 if typing.TYPE_CHECKING:
     from spear.analysis.alias.module_manager import ModuleManager
@@ -43,6 +44,30 @@ def isDel(node: ast.AST) -> bool:
     return isinstance(node.ctx, ast.Del)
 
 
+# number of elements of a literal made of constants only, counting nested literals, or -1 if it has other elements
+def constantSize(node: ast.AST) -> int:
+    cls = node.__class__
+    if cls is ast.Constant:
+        return 1
+    if cls is ast.UnaryOp:
+        return 1 if node.operand.__class__ is ast.Constant else -1
+    if cls is ast.Dict:
+        elts = node.keys + node.values
+    elif cls is ast.List or cls is ast.Tuple or cls is ast.Set:
+        elts = node.elts
+    else:
+        return -1
+
+    size = 1
+    for elt in elts:
+        # a key is None for **
+        n = constantSize(elt) if elt is not None else -1
+        if n < 0:
+            return -1
+        size += n
+    return size
+
+
 # codeBlock can be any, but remember that its enclosing and enclosing's enclosing must be function
 def resolveName(code_block: CodeBlock, name: str) -> Union[Variable, Attribute]:
     if isinstance(code_block, ClassCodeBlock):
@@ -76,12 +101,31 @@ def resolveName(code_block: CodeBlock, name: str) -> Union[Variable, Attribute]:
 # targets that are identifiers if occurring in an assignment,
 # for loop header, or after as in a with statement or except clause.
 
+# visit method of each node type, looked up once per generator class instead of on every visit
+class DispatchTable(dict):
+
+    def __init__(self, cls: type):
+        super().__init__()
+        self.cls = cls
+
+    def __missing__(self, node_type: type):
+        method = getattr(self.cls, "visit_" + node_type.__name__, self.cls.generic_visit)
+        self[node_type] = method
+        return method
+
+
 # When it is loaded, it can be Varaible, Starred or None
 # When it is stored, it can be one of Attribute, Subscript, Starred, Variable, List or Tuple
 class CodeBlockGenerator(ast.NodeVisitor):
     codeBlock: CodeBlock
+    scopes: Dict[ast.AST, Scope]  # scanned once for the whole module, shared by nested generators
+    dispatchTable: DispatchTable
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatchTable = DispatchTable(cls)
 
-    def __init__(self, module_manager: 'ModuleManager'):
+    def __init__(self, module_manager: 'ModuleManager', scopes: Dict[ast.AST, Scope] = None):
         # self.root = node
         # print(f"Into {name} @ {moduleName}")
 
@@ -89,10 +133,27 @@ class CodeBlockGenerator(ast.NodeVisitor):
         self.lambdaCount = 0
         self.tmpVariables = set()
         self.moduleManager = module_manager
+        self.scopes = scopes
 
     def visit(self, node: ast.AST):
         node.result = None
-        super().visit(node)
+        self.dispatchTable[node.__class__](self, node)
+
+    def generic_visit(self, node: ast.AST):
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        self.visit(item)
+            elif isinstance(value, ast.AST):
+                self.visit(value)
+
+    def getScope(self, node: ast.AST) -> Scope:
+        if self.scopes is None:
+            # parsed on its own rather than as part of a module
+            self.scopes = ScopeScanner().scan(node)
+        return self.scopes[node]
 
     def parse(self, node: ast.AST):
         self.preprocess(node)
@@ -219,6 +280,8 @@ class CodeBlockGenerator(ast.NodeVisitor):
     # $tupleElements refer to those that has clear index, for example the first element of a tuple
     def visit_Tuple(self, node: ast.Tuple):
 
+        if isLoad(node) and self._collapseLiteral(node, "tuple"):
+            return
         self.generic_visit(node)
         if isLoad(node):
             tmp = self.newTmpVariable()
@@ -229,14 +292,16 @@ class CodeBlockGenerator(ast.NodeVisitor):
             pos_index = 0
             while pos_index < l and isinstance(node.elts[pos_index].result, Variable):
                 elt = node.elts[pos_index].result
-                self.addSetAttr(Attribute(tmp, f"${pos_index}"), elt)
+                if self._isIndexed(pos_index):
+                    self.addSetAttr(Attribute(tmp, f"${pos_index}"), elt)
                 self.addSetAttr(Attribute(tmp, "$tupleElements"), elt)
                 pos_index += 1
             # from the end to the last starred expression
             neg_index = -1
             while neg_index >= -l and isinstance(node.elts[neg_index].result, Variable):
                 elt = node.elts[neg_index].result
-                self.addSetAttr(Attribute(tmp, f"${neg_index}"), elt)
+                if self._isIndexed(neg_index):
+                    self.addSetAttr(Attribute(tmp, f"${neg_index}"), elt)
                 self.addSetAttr(Attribute(tmp, "$tupleElements"), elt)
                 neg_index -= 1
 
@@ -269,6 +334,8 @@ class CodeBlockGenerator(ast.NodeVisitor):
             self.generic_visit(node)
 
     def visit_Set(self, node: ast.Set):
+        if self._collapseLiteral(node, "list"):
+            return
         self.generic_visit(node)
         tmp = self.newTmpVariable()
         self.addNewBuiltin(tmp, "list")
@@ -295,6 +362,8 @@ class CodeBlockGenerator(ast.NodeVisitor):
     # every dict has $values and $keys
     def visit_Dict(self, node: ast.Dict):
 
+        if self._collapseLiteral(node, "dict"):
+            return
         self.generic_visit(node)
 
         tmp = self._makeDict()
@@ -307,6 +376,22 @@ class CodeBlockGenerator(ast.NodeVisitor):
 
         node.result = tmp
 
+    # A literal of more than ModuleManager.literalLimit constants is summarized by a single object, data tables
+    # would otherwise allocate every row. Constants have no objects, so only nested literals are lost, and the
+    # object stands for them as well by holding itself in $values, which every subscript and iteration reads.
+    def _collapseLiteral(self, node: ast.AST, type: str) -> bool:
+        limit = self.moduleManager.literalLimit
+        if not limit or constantSize(node) <= limit:
+            return False
+
+        tmp = self.newTmpVariable()
+        self.addNewBuiltin(tmp, type)
+        elts = node.keys + node.values if isinstance(node, ast.Dict) else node.elts
+        if any(isinstance(elt, (ast.Tuple, ast.List, ast.Set, ast.Dict)) for elt in elts):
+            self.addSetAttr(Attribute(tmp, "$values"), tmp)
+        node.result = tmp
+        return True
+
     def visit_BoolOp(self, node: ast.BoolOp):
 
         self.generic_visit(node)
@@ -422,6 +507,12 @@ class CodeBlockGenerator(ast.NodeVisitor):
         if node.value:
             self._handleAssign(node.target, node.value.result)
 
+    # Elements of a tuple at an index beyond ModuleManager.tupleIndexLimit, from either end, have no field of
+    # their own and are only found in $tupleElements, both when the tuple is built and when it is indexed.
+    def _isIndexed(self, i: int) -> bool:
+        limit = self.moduleManager.tupleIndexLimit
+        return not limit or -limit <= i < limit
+
     # let all subscribable objects have a attribute $values, tuple is an exception  
     def visit_Subscript(self, node: ast.Subscript):
 
@@ -430,7 +521,8 @@ class CodeBlockGenerator(ast.NodeVisitor):
         if isLoad(node):
             tmp = self.newTmpVariable()
             # if it is tuple
-            if isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, int):
+            if (isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, int)
+                    and self._isIndexed(node.slice.value)):
                 i = node.slice.value
                 # $tmp = v.$i
                 self.addGetAttr(tmp, Attribute(node.value.result, f"${i}"))
@@ -594,7 +686,7 @@ class CodeBlockGenerator(ast.NodeVisitor):
         from .function_generator import FunctionGenerator
         func_id = self.getNewID()
         func = FunctionCodeBlock(node.name, self.codeBlock, func_id)
-        generator = FunctionGenerator(func, self.moduleManager)
+        generator = FunctionGenerator(func, self.moduleManager, self.scopes)
         generator.parse(node)
 
         # default parameters
@@ -642,7 +734,7 @@ class CodeBlockGenerator(ast.NodeVisitor):
         from .function_generator import FunctionGenerator
         func_id = self.getNewID()
         func = FunctionCodeBlock(f"$lambda{self.lambdaCount}", self.codeBlock, func_id)
-        generator = FunctionGenerator(func, self.moduleManager)
+        generator = FunctionGenerator(func, self.moduleManager, self.scopes)
         self.lambdaCount += 1
 
         generator.parse(node)
@@ -675,7 +767,7 @@ class CodeBlockGenerator(ast.NodeVisitor):
         from .class_generator import ClassGenerator
         class_id = self.getNewID()
         cls = ClassCodeBlock(node.name, self.codeBlock, class_id)
-        generator = ClassGenerator(cls, self.moduleManager)
+        generator = ClassGenerator(cls, self.moduleManager, self.scopes)
         generator.parse(node)
         # TODO: a better way to deal with it when base is a starred?
         bases = []
@@ -744,7 +836,7 @@ class CodeBlockGenerator(ast.NodeVisitor):
                         i = pos_index
                     # value might be a tuple
                     tmp = self.newTmpVariable()
-                    self.addGetAttr(tmp, Attribute(value, f"${i}"))
+                    self.addGetAttr(tmp, Attribute(value, f"${i}" if self._isIndexed(i) else "$tupleElements"))
                     self._handleAssign(elt, tmp)
 
                     # value might be a list
@@ -1,10 +1,9 @@
 import ast
 import typing
-from typing import Any, Set
+from typing import Any, Dict, Set
 
-from spear.analysis.alias.ir_generation.binding_scanner import BindingScanner
 from spear.analysis.alias.ir_generation.code_generator import Attribute, CodeBlockGenerator
-from spear.analysis.alias.ir_generation.declaration_scanner import DeclarationScanner
+from spear.analysis.alias.ir_generation.scope_scanner import Scope
 from spear.analysis.alias.ir.class_code_block import ClassCodeBlock
 from spear.analysis.alias.ir.function_code_block import FunctionCodeBlock
 from spear.analysis.alias.ir.ir_stmts import Variable
@@ -18,9 +17,10 @@ class FunctionGenerator(CodeBlockGenerator):
     yielded: Set[Variable]
     sended: Variable
 
-    def __init__(self, code_block: FunctionCodeBlock, module_manager: 'ModuleManager'):
+    def __init__(self, code_block: FunctionCodeBlock, module_manager: 'ModuleManager',
+                 scopes: Dict[ast.AST, Scope] = None):
 
-        super().__init__(module_manager)
+        super().__init__(module_manager, scopes)
         self.codeBlock = code_block
         self.yielded = set()
         self.sended = Variable("$sended", self.codeBlock)
@@ -35,22 +35,13 @@ class FunctionGenerator(CodeBlockGenerator):
         # remember global and nonlocal
         super().preprocess(node)
         code_block = self.codeBlock
+        scope = self.getScope(node)
 
         if isinstance(node, ast.Lambda):
             node.body = [node.body]
 
-        ds = DeclarationScanner()
-
-        for stmt in node.body:
-            ds.visit(stmt)
-
-        code_block.declaredGlobal = ds.declaredGlobal
-        declared_names = ds.declaredGlobal | ds.declaredNonlocal
-
-        ls = BindingScanner(declared_names)
-        for stmt in node.body:
-            ls.visit(stmt)
-        for name in ls.boundNames:
+        code_block.declaredGlobal = scope.declaredGlobal
+        for name in scope.boundNames:
             v = Variable(name, code_block)
             code_block.localVariables[name] = v
 
@@ -2,6 +2,7 @@ import ast
 import typing
 
 from spear.analysis.alias.ir_generation.code_generator import CodeBlockGenerator
+from spear.analysis.alias.ir_generation.scope_scanner import ScopeScanner
 from spear.analysis.alias.ir.module_code_block import ModuleCodeBlock
 
 if typing.TYPE_CHECKING:
@@ -20,6 +21,7 @@ class ModuleGenerator(CodeBlockGenerator):
         self.codeBlock = code_block
 
     def preprocess(self, node: ast.Module):
+        self.scopes = ScopeScanner().scan(node)
         node.body.append(
             ast.ImportFrom(module="builtins", names=[ast.alias(name=name) for name in builtin_names], level=0))
 
@@ -0,0 +1,107 @@
+"""
+This module defines the ScopeScanner class which collects the declarations and name bindings of every function,
+lambda and class in a module with a single traversal.
+"""
+
+import ast
+from typing import Dict, Set, Tuple
+
+
+class Scope:
+    declaredGlobal: Set[str]
+    declaredNonlocal: Set[str]
+    boundNames: Set[str]
+
+    def __init__(self):
+        self.declaredGlobal = set()
+        self.declaredNonlocal = set()
+        self.boundNames = set()
+
+
+# If a name binding operation occurs anywhere within a code block,
+# all uses of the name within the block are treated as references to the current block.
+# See https://docs.python.org/3.9/reference/executionmodel.html
+# A scope sees the statements of its body, but not the insides of the functions and classes defined there, only
+# their names. Lambdas and async functions are seen through, and their insides also count for the enclosing
+# scopes. Decorators, defaults and bases are evaluated outside of the definition, but no scope counts them.
+class ScopeScanner:
+    scopes: Dict[ast.AST, Scope]
+
+    def __init__(self):
+        self.scopes = {}
+
+    # node is a module, or a function, lambda or class scanned on its own
+    def scan(self, node: ast.AST) -> Dict[ast.AST, Scope]:
+        if isinstance(node, ast.Module):
+            for stmt in node.body:
+                self.visit(stmt, ())
+        else:
+            self.visit(node, ())
+        for scope in self.scopes.values():
+            scope.boundNames -= scope.declaredGlobal | scope.declaredNonlocal
+        return self.scopes
+
+    def newScope(self, node: ast.AST, active: Tuple[Scope, ...]) -> Tuple[Scope, ...]:
+        scope = Scope()
+        self.scopes[node] = scope
+        return active + (scope,)
+
+    # active are the scopes that the node counts for, innermost last
+    def visit(self, node: ast.AST, active: Tuple[Scope, ...]):
+        cls = node.__class__
+        if cls is ast.Name:
+            if active and node.ctx.__class__ is ast.Store:
+                for scope in active:
+                    scope.boundNames.add(node.id)
+
+        elif cls is ast.FunctionDef or cls is ast.ClassDef:
+            for scope in active:
+                scope.boundNames.add(node.name)
+            self.visitFields(node, (), "body")
+            inner = self.newScope(node, ())
+            for stmt in node.body:
+                self.visit(stmt, inner)
+
+        elif cls is ast.AsyncFunctionDef:
+            self.visitFields(node, active, "body")
+            inner = self.newScope(node, active)
+            for stmt in node.body:
+                self.visit(stmt, inner)
+
+        elif cls is ast.Lambda:
+            self.visit(node.args, active)
+            self.visit(node.body, self.newScope(node, active))
+
+        elif cls is ast.Import or cls is ast.ImportFrom:
+            for alias in node.names:
+                if alias.asname is not None:
+                    name = alias.asname
+                elif cls is ast.Import:
+                    name, _, _ = alias.name.partition(".")
+                else:
+                    name = alias.name
+                for scope in active:
+                    scope.boundNames.add(name)
+
+        elif cls is ast.Global:
+            for scope in active:
+                scope.declaredGlobal.update(node.names)
+
+        elif cls is ast.Nonlocal:
+            for scope in active:
+                scope.declaredNonlocal.update(node.names)
+
+        else:
+            self.visitFields(node, active)
+
+    def visitFields(self, node: ast.AST, active: Tuple[Scope, ...], skipped: str = None):
+        for field in node._fields:
+            if field == skipped:
+                continue
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        self.visit(item, active)
+            elif isinstance(value, ast.AST):
+                self.visit(value, active)
@@ -0,0 +1,80 @@
+import gc
+import json
+import tracemalloc
+from collections import Counter
+from typing import Dict, List
+
+from spear.analysis.alias.ir.ir_stmts import IRStmt, Variable
+from spear.analysis.alias.pta.objects import Object
+from spear.analysis.alias.pta.pointers import Pointer
+
+TOP_SITES = 20
+
+
+def _subclasses(cls) -> List[type]:
+    res = [cls]
+    for sub in cls.__subclasses__():
+        res += _subclasses(sub)
+    return res
+
+
+# Memory taken at phase boundaries, for --memory-profile.
+# Each snapshot records traced memory, live instances of Spear's types and the top allocation sites.
+class MemoryProfiler:
+    phases: Dict[str, dict]
+
+    def __init__(self, top: int = TOP_SITES):
+        self.top = top
+        self.phases = {}
+        self.trackedTypes = {cls: cls.__name__ for base in (Variable, IRStmt, Pointer, Object)
+                             for cls in _subclasses(base)}
+        tracemalloc.start()
+
+    def countObjects(self) -> Dict[str, int]:
+        counter = Counter()
+        tracked = self.trackedTypes
+        for obj in gc.get_objects():
+            name = tracked.get(type(obj))
+            if name:
+                counter[name] += 1
+        return dict(counter.most_common())
+
+    def snapshot(self, phase: str, analysis=None):
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        sites = [{
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size": stat.size,
+            "count": stat.count,
+        } for stat in snapshot.statistics("lineno")[:self.top]]
+
+        objects = self.countObjects()
+        if hasattr(analysis, "pointToSet"):
+            point_to_set = analysis.pointToSet
+            objects["PointsToSet.set"] = len(point_to_set.varPtrSet) + sum(
+                len(d) for d in point_to_set.attrPtrSet.values())
+
+        self.phases[phase] = {
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "objects": objects,
+            "top_sites": sites,
+        }
+        tracemalloc.reset_peak()
+
+    def stop(self):
+        tracemalloc.stop()
+
+    def dump(self, path: str):
+        with open(path, "w") as fp:
+            json.dump(self.phases, fp, indent=4)
+
+    def summary(self) -> str:
+        lines = []
+        for phase, info in self.phases.items():
+            lines.append(f"{phase:<10} traced {info['traced_bytes'] / 2 ** 20:>8.1f} MB, "
+                         f"peak {info['traced_peak_bytes'] / 2 ** 20:>8.1f} MB")
+        return "\n".join(lines)
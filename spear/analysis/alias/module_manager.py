@@ -6,14 +6,15 @@ import importlib.machinery
 import io
 import os
 import sys
-from typing import List, Union
+from typing import Dict, List, Tuple, Union
 
 # import importlib._bootstrap_external
 
 from spear.analysis.alias.ir.code_block import CodeBlock
-from spear.analysis.alias.ir.ir_stmts import NewModule, SetAttr
+from spear.analysis.alias.ir.ir_stmts import NewClass, NewFunction, NewModule, SetAttr
 from spear.analysis.alias.ir.module_code_block import ModuleCodeBlock
 from spear.analysis.alias.ir_generation.module_generator import ModuleGenerator
+from spear.analysis.alias.timing import Progress
 
 LOAD_CONST = dis.opmap['LOAD_CONST']
 IMPORT_NAME = dis.opmap['IMPORT_NAME']
@@ -88,6 +89,50 @@ class ModuleExcluded(Exception):
     pass
 
 
+# name of a module and the depth it was imported at, which decides how deep its own imports go
+CacheKey = Tuple[str, int]
+
+
+class CachedModule:
+    module: 'Module'
+    path: str
+    deps: List[CacheKey]  # modules imported while lowering it, in order
+    sizes: List[Tuple[CodeBlock, int, int, int]]  # code block -> number of statements, newID and newTmp
+
+    def __init__(self, module: 'Module', path: str, deps: List[CacheKey], code_blocks: List[CodeBlock]):
+        self.module = module
+        self.path = path
+        self.deps = deps
+        self.sizes = [(cb, len(cb.stmts), cb.newID, cb.newTmp) for cb in code_blocks]
+
+    # importers of its submodules and the PTA append statements to lowered code blocks, they are dropped
+    def restore(self):
+        for cb, length, new_id, new_tmp in self.sizes:
+            if len(cb.stmts) > length:
+                del cb.stmts[length:]
+            cb.newID = new_id
+            cb.newTmp = new_tmp
+
+
+# Modules found on the external path, lowered once and reused by later ModuleManagers of the same process, e.g.
+# the standard library shared by every project of a corpus. A module is only reused if the working directory
+# doesn't shadow it or anything it imports, and if those imports are cached too. Depths only compare between
+# managers of the same max_depth, and the IR depends on the other options, so a cache is bound to the settings
+# of its first manager.
+class LoweringCache:
+    modules: Dict[CacheKey, CachedModule]
+    settings: Dict[str, int]
+
+    def __init__(self):
+        self.modules = {}
+        self.settings = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.modules)
+
+
 class Module:
 
     def __init__(self, name, file=None, path=None):
@@ -95,7 +140,6 @@ class Module:
         self.__file__ = file
         self.__path__ = path
         self.__codeBlock__ = None
-        self.__generator__ = None
 
         # # The set of global names that are assigned to in the module.
         # # This includes those names imported through starimports of
@@ -117,7 +161,8 @@ class Module:
 
 class ModuleManager:
 
-    def __init__(self, cwd=None, /, max_depth=9999, excludes=None, verbose=False):
+    def __init__(self, cwd=None, /, max_depth=9999, excludes=None, verbose=False, cache: LoweringCache = None,
+                 literal_limit: int = 0, tuple_index_limit: int = 0):
 
         if cwd:
             self.cwd = cwd
@@ -129,8 +174,21 @@ class ModuleManager:
         self.badmodules = {}
         self.excludes = excludes or []
         self.verbose = verbose
+        self.progress = Progress() if verbose else None
         self.maxDepth = max_depth
+        # constant literals with more elements are lowered to a single object, 0 for never
+        self.literalLimit = literal_limit
+        # tuple elements at higher indexes share one field, 0 for no limit
+        self.tupleIndexLimit = tuple_index_limit
         self.entrys = []
+        if cache is not None:
+            settings = {"max_depth": max_depth, "literal_limit": literal_limit, "tuple_index_limit": tuple_index_limit}
+            if cache.settings is None:
+                cache.settings = settings
+            elif cache.settings != settings:
+                raise ValueError(f"The cache is used with {cache.settings}, not {settings}.")
+        self.cache = cache
+        self.lowering = []  # imports made while lowering each external module on the stack
 
     def addEntry(self, /, file=None, module=None) -> None:
 
@@ -178,8 +236,19 @@ class ModuleManager:
         else:
             return fqname
 
-    def allCodeBlocks(self):
-        return [m.__codeBlock__ for m in self.modules.values() if m.__codeBlock__ is not None]
+    # with nested=True, code blocks of classes and functions are included as well
+    def allCodeBlocks(self, nested=False) -> List[CodeBlock]:
+        code_blocks = [m.__codeBlock__ for m in self.modules.values() if m.__codeBlock__ is not None]
+        if not nested:
+            return code_blocks
+        res = []
+        while code_blocks:
+            code_block = code_blocks.pop()
+            res.append(code_block)
+            for stmt in code_block.stmts:
+                if isinstance(stmt, NewClass) or isinstance(stmt, NewFunction):
+                    code_blocks.append(stmt.codeBlock)
+        return res
 
     # import all the module in the quarlified name, and those in fromlist
     # if this is "import", return the head module
@@ -331,6 +400,8 @@ class ModuleManager:
         except KeyError:
             pass
         else:
+            if self.lowering:
+                self.lowering[-1].append((fqname, m.__depth__))
             return m
 
         if fqname in self.badmodules:
@@ -353,29 +424,103 @@ class ModuleManager:
             raise ModuleExcluded(fqname + " is out of range.")
 
         try:
-            m = self.load_module(fqname, fp, pathname, stuff, depth)
+            # submodules of external packages are found on the package's path, so the location is checked
+            if self.cache is not None and pathname and not self.inCwd(pathname):
+                m = self.loadCached(fqname, pathname, fp, stuff, depth)
+            else:
+                m = self.load_module(fqname, fp, pathname, stuff, depth)
         finally:
             if fp:
                 fp.close()
+        if self.lowering:
+            self.lowering[-1].append((fqname, m.__depth__))
+
+        self.attach(parent, partname, m)
+        return m
 
+    def attach(self, parent, partname, m):
         if parent:
-            # if(not parent.__generator__):
-            #     parent.__generator__ = ModuleCodeBlockGenerator(parent.__name__, moduleManager=self)
-            #     parent.__codeBlock__ = parent.__generator__.codeBlock
             p_codeblock = parent.__codeBlock__
-            p_generator = parent.__generator__
             m_codeblock = m.__codeBlock__
-            m_generator = m.__generator__
             tmp = p_codeblock.newTmpVariable()
             NewModule(tmp, m_codeblock, p_codeblock, p_codeblock.getNewID())
             SetAttr(p_codeblock.globalVariable, partname, tmp, p_codeblock, p_codeblock.getNewID())
 
+    def inCwd(self, pathname) -> bool:
+        return os.path.abspath(pathname).startswith(os.path.join(os.path.abspath(self.cwd), ""))
+
+    def loadCached(self, fqname, pathname, fp, stuff, depth):
+        if self.reuse((fqname, depth), pathname):
+            self.cache.hits += 1
+            return self.modules[fqname]
+
+        self.lowering.append([])
+        try:
+            m = self.load_module(fqname, fp, pathname, stuff, depth)
+        finally:
+            deps = self.lowering.pop()
+        self.cache.misses += 1
+        if m.__codeBlock__ is not None:
+            self.cache.modules[(fqname, depth)] = CachedModule(m, pathname, deps,
+                                                               self.nestedCodeBlocks(m.__codeBlock__))
         return m
 
+    # put a cached module and everything it imported into this manager, as if they were imported again
+    def reuse(self, key: CacheKey, pathname) -> bool:
+        cached = self.cache.modules.get(key)
+        if cached is None or cached.path != pathname:
+            return False
+        # all or nothing, checked before anything is changed
+        closure = set()
+        stack = [key]
+        while stack:
+            dep_key = stack.pop()
+            if dep_key in closure:
+                continue
+            dep = self.cache.modules.get(dep_key)
+            if dep is None:
+                return False
+            name, _ = dep_key
+            existing = self.modules.get(name)
+            if existing is not None and existing is not dep.module:
+                return False
+            top = name.partition(".")[0]
+            if os.path.exists(os.path.join(self.cwd, top)) or os.path.exists(os.path.join(self.cwd, top + ".py")):
+                return False
+            closure.add(dep_key)
+            stack.extend(dep.deps)
+
+        self.addCached(key)
+        return True
+
+    def addCached(self, key: CacheKey):
+        cached = self.cache.modules[key]
+        cached.restore()
+        self.modules[key[0]] = cached.module
+        for dep in cached.deps:
+            name, _ = dep
+            if name not in self.modules:
+                self.addCached(dep)
+                parent, _, partname = name.rpartition(".")
+                if parent:
+                    self.attach(self.modules.get(parent), partname, self.modules[name])
+
+    @staticmethod
+    def nestedCodeBlocks(code_block: CodeBlock) -> List[CodeBlock]:
+        res = []
+        code_blocks = [code_block]
+        while code_blocks:
+            code_block = code_blocks.pop()
+            res.append(code_block)
+            for stmt in code_block.stmts:
+                if isinstance(stmt, NewClass) or isinstance(stmt, NewFunction):
+                    code_blocks.append(stmt.codeBlock)
+        return res
+
     # load = process import statements and globalnames
     def load_module(self, fqname, fp, pathname, file_info, depth):
-        if self.verbose:
-            print(f"Loading {fqname:<100}\r", end="")
+        if self.progress:
+            self.progress.update(f"Loading {fqname}")
         suffix, mode, type = file_info
 
         if type == _PKG_DIRECTORY:
@@ -390,8 +535,8 @@ class ModuleManager:
             m.__depth__ = depth
             tree = ast.parse(fp.read())
             m.__codeBlock__ = ModuleCodeBlock(fqname)
-            m.__generator__ = ModuleGenerator(m.__codeBlock__, module_manager=self)
-            m.__generator__.parse(tree)
+            # the generator and the tree are only needed while lowering, and the generator refers to this manager
+            ModuleGenerator(m.__codeBlock__, module_manager=self).parse(tree)
             return m
         elif type == _PY_COMPILED:
             # try:
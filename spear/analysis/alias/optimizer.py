@@ -1,9 +1,9 @@
-from typing import Any, Dict, List, Set, Tuple
+from collections import deque
+from typing import Any, Deque, Dict, List, Set, Tuple
 
 from spear.analysis.alias.ir.code_block import CodeBlock
-from spear.analysis.alias.ir.ir_stmts import Assign, Call, GetAttr, IRStmt, New, NewClass, NewFunction, NewStaticMethod, \
-    NewSuper, \
-    SetAttr, Variable
+from spear.analysis.alias.ir.ir_stmts import Assign, Call, DelAttr, GetAttr, IRStmt, New, NewClass, NewFunction, \
+    NewStaticMethod, NewSuper, SetAttr, Variable
 
 DEFINED_ASSIGN = 0
 DEFINED_NECY = 1
@@ -14,15 +14,19 @@ USED_OTHERS = 4
 StmtInfo = Tuple[IRStmt, Any]
 
 
+# Copy propagation and dead temporary removal on IR, done after IR generation and before PTA.
+# Only temporaries are touched, so the callgraph should not change.
 class Optimizer:
     codeBlocks: List[CodeBlock]
     tmpStmts: Dict[Variable, Tuple[Set[StmtInfo], ...]]
-    workingList: List
+    workingList: Deque[Variable]
+    removed: Set[IRStmt]  # statements are only marked here, and dropped from their code blocks in postprocess
 
     def __init__(self, code_blocks: List[CodeBlock]):
         self.codeBlocks = code_blocks
         self.tmpStmts = {}
-        self.workingList = []
+        self.workingList = deque()
+        self.removed = set()
 
     def start(self):
         self.count()
@@ -68,6 +72,8 @@ class Optimizer:
                 operate(arg, (stmt, i), USED_OTHERS)
             for kw, arg in stmt.kwargs.items():
                 operate(arg, (stmt, f"kw_{kw}"), USED_OTHERS)
+        elif isinstance(stmt, DelAttr):
+            operate(stmt.var, (stmt, "var"), USED_OTHERS)
 
     def add(self, tmp_var: Variable, stmt_info: StmtInfo, type: int) -> bool:
         if not tmp_var.isTmp:
@@ -114,6 +120,8 @@ class Optimizer:
                 stmt.bound = new_var
             elif arg == "callee":
                 stmt.callee = new_var
+            elif arg == "var":
+                stmt.var = new_var
             elif isinstance(arg, int):
                 if isinstance(stmt, NewClass):
                     stmt.bases[arg] = new_var
@@ -125,11 +133,14 @@ class Optimizer:
 
         self.add(new_var, stmt_info, type)
 
+    def removeStmt(self, stmt: IRStmt):
+        self.operateStmt(stmt, self.remove)
+        self.removed.add(stmt)
+
     def process(self):
-        self.workingList = list(self.tmpStmts.keys())
+        self.workingList = deque(self.tmpStmts.keys())
         while self.workingList:
-            tmp_var = self.workingList[0]
-            del self.workingList[0]
+            tmp_var = self.workingList.popleft()
 
             if tmp_var not in self.tmpStmts:
                 continue
@@ -139,8 +150,7 @@ class Optimizer:
             if len(ua) == 0 and len(uo) == 0 and len(dn) == 0:
                 for stmtInfo in da | do:
                     stmt, arg = stmtInfo
-                    self.operateStmt(stmt, self.remove)
-                    stmt.belongsTo.removeIR(stmt)
+                    self.removeStmt(stmt)
                 del self.tmpStmts[tmp_var]
 
             # Situation 2: Used Once
@@ -150,8 +160,7 @@ class Optimizer:
                 new_var = stmt.target
                 for stmtInfo in da | dn | do:
                     self.replace(stmtInfo, new_var)
-                self.operateStmt(stmt, self.remove)
-                stmt.belongsTo.removeIR(stmt)
+                self.removeStmt(stmt)
                 del self.tmpStmts[tmp_var]
 
             # Situation 3: Defined Once
@@ -161,9 +170,13 @@ class Optimizer:
                 new_var = stmt.source
                 for stmtInfo in ua | uo:
                     self.replace(stmtInfo, new_var)
-                self.operateStmt(stmt, self.remove)
-                stmt.belongsTo.removeIR(stmt)
+                self.removeStmt(stmt)
                 del self.tmpStmts[tmp_var]
 
     def postprocess(self):
-        pass
+        # one pass per code block, instead of a list.remove for every removed statement
+        if not self.removed:
+            return
+        for code_block in {stmt.belongsTo for stmt in self.removed}:
+            code_block.stmts = [stmt for stmt in code_block.stmts if stmt not in self.removed]
+        self.removed = set()
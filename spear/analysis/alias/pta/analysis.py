@@ -1,22 +1,26 @@
-from collections import defaultdict
-from typing import Dict, List, Set, Tuple, Union
+import sys
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Set, Tuple
 
 from spear.analysis.alias.pta.object_pool import OBJ_BUILTIN, OBJ_CLASS, OBJ_CLASS_METHOD, OBJ_FAKE, OBJ_FUNCTION, \
     OBJ_MODULE, OBJ_STATIC_METHOD, OBJ_SUPER, ObjectPool
 from spear.analysis.alias.pta.attr_graph import AttrGraph
 from spear.analysis.alias.pta.binding_stmts import BindingStmts
-from spear.analysis.alias.pta.class_hiearchy import MRO, ClassHiearchy
+from spear.analysis.alias.pta.class_hiearchy import DEFAULT_MAX_MROS, MRO, ClassHiearchy, MergedMRO
 from spear.analysis.alias.pta.objects import ClassMethodObject, ClassObject, FakeObject, FunctionObject, Object, \
     StaticMethodObject, SuperObject
 from spear.analysis.alias.pta.points_to_set import PointsToSet
 from spear.analysis.alias.pta.pointer_flow import PointerFlow
+from spear.analysis.alias.pta.pointer_pool import PointerPool
 from spear.analysis.alias.pta.pointers import AttrPtr, Pointer, VarPtr
+from spear.analysis.alias.pta.resolution import ResolutionCache, Resolver
 
 from spear.analysis.alias.ir.class_code_block import ClassCodeBlock
 from spear.analysis.alias.ir.code_block import CodeBlock
 from spear.analysis.alias.ir.ir_stmts import Assign, Call, DelAttr, GetAttr, IRStmt, NewBuiltin, NewClass, \
     NewFunction, NewModule, NewStaticMethod, NewSuper, SetAttr, Variable
 from spear.analysis.alias.ir.module_code_block import ModuleCodeBlock
+from spear.analysis.alias.timing import Progress
 
 FAKE_PREFIX = "$r_"
 
@@ -34,8 +38,17 @@ def isFakeAttr(attr: str):
     return attr.startswith(FAKE_PREFIX)
 
 
-Resolver = Union[ClassObject, SuperObject]
-ResolveInfo = Tuple[Resolver, MRO, int]
+_fakeAttrs = {}
+
+
+# FAKE_PREFIX + attr, built once for each attr
+def fakeAttr(attr: str) -> str:
+    try:
+        return _fakeAttrs[attr]
+    except KeyError:
+        fake_attr = _fakeAttrs[attr] = sys.intern(FAKE_PREFIX + attr)
+        return fake_attr
+
 
 ADD_POINTS_TO = 1
 BIND_STMT = 2
@@ -49,23 +62,29 @@ class Analysis:
 
     # defined: Set[CodeBlock]
     classHiearchy: ClassHiearchy
-    persist_attr: Dict[ClassObject, Dict[str, Set[ResolveInfo]]]
-    resolved_attr: Dict[Resolver, Set[str]]
-    workList: List[Tuple[Pointer, Set[Object]]]
+    persist_attr: Dict[ClassObject, Set[str]]
+    resolutionCache: ResolutionCache
+    initCalls: Dict[Tuple[Call, ClassObject], Call]  # (call, class called) -> the call of its __init__
+    workList: Deque[Tuple[Pointer, Set[Object]]]
+    propagations: int  # ADD_POINTS_TO items processed, a machine independent measure of solving work
 
-    def __init__(self, verbose=False):
+    def __init__(self, verbose=False, max_mros: int = DEFAULT_MAX_MROS):
         self.pointToSet = PointsToSet()
         self.callgraph = defaultdict(set)
         self.pointerFlow = PointerFlow()
         self.attrGraph = AttrGraph()
         self.bindingStmts = BindingStmts()
         self.objectPool = ObjectPool()
+        self.pointerPool = PointerPool()
         self.reachable = set()
-        self.classHiearchy = ClassHiearchy(self.pointToSet)
-        self.persist_attr = defaultdict(dict)
-        self.resolved_attr = defaultdict(set)
-        self.workList = []
+        self.classHiearchy = ClassHiearchy(self.pointToSet, max_mros)
+        self.persist_attr = {}
+        self.resolutionCache = ResolutionCache()
+        self.initCalls = {}
+        self.workList = deque()
+        self.propagations = 0
         self.verbose = verbose
+        self.progress = Progress() if verbose else None
 
         self.processStmts = {
             # "GetAttr": self.processGetAttr,
@@ -91,27 +110,27 @@ class Analysis:
 
         for stmt in code_block.stmts:
             if isinstance(stmt, Assign):
-                source_ptr = VarPtr.create(stmt.source)
-                target_ptr = VarPtr.create(stmt.target)
+                source_ptr = self.pointerPool.getVarPtr(stmt.source)
+                target_ptr = self.pointerPool.getVarPtr(stmt.target)
                 self.addFlow(source_ptr, target_ptr)
 
             elif isinstance(stmt, GetAttr):
-                source_ptr = VarPtr.create(stmt.source)
-                target_ptr = VarPtr.create(stmt.target)
+                source_ptr = self.pointerPool.getVarPtr(stmt.source)
+                target_ptr = self.pointerPool.getVarPtr(stmt.target)
                 self.attrGraph.putGet(target_ptr, source_ptr, stmt.attr)
                 self.addGetEdge(target_ptr, source_ptr, stmt.attr, self.pointToSet.get(source_ptr))
 
             elif isinstance(stmt, SetAttr):
-                source_ptr = VarPtr.create(stmt.source)
-                target_ptr = VarPtr.create(stmt.target)
+                source_ptr = self.pointerPool.getVarPtr(stmt.source)
+                target_ptr = self.pointerPool.getVarPtr(stmt.target)
                 self.attrGraph.putSet(target_ptr, source_ptr, stmt.attr)
                 self.addSetEdge(target_ptr, source_ptr, stmt.attr, self.pointToSet.get(target_ptr))
 
             elif isinstance(stmt, NewModule):
                 if isinstance(stmt.module, ModuleCodeBlock):
                     obj = self.objectPool.create(OBJ_MODULE, stmt.module)
-                    target_ptr = VarPtr.create(stmt.target)
-                    global_ptr = VarPtr.create(stmt.module.globalVariable)
+                    target_ptr = self.pointerPool.getVarPtr(stmt.target)
+                    global_ptr = self.pointerPool.getVarPtr(stmt.module.globalVariable)
                     self.workList.append((ADD_POINTS_TO, target_ptr, {obj}))
                     self.workList.append((ADD_POINTS_TO, global_ptr, {obj}))
                     # self.addDefined(stmt.module)
@@ -119,32 +138,31 @@ class Analysis:
                     # self.callgraph.put(stmt, stmt.module)
                 else:
                     obj = self.objectPool.create(OBJ_FAKE, stmt.module)
-                    target_ptr = VarPtr.create(stmt.target)
+                    target_ptr = self.pointerPool.getVarPtr(stmt.target)
                     self.workList.append((ADD_POINTS_TO, target_ptr, {obj}))
 
             elif isinstance(stmt, NewFunction):
                 obj = self.objectPool.create(OBJ_FUNCTION, stmt)
-                target_ptr = VarPtr.create(stmt.target)
+                target_ptr = self.pointerPool.getVarPtr(stmt.target)
                 self.workList.append((ADD_POINTS_TO, target_ptr, {obj}))
 
             elif isinstance(stmt, NewClass):
                 obj = self.objectPool.create(OBJ_CLASS, stmt)
-                target_ptr = VarPtr.create(stmt.target)
-                this_ptr = VarPtr.create(stmt.codeBlock.thisClassVariable)
+                target_ptr = self.pointerPool.getVarPtr(stmt.target)
+                this_ptr = self.pointerPool.getVarPtr(stmt.codeBlock.thisClassVariable)
                 self.workList.append((ADD_POINTS_TO, target_ptr, {obj}))
                 self.workList.append((ADD_POINTS_TO, this_ptr, {obj}))
 
                 self.classHiearchy.addClass(obj)
 
-                for attr in obj.attributes:
-                    self.persist_attr[obj][attr] = set()
+                self.persist_attr[obj] = set(obj.attributes)
 
                 self.addReachable(stmt.codeBlock)
                 # self.callgraph.put(stmt, stmt.codeBlock)
                 self.addCallEdge(stmt, obj.readable_name)
 
             elif isinstance(stmt, NewBuiltin):
-                target_ptr = VarPtr.create(stmt.target)
+                target_ptr = self.pointerPool.getVarPtr(stmt.target)
                 # if(stmt.value is not None or stmt.type == "NoneType"):
                 #     obj = ConstObject(stmt.value)
                 # else:
@@ -155,22 +173,22 @@ class Analysis:
         for entry in entrys:
             if isinstance(entry, ModuleCodeBlock):
                 obj = self.objectPool.create(OBJ_MODULE, entry)
-                self.workList.append((ADD_POINTS_TO, VarPtr.create(entry.globalVariable), {obj}))
+                self.workList.append((ADD_POINTS_TO, self.pointerPool.getVarPtr(entry.globalVariable), {obj}))
             self.addReachable(entry)
 
         while len(self.workList) > 0:
 
-            if self.verbose:
-                print(f"PTA worklist remains {len(self.workList):<10} to process.                \r", end="")
+            if self.progress:
+                self.progress.update(f"PTA worklist remains {len(self.workList)} to process.")
 
-            type, *args = self.workList[0]
-            del self.workList[0]
+            type, *args = self.workList.popleft()
 
             if type == ADD_POINTS_TO:
                 ptr, objs = args
                 if len(objs) == 0:
                     continue
 
+                self.propagations += 1
                 objs = self.pointToSet.putAll(ptr, objs)
                 if objs:
                     for succ in self.pointerFlow.successors(ptr):
@@ -208,21 +226,21 @@ class Analysis:
                 if isinstance(stmt, NewClass):
                     for i in range(len(stmt.bases)):
                         # print(f"Bind Base: {stmt.bases[i]} - {stmt} - {i}")
-                        var_ptr = VarPtr.create(stmt.bases[i])
+                        var_ptr = self.pointerPool.getVarPtr(stmt.bases[i])
                         stmt_info = (stmt, i)
                         self.bindingStmts.bind("NewClass", var_ptr, stmt_info)
                         self.processNewClass(stmt_info, self.pointToSet.get(var_ptr))
 
                 elif isinstance(stmt, Call):
                     # print(f"Bind Call: {stmt.callee} - {stmt}")
-                    var_ptr = VarPtr.create(stmt.callee)
+                    var_ptr = self.pointerPool.getVarPtr(stmt.callee)
                     stmt_info = (stmt,)
                     self.bindingStmts.bind("Call", var_ptr, stmt_info)
                     self.processCall(stmt_info, self.pointToSet.get(var_ptr))
 
                 elif isinstance(stmt, DelAttr):
                     # print(f"Bind DelAttr: {stmt.var} - {stmt}")
-                    var_ptr = VarPtr.create(stmt.var)
+                    var_ptr = self.pointerPool.getVarPtr(stmt.var)
                     stmt_info = (stmt,)
                     self.bindingStmts.bind("DelAttr", var_ptr, stmt_info)
                     self.processDelAttr(stmt_info, self.pointToSet.get(var_ptr))
@@ -234,23 +252,26 @@ class Analysis:
                 #     self.processNewClassMethod(stmt_info, self.pointToSet.get(varPtr))
 
                 elif isinstance(stmt, NewStaticMethod):
-                    var_ptr = VarPtr.create(stmt.func)
+                    var_ptr = self.pointerPool.getVarPtr(stmt.func)
                     stmt_info = (stmt,)
                     self.bindingStmts.bind("NewStaticMethod", var_ptr, stmt_info)
                     self.processNewStaticMethod(stmt_info, self.pointToSet.get(var_ptr))
 
                 elif isinstance(stmt, NewSuper):
 
-                    var_ptr = VarPtr.create(stmt.type)
+                    var_ptr = self.pointerPool.getVarPtr(stmt.type)
                     stmt_info = (stmt, "type")
                     self.bindingStmts.bind("NewSuper", var_ptr, stmt_info)
                     self.processNewSuper(stmt_info, self.pointToSet.get(var_ptr))
 
-                    var_ptr = VarPtr.create(stmt.bound)
+                    var_ptr = self.pointerPool.getVarPtr(stmt.bound)
                     stmt_info = (stmt, "bound")
                     self.bindingStmts.bind("NewSuper", var_ptr, stmt_info)
                     self.processNewSuper(stmt_info, self.pointToSet.get(var_ptr))
 
+        if self.progress:
+            self.progress.clear()
+
     def addFlow(self, source: Pointer, target: Pointer):
         if self.pointerFlow.put(source, target):
             # print(f"Add Flow:{source} -> {target}")
@@ -304,24 +325,44 @@ class Analysis:
     def resolveAttribute(self, obj: Resolver, attr: str, resolve_info: Tuple[MRO, int]):
 
         mro, start = resolve_info
+        parents = self.resolutionCache.get(obj)[attr]
+        merged = isinstance(mro, MergedMRO)
 
-        child_attr = AttrPtr(obj, FAKE_PREFIX + attr)
+        child_attr = self.pointerPool.getAttrPtr(obj, fakeAttr(attr))
         for i in range(start, len(mro)):
             parent = mro[i]
-            parent_attr = AttrPtr(parent, attr)
-            self.addFlow(parent_attr, child_attr)
-            try:
-                self.persist_attr[parent][attr].add((obj, mro, i))
+            if parent not in parents:
+                parents.add(parent)
+                parent_attr = self.pointerPool.getAttrPtr(parent, attr)
+                self.addFlow(parent_attr, child_attr)
+            if merged:
+                # any of them can be the first one that has this attr
+                continue
+            if attr in self.persist_attr.get(parent, ()):
+                self.resolutionCache.depend(parent, attr, (obj, mro, i))
                 break
-            except KeyError:
-                pass
+
+    # where to start resolving along mro
+    def resolveStarts(self, obj: Resolver, mro: MRO) -> List[int]:
+        if isinstance(obj, ClassObject):
+            return [0]
+        else:
+            return self.superStarts(mro, self.pointToSet.get(obj.type))
+
+    # a super object starts right after each of its types along mro
+    @staticmethod
+    def superStarts(mro: MRO, types: Set[Object]) -> List[int]:
+        if isinstance(mro, MergedMRO):
+            # classes are not ordered in a merged MRO, skip only the bound class itself
+            return [1] if any(isinstance(type, ClassObject) for type in types) else []
+        else:
+            return [start + 1 for start, cls in enumerate(mro) if cls in types]
 
     def resolveAttrIfNot(self, obj: Resolver, attr: str):
 
-        if attr in self.resolved_attr[obj]:
+        if self.resolutionCache.add(obj, attr) is None:
             return
 
-        self.resolved_attr[obj].add(attr)
         if isinstance(obj, ClassObject):
             class_obj = obj
         elif isinstance(obj, SuperObject):
@@ -331,21 +372,14 @@ class Analysis:
             class_obj = obj.bound
 
         for mro in self.classHiearchy.getMROs(class_obj):
-            if isinstance(obj, ClassObject):
-                start = 0
-            elif isinstance(obj, SuperObject):
-                for start in range(len(mro)):
-                    if mro[start] == obj.type:
-                        # start from the one right after type
-                        start += 1
-                        break
-            self.resolveAttribute(obj, attr, (mro, start))
+            for start in self.resolveStarts(obj, mro):
+                self.resolveAttribute(obj, attr, (mro, start))
 
     def addSetEdge(self, target: VarPtr, source: VarPtr, attr: str, objs: Set[Object]):
         # stmt,  = *stmtInfo,
         # assert(isinstance(stmt, SetAttr))
         for obj in objs:
-            attr_ptr = AttrPtr(obj, attr)
+            attr_ptr = self.pointerPool.getAttrPtr(obj, attr)
             self.addFlow(source, attr_ptr)
 
     def addGetEdge(self, target: VarPtr, source: VarPtr, attr: str, objs: Set[Object]):
@@ -372,17 +406,17 @@ class Analysis:
             if isinstance(obj, ClassObject):
                 self.resolveAttrIfNot(obj, attr)
                 # instance.attr <- class.$r_attr
-                class_attr = AttrPtr(obj, FAKE_PREFIX + attr)
+                class_attr = self.pointerPool.getAttrPtr(obj, fakeAttr(attr))
                 self.addFlow(class_attr, target)
 
             elif isinstance(obj, SuperObject):
                 self.resolveAttrIfNot(obj, attr)
                 # instance.attr <- class.$r_attr
-                super_attr = AttrPtr(obj, FAKE_PREFIX + attr)
+                super_attr = self.pointerPool.getAttrPtr(obj, fakeAttr(attr))
                 self.addFlow(super_attr, target)
 
             else:
-                attr_ptr = AttrPtr(obj, attr)
+                attr_ptr = self.pointerPool.getAttrPtr(obj, attr)
                 self.addFlow(attr_ptr, target)
 
     def processNewClass(self, stmt_info: Tuple[NewClass, int], objs: Set[Object]):
@@ -394,15 +428,19 @@ class Analysis:
                 cls = self.objectPool.create(OBJ_CLASS, stmt)
                 mro_change |= self.classHiearchy.addClassBase(cls, index, obj)
         for mro in mro_change:
-            class_obj = mro[0]
-
-            for attr in self.resolved_attr[class_obj]:
-                self.resolveAttribute(class_obj, attr, (mro, 0))
+            # super objects bound to this class resolve along its MROs too
+            for resolver in self.resolutionCache.resolversOf(mro[0]):
+                starts = self.resolveStarts(resolver, mro)
+                for attr in self.resolutionCache.get(resolver):
+                    for start in starts:
+                        self.resolveAttribute(resolver, attr, (mro, start))
 
     def processCall(self, stmt_info: Tuple[Call], objs: Set[Object]):
         stmt, = *stmt_info,
         assert (isinstance(stmt, Call))
-        var_ptr = VarPtr.create(stmt.target)
+        var_ptr = self.pointerPool.getVarPtr(stmt.target)
+        pos_args = [self.pointerPool.getVarPtr(posArg) for posArg in stmt.posargs]
+        kw_args = {kw: self.pointerPool.getVarPtr(kwarg) for kw, kwarg in stmt.kwargs.items()}
         new_objs = set()
         for obj in objs:
             # if(isinstance(obj, FakeObject)):
@@ -410,15 +448,14 @@ class Analysis:
             #     self.callgraph.put(stmt, func)
             if isinstance(obj, FunctionObject):
 
-                self.matchArgParam(pos_args=[VarPtr.create(posArg) for posArg in stmt.posargs],
-                                   kw_args={kw: VarPtr.create(kwarg) for kw, kwarg in stmt.kwargs.items()},
+                self.matchArgParam(pos_args=pos_args,
+                                   kw_args=kw_args,
                                    pos_params=obj.posParams,
                                    kw_params=obj.kwParams,
                                    var_param=obj.varParam,
                                    kw_param=obj.kwParam)
                 ret_var = obj.retVar
-                res_var = VarPtr.create(stmt.target)
-                self.addFlow(ret_var, res_var)
+                self.addFlow(ret_var, var_ptr)
                 self.addReachable(obj.codeBlock)
                 self.addCallEdge(stmt, obj.readable_name)
 
@@ -444,35 +481,31 @@ class Analysis:
 
             elif isinstance(obj, ClassMethodObject):
                 func_obj = obj.func
-                pos_params = func_obj.posParams[:]
-                if len(pos_params) == 0:
+                if len(func_obj.posParams) == 0:
                     # not a method, just skip
                     continue
-                self.workList.append((ADD_POINTS_TO, pos_params[0], {obj.classObj}))
-                del pos_params[0]
-                self.matchArgParam(pos_args=[VarPtr.create(posArg) for posArg in stmt.posargs],
-                                   kw_args={kw: VarPtr.create(kwarg) for kw, kwarg in stmt.kwargs.items()},
-                                   pos_params=pos_params,
+                self.workList.append((ADD_POINTS_TO, func_obj.posParams[0], {obj.classObj}))
+                self.matchArgParam(pos_args=pos_args,
+                                   kw_args=kw_args,
+                                   pos_params=func_obj.posParams[1:],
                                    kw_params=func_obj.kwParams,
                                    var_param=func_obj.varParam,
                                    kw_param=func_obj.kwParam)
                 ret_var = func_obj.retVar
-                res_var = VarPtr.create(stmt.target)
-                self.addFlow(ret_var, res_var)
+                self.addFlow(ret_var, var_ptr)
                 self.addCallEdge(stmt, func_obj.readable_name)
                 self.addReachable(func_obj.codeBlock)
 
             elif isinstance(obj, StaticMethodObject):
                 func_obj = obj.func
-                self.matchArgParam(pos_args=[VarPtr.create(posArg) for posArg in stmt.posargs],
-                                   kw_args={kw: VarPtr.create(kwarg) for kw, kwarg in stmt.kwargs.items()},
+                self.matchArgParam(pos_args=pos_args,
+                                   kw_args=kw_args,
                                    pos_params=func_obj.posParams,
                                    kw_params=func_obj.kwParams,
                                    var_param=func_obj.varParam,
                                    kw_param=func_obj.kwParam)
                 ret_var = func_obj.retVar
-                res_var = VarPtr.create(stmt.target)
-                self.addFlow(ret_var, res_var)
+                self.addFlow(ret_var, var_ptr)
                 self.addReachable(func_obj.codeBlock)
                 self.addCallEdge(stmt, func_obj.readable_name)
 
@@ -481,16 +514,19 @@ class Analysis:
 
                 # target <- instance.attr
                 # insAttr = AttrPtr(insObj, FAKE_PREFIX + "__init__")
-                class_attr = AttrPtr(obj, FAKE_PREFIX + "__init__")
+                class_attr = self.pointerPool.getAttrPtr(obj, fakeAttr("__init__"))
                 # self.addFlow(class_attr, insAttr)
                 self.resolveAttrIfNot(obj, "__init__")
 
-                init = Variable(f"$init_method_of_{obj.id}", stmt.belongsTo)
-                init_ptr = VarPtr.create(init)
-                self.addFlow(class_attr, init_ptr)
-                new_stmt = Call(Variable("", stmt.belongsTo), init, stmt.posargs, stmt.kwargs, stmt.belongsTo,
-                                stmt.belongsTo.getNewID())
-                self.workList.append((BIND_STMT, new_stmt))
+                # one __init__ call for each call site and class, made when the class first reaches it
+                if (stmt, obj) not in self.initCalls:
+                    init = Variable(f"$init_method_of_{obj.id}", stmt.belongsTo)
+                    init_ptr = self.pointerPool.getVarPtr(init)
+                    self.addFlow(class_attr, init_ptr)
+                    new_stmt = Call(Variable("", stmt.belongsTo), init, stmt.posargs, stmt.kwargs, stmt.belongsTo,
+                                    stmt.belongsTo.getNewID())
+                    self.initCalls[(stmt, obj)] = new_stmt
+                    self.workList.append((BIND_STMT, new_stmt))
                 new_objs.add(obj)
         if new_objs:
             self.workList.append((ADD_POINTS_TO, var_ptr, new_objs))
@@ -519,10 +555,10 @@ class Analysis:
         assert (isinstance(stmt, DelAttr))
         attr = stmt.attr
         for obj in objs:
-            if attr in self.persist_attr[obj]:
-                for resolver, mro, index in self.persist_attr[obj][attr]:
+            if attr in self.persist_attr.get(obj, ()):
+                self.persist_attr[obj].remove(attr)
+                for resolver, mro, index in self.resolutionCache.popDependents(obj, attr):
                     self.resolveAttribute(resolver, attr, (mro, index + 1))
-                del self.persist_attr[obj][attr]
 
     # def processNewClassMethod(self, stmtInfo: Tuple[NewClassMethod], objs: Set[Object]):
     #     stmt, = *stmtInfo, 
@@ -542,7 +578,7 @@ class Analysis:
     def processNewStaticMethod(self, stmt_info: Tuple[NewStaticMethod], objs: Set[Object]):
         stmt, = *stmt_info,
         assert (isinstance(stmt, NewStaticMethod))
-        target = VarPtr.create(stmt.target)
+        target = self.pointerPool.getVarPtr(stmt.target)
         new_objs = set()
         for obj in objs:
             if isinstance(obj, FunctionObject) and isinstance(stmt.belongsTo, ClassCodeBlock):
@@ -551,27 +587,29 @@ class Analysis:
         if new_objs:
             self.workList.append((ADD_POINTS_TO, target, new_objs))
 
+    # Super objects are made for the bound classes only, and read their types when resolving attributes,
+    # so new types only continue the attributes that super objects of this type have already resolved.
     def processNewSuper(self, stmt_info: NewSuper, objs: Set[Object]):
         stmt, operand = *stmt_info,
         assert (isinstance(stmt, NewSuper))
+        type_ptr = self.pointerPool.getVarPtr(stmt.type)
         if operand == "type":
-            new_objs = set()
-            target = VarPtr.create(stmt.target)
-            for obj in objs:
-                if isinstance(obj, ClassObject):
-                    for boundObj in self.pointToSet.get(VarPtr.create(stmt.bound)):
-                        new_obj = self.objectPool.create(OBJ_SUPER, obj, boundObj)
-                        new_objs.add(new_obj)
-            if new_objs:
-                self.workList.append((ADD_POINTS_TO, target, new_objs))
+            types = {obj for obj in objs if isinstance(obj, ClassObject)}
+            if not types:
+                return
+            for super_obj in self.resolutionCache.supersOfType(type_ptr):
+                attrs = self.resolutionCache.get(super_obj)
+                for mro in self.classHiearchy.getMROs(super_obj.bound):
+                    for start in self.superStarts(mro, types):
+                        for attr in attrs:
+                            self.resolveAttribute(super_obj, attr, (mro, start))
         else:
             new_objs = set()
-            target = VarPtr.create(stmt.target)
+            target = self.pointerPool.getVarPtr(stmt.target)
             for obj in objs:
                 if isinstance(obj, ClassObject):
-                    for typeObj in self.pointToSet.get(VarPtr.create(stmt.type)):
-                        new_obj = self.objectPool.create(OBJ_SUPER, typeObj, obj)
-                        new_objs.add(new_obj)
+                    new_obj = self.objectPool.create(OBJ_SUPER, type_ptr, obj)
+                    new_objs.add(new_obj)
             if new_objs:
                 self.workList.append((ADD_POINTS_TO, target, new_objs))
 
@@ -1,6 +1,7 @@
+import itertools
 import json
-from collections import defaultdict
-from typing import Dict, Generator, List, Set, Tuple
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Set, Tuple
 
 from spear.analysis.alias.pta import json_utils
 from spear.analysis.alias.pta.objects import ClassObject, FakeObject
@@ -11,15 +12,47 @@ MRO = Tuple[ClassObject, ...]
 SubclassInfo = Tuple[ClassObject, int]
 
 
+DEFAULT_MAX_MROS = 32
+
+
+# When a class would have more MROs than the cap, they are replaced by a single merged one, which contains
+# every class that appears in any of them, in the order they first appear. It isn't a real MRO, so attribute
+# resolution must not stop at the first class that defines the attribute. It never equals a real MRO listing
+# the same classes, so that merging is not mistaken for an MRO the class already has.
+class MergedMRO(tuple):
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return isinstance(other, MergedMRO) and tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((MergedMRO, tuple.__hash__(self)))
+
+
+def mergeMROs(head: ClassObject, mros: Iterable[MRO]) -> MergedMRO:
+    res = {head: None}
+    for mro in mros:
+        for cls in mro:
+            res[cls] = None
+    return MergedMRO(res)
+
+
 class ClassHiearchy:
     mros: Dict[ClassObject, Set[MRO]]
     subClasses: Dict[ClassObject, Set[SubclassInfo]]
     pointToSet: PointsToSet
+    maxMROs: int
+    c3Cache: Dict[Tuple[ClassObject, Tuple[MRO, ...]], MRO]
 
-    def __init__(self, point_to_set):
+    def __init__(self, point_to_set, max_mros: int = DEFAULT_MAX_MROS):
         self.mros = defaultdict(set)
         self.pointToSet = point_to_set
         self.subClasses = defaultdict(set)
+        self.maxMROs = max_mros
+        self.c3Cache = {}
 
     def addClass(self, class_obj: ClassObject) -> Set[MRO]:
         assert (isinstance(class_obj, ClassObject))
@@ -50,78 +83,123 @@ class ClassHiearchy:
         self.subClasses[base_obj].add((class_obj, index))
         return self.addBaseMRO(class_obj, index, self.mros[base_obj])
 
+    # mro_list are new MROs of the base at index, propagated to subclasses with a worklist
     def addBaseMRO(self, class_obj: ClassObject, index: int, mro_list: Set[MRO]) -> Set[MRO]:
+        all_add = set()
+        worklist = deque([(class_obj, index, mro_list)])
+        while worklist:
+            class_obj, index, mro_list = worklist.popleft()
+            add = self._addBaseMRO(class_obj, index, mro_list)
+            if add:
+                all_add |= add
+                for subclass, i in self.subClasses[class_obj]:
+                    worklist.append((subclass, i, add))
+        return all_add
+
+    def _addBaseMRO(self, class_obj: ClassObject, index: int, mro_list: Set[MRO]) -> Set[MRO]:
         assert (isinstance(class_obj, ClassObject))
         bases = class_obj.bases
 
-        # yield mros
-        def select(start: int) -> Generator[List[MRO], None, None]:
-            if start == len(bases):
-                yield []
-
-            elif start == index:
-                for mro in mro_list:
-                    for tail in select(start + 1):
-                        tail.insert(0, mro)
-                        yield tail
+        choices = []
+        count = 1
+        for i in range(len(bases)):
+            if i == index:
+                choice = mro_list
             else:
-                for obj in self.pointToSet.get(bases[start]):
-                    if not isinstance(obj, ClassObject):
-                        continue
-                    for mro in self.mros[obj]:
-                        for tail in select(start + 1):
-                            tail.insert(0, mro)
-                            yield tail
+                choice = set()
+                for obj in self.pointToSet.get(bases[i]):
+                    if isinstance(obj, ClassObject):
+                        choice |= self.mros[obj]
+            choices.append(tuple(choice))
+            count *= len(choice)
+        if count == 0:
+            return set()
 
-        add = set()
-        for mros in select(0):
-            order = [mro[0] for mro in mros]
-            mros.append(order)
-            res = self._c3(class_obj, mros)
+        if count > self.maxMROs:
+            # too many combinations to enumerate
+            candidates = [mergeMROs(class_obj, (mro for choice in choices for mro in choice))]
+        else:
+            candidates = [self._c3(class_obj, base_mros) for base_mros in itertools.product(*choices)]
 
-            if res is not None and res not in self.mros[class_obj]:
+        mros = self.mros[class_obj]
+        add = set()
+        for res in candidates:
+            if res is not None and res not in mros:
                 assert (res[0] == class_obj)
                 add.add(res)
-                self.mros[class_obj].add(res)
 
-        if len(add) == 0:
-            return set()
+        if add and len(mros) + len(add) > self.maxMROs:
+            merged = mergeMROs(class_obj, itertools.chain(mros, add))
+            if merged in mros:
+                return set()
+            mros.clear()
+            mros.add(merged)
+            return {merged}
 
-        all_add = add.copy()
-        for subclass, index in self.subClasses[class_obj]:
-            all_add |= self.addBaseMRO(subclass, index, add)
-        return all_add
+        mros |= add
+        return add
 
     # return None if it is illegal
-    def _c3(self, head, mros: List) -> MRO:
-        for i in range(len(mros)):
-            mros[i] = list(mros[i])
+    def _c3(self, head: ClassObject, base_mros: Tuple[MRO, ...]) -> MRO:
+        if len(base_mros) == 1:
+            # nothing to merge, and cheaper than hashing the key
+            mro, = base_mros
+            if head in mro:
+                return None
+            return (MergedMRO if isinstance(mro, MergedMRO) else tuple)((head, *mro))
 
-        for mro in mros:
+        key = (head, base_mros)
+        try:
+            return self.c3Cache[key]
+        except KeyError:
+            pass
+
+        for mro in base_mros:
             if head in mro:
                 # illegal
-                return None
+                res = None
+                break
+        else:
+            if any(isinstance(mro, MergedMRO) for mro in base_mros):
+                res = mergeMROs(head, base_mros)
+            else:
+                res = self._merge(head, [*base_mros, tuple(mro[0] for mro in base_mros)])
 
-        res = []
+        self.c3Cache[key] = res
+        return res
+
+    # tails counts how many times a class appears after the current head of a list,
+    # so a candidate is checked in constant time instead of scanning every list
+    @staticmethod
+    def _merge(head: ClassObject, mros: List[MRO]) -> MRO:
         mros = [mro for mro in mros if len(mro) != 0]
-        while len(mros) != 0:
-            for mro in mros:
-                candidate = mro[0]
-
-                for another in mros:
-                    if candidate in another[1:]:
-                        break
-                else:
-                    res.append(candidate)
-                    for another in mros:
-                        if another[0] == candidate:
-                            del another[0]
-                    mros = [mro for mro in mros if len(mro) != 0]
+        heads = [0] * len(mros)
+        tails = defaultdict(int)
+        for mro in mros:
+            for cls in mro[1:]:
+                tails[cls] += 1
+
+        res = []
+        remaining = len(mros)
+        while remaining:
+            for i in range(len(mros)):
+                if heads[i] < len(mros[i]) and tails[mros[i][heads[i]]] == 0:
+                    candidate = mros[i][heads[i]]
                     break
             else:
                 # illegal mro
                 return None
 
+            res.append(candidate)
+            for i in range(len(mros)):
+                mro = mros[i]
+                if heads[i] < len(mro) and mro[heads[i]] == candidate:
+                    heads[i] += 1
+                    if heads[i] < len(mro):
+                        tails[mro[heads[i]]] -= 1
+                    else:
+                        remaining -= 1
+
         return head, *res,
 
     def getMROs(self, class_obj: ClassObject) -> Set[MRO]:
@@ -1,5 +1,7 @@
+from typing import Dict, Hashable, List
+
 from spear.analysis.alias.pta.objects import BuiltinObject, ClassMethodObject, ClassObject, FakeObject, \
-    FunctionObject, ModuleObject, StaticMethodObject, SuperObject
+    FunctionObject, ModuleObject, Object, StaticMethodObject, SuperObject
 
 OBJ_MODULE = 0
 OBJ_CLASS = 1
@@ -11,39 +13,25 @@ OBJ_SUPER = 6
 OBJ_FAKE = 7
 OBJ_TYPE_NUM = 8
 
+# indexed by the type numbers above
+OBJ_CLASSES = (ModuleObject, ClassObject, FunctionObject, BuiltinObject, StaticMethodObject, ClassMethodObject,
+               SuperObject, FakeObject)
+
 
+# One pool for each type of object, keyed by generateKey, which is a tuple of ids that already exist.
+# The readable id of an object is only formatted by create, when the object is not in the pool yet.
 class ObjectPool:
+    pools: List[Dict[Hashable, Object]]
 
     def __init__(self):
-        self.pool = {}
+        self.pools = [{} for _ in range(OBJ_TYPE_NUM)]
 
-    def create(self, type: int, *vararg, **kwarg):
-        if type == OBJ_MODULE:
-            return self._create(ModuleObject, *vararg, **kwarg)
-        elif type == OBJ_CLASS:
-            return self._create(ClassObject, *vararg, **kwarg)
-        elif type == OBJ_FUNCTION:
-            return self._create(FunctionObject, *vararg, **kwarg)
-        elif type == OBJ_BUILTIN:
-            return self._create(BuiltinObject, *vararg, **kwarg)
-        elif type == OBJ_STATIC_METHOD:
-            return self._create(StaticMethodObject, *vararg, **kwarg)
-        elif type == OBJ_CLASS_METHOD:
-            return self._create(ClassMethodObject, *vararg, **kwarg)
-        elif type == OBJ_SUPER:
-            return self._create(SuperObject, *vararg, **kwarg)
-        elif type == OBJ_FAKE:
-            return self._create(FakeObject, *vararg, **kwarg)
-
-    def _create(self, obj_cls, *vararg, **kwarg):
-        id = obj_cls.generateID(*vararg, **kwarg)
-        if id in self.pool:
-            return self.pool[id]
-        else:
-            obj = obj_cls.create(*vararg, **kwarg)
-            self.pool[id] = obj
+    def create(self, type: int, *vararg):
+        obj_cls = OBJ_CLASSES[type]
+        pool = self.pools[type]
+        key = obj_cls.generateKey(*vararg)
+        try:
+            return pool[key]
+        except KeyError:
+            obj = pool[key] = obj_cls.create(*vararg)
             return obj
-
-    def get(self, id):
-        if id in self.pool:
-            return self.pool[id]
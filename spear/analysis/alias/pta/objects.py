@@ -1,3 +1,4 @@
+from types import MappingProxyType
 from typing import List, Tuple, Union
 
 from spear.analysis.alias.pta.pointers import VarPtr
@@ -9,8 +10,11 @@ from spear.analysis.alias.ir.module_code_block import ModuleCodeBlock
 # Object's information should remain static as the pta proceeds.
 # Objects have loose relation with IR, but contain all the necessary information in the IR, and can be easily exported. 
 # That means even without IR, objects can be still represented, and pta can still run. 
+# All objects are slotted, see CodeBlockObject for module, function and class objects.
 
 class Object:
+    __slots__ = ("id", "objType")
+
     id: str
 
     def __init__(self, obj_type: str):
@@ -29,7 +33,15 @@ class Object:
         return self.id
 
 
-class ModuleObject(Object):
+# Module, function and class objects share one slot layout, so that FakeObject can disguise itself as all of them.
+class CodeBlockObject(Object):
+    __slots__ = ("readable_name", "codeBlock", "retVar", "posParams", "kwParams", "varParam", "kwParam", "bases",
+                 "attributes")
+
+
+class ModuleObject(CodeBlockObject):
+    __slots__ = ()
+
     # codeBlock: ModuleCodeBlock
     readable_name: str
 
@@ -47,11 +59,17 @@ class ModuleObject(Object):
     def generateID(module: ModuleCodeBlock):
         return f"Module({module.id})"
 
+    @staticmethod
+    def generateKey(module: ModuleCodeBlock):
+        return module.id
+
     def unwrapID(self):
         return self.id[7:-1]
 
 
-class FunctionObject(Object):
+class FunctionObject(CodeBlockObject):
+    __slots__ = ()
+
     codeBlock: FunctionCodeBlock  # used
 
     # necessary info in IR
@@ -98,11 +116,17 @@ class FunctionObject(Object):
     def generateID(alloc_site: NewFunction):
         return f"Function({alloc_site.codeBlock.id})"
 
+    @staticmethod
+    def generateKey(alloc_site: NewFunction):
+        return alloc_site.codeBlock.id
+
     def unwrapID(self):
         return self.id[9:-1]
 
 
-class ClassObject(Object):
+class ClassObject(CodeBlockObject):
+    __slots__ = ()
+
     # alloc_site: NewClass
     readable_name: str
     bases: List[VarPtr]
@@ -123,6 +147,10 @@ class ClassObject(Object):
     def generateID(alloc_site: NewClass):
         return f"Class({alloc_site.codeBlock.id})"
 
+    @staticmethod
+    def generateKey(alloc_site: NewClass):
+        return alloc_site.codeBlock.id
+
     @staticmethod
     def create(alloc_site: NewClass):
         code_block = alloc_site.codeBlock
@@ -150,6 +178,8 @@ class ClassObject(Object):
 
 
 class InstanceObject(Object):
+    __slots__ = ("type",)
+
     type: ClassObject
 
     def __eq__(self, other):
@@ -191,6 +221,7 @@ class InstanceObject(Object):
 
 
 class BuiltinObject(Object):
+    __slots__ = ()
 
     def __init__(self, id: str):
         self.id = id
@@ -199,6 +230,10 @@ class BuiltinObject(Object):
     def generateID(alloc_site: NewBuiltin):
         return f"Builtin({alloc_site.belongsTo.id}.${alloc_site.id})"
 
+    @staticmethod
+    def generateKey(alloc_site: NewBuiltin):
+        return alloc_site.belongsTo.id, alloc_site.id
+
     @staticmethod
     def create(alloc_site: NewBuiltin):
         return BuiltinObject(id=BuiltinObject.generateID(alloc_site))
@@ -208,6 +243,8 @@ class BuiltinObject(Object):
 
 
 class InstanceMethodObject(Object):
+    __slots__ = ("selfObj", "func")
+
     selfObj: InstanceObject
     func: FunctionObject
 
@@ -228,30 +265,48 @@ class InstanceMethodObject(Object):
         return self.__str__()
 
 
+# A function read from a class, whose first parameter is bound to the class when it is called. There is one for
+# every class and inherited function, so the id is only formatted when it is printed, and since they are pooled,
+# they are compared by identity.
 class ClassMethodObject(Object):
+    __slots__ = ("classObj", "func", "_id", "_hash")
+
     classObj: ClassObject
     func: FunctionObject
 
-    def __init__(self, id: str, class_obj: ClassObject, func: FunctionObject):
+    def __init__(self, class_obj: ClassObject, func: FunctionObject):
         self.classObj = class_obj
         self.func = func
-        self.id = id
+        self._id = None
+        self._hash = hash(ClassMethodObject.generateKey(class_obj, func))
+
+    @property
+    def id(self) -> str:
+        if self._id is None:
+            self._id = f"ClassMethod({self.classObj.id},{self.func.id})"
+        return self._id
+
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return self._hash
 
     @staticmethod
-    def generateID(class_obj: ClassObject, func: FunctionObject):
-        return f"ClassMethod({class_obj.id},{func.id})"
+    def generateKey(class_obj: ClassObject, func: FunctionObject):
+        return class_obj.id, func.id
 
     @staticmethod
     def create(class_obj: ClassObject, func: FunctionObject):
-        return ClassMethodObject(id=ClassMethodObject.generateID(class_obj, func),
-                                 class_obj=class_obj,
-                                 func=func)
+        return ClassMethodObject(class_obj, func)
 
     def unwrapID(self):
         return self.id[12:-1]
 
 
 class StaticMethodObject(Object):
+    __slots__ = ("func",)
+
     func: FunctionObject
 
     def __init__(self, id: str, func: FunctionObject):
@@ -262,6 +317,10 @@ class StaticMethodObject(Object):
     def generateID(func: FunctionObject):
         return f"StaticMethod({func.id})"
 
+    @staticmethod
+    def generateKey(func: FunctionObject):
+        return func.id
+
     @staticmethod
     def create(func: FunctionObject):
         return StaticMethodObject(id=StaticMethodObject.generateID(func),
@@ -271,21 +330,29 @@ class StaticMethodObject(Object):
         return self.id[13:-1]
 
 
+# super(type, bound) for every class bound points to, made once per type variable rather than per class in it.
+# The classes type points to are read when attributes are resolved, each one a place to start along the MROs.
 class SuperObject(Object):
-    type: ClassObject
+    __slots__ = ("type", "bound")
+
+    type: VarPtr
     bound: ClassObject
 
-    def __init__(self, id: str, type: ClassObject, bound: ClassObject):
+    def __init__(self, id: str, type: VarPtr, bound: ClassObject):
         self.type = type
         self.bound = bound
         self.id = id
 
     @staticmethod
-    def generateID(type: ClassObject, bound: ClassObject):
+    def generateID(type: VarPtr, bound: ClassObject):
         return f"Super({type.id},{bound.id})"
 
     @staticmethod
-    def create(type: ClassObject, bound: ClassObject):
+    def generateKey(type: VarPtr, bound: ClassObject):
+        return type.id, bound.id
+
+    @staticmethod
+    def create(type: VarPtr, bound: ClassObject):
         return SuperObject(id=SuperObject.generateID(type, bound),
                            type=type,
                            bound=bound)
@@ -295,6 +362,8 @@ class SuperObject(Object):
 
 
 class FakeObject(ModuleObject, ClassObject, FunctionObject):
+    __slots__ = ("prefix", "getAttr", "_retVar", "_varParam", "_kwParam")
+
     GetEdge = Tuple[VarPtr, VarPtr, str]
 
     id: str
@@ -302,21 +371,43 @@ class FakeObject(ModuleObject, ClassObject, FunctionObject):
     prefix: 'FakeObject'
     getAttr: GetEdge
 
+    # disguise, shared by all fake objects
+    codeBlock = None
+    posParams = ()
+    kwParams = MappingProxyType({})
+    bases = ()
+    attributes = ()
+
     def __init__(self, id: str, prefix: 'FakeObject', get_attr: GetEdge):
         self.id = id
         self.prefix = prefix
         self.getAttr = get_attr
-
-        # disguise
-        self.readable_name = self.unwrapID()
-        self.codeBlock = None
-        self.retVar = VarPtr(f"$ret@{id}", f"$ret@{self.readable_name}")
-        self.posParams = []
-        self.kwParams = {}
-        self.varParam = VarPtr("$varParam@{id}", f"$varParam@{self.readable_name}")
-        self.kwParam = VarPtr("$kwParam@{id}", f"$kwParam@{self.readable_name}")
-        self.bases = []
-        self.attributes = []
+        self._retVar = None
+        self._varParam = None
+        self._kwParam = None
+
+    @property
+    def readable_name(self) -> str:
+        return self.unwrapID()
+
+    # most fake objects are never called, so their parameters are created when first asked for
+    @property
+    def retVar(self) -> VarPtr:
+        if self._retVar is None:
+            self._retVar = VarPtr(f"$ret@{self.id}", f"$ret@{self.readable_name}")
+        return self._retVar
+
+    @property
+    def varParam(self) -> VarPtr:
+        if self._varParam is None:
+            self._varParam = VarPtr(f"$varParam@{self.id}", f"$varParam@{self.readable_name}")
+        return self._varParam
+
+    @property
+    def kwParam(self) -> VarPtr:
+        if self._kwParam is None:
+            self._kwParam = VarPtr(f"$kwParam@{self.id}", f"$kwParam@{self.readable_name}")
+        return self._kwParam
 
     @staticmethod
     def generateID(prefix: Union['FakeObject', str], get_attr: GetEdge = None):
@@ -327,6 +418,15 @@ class FakeObject(ModuleObject, ClassObject, FunctionObject):
         elif isinstance(prefix, str):
             return f"Fake({prefix})"
 
+    # the key is the unwrapped id, so that a module reached both by its name and as an attribute is one object
+    @staticmethod
+    def generateKey(prefix: Union['FakeObject', str], get_attr: GetEdge = None):
+        if isinstance(prefix, FakeObject):
+            _, _, attr = get_attr
+            return FakeObject.cut(prefix, get_attr).unwrapID() + "." + attr
+        elif isinstance(prefix, str):
+            return prefix
+
     @staticmethod
     def create(prefix: Union['FakeObject', str], get_attr: GetEdge = None):
         id = FakeObject.generateID(prefix, get_attr)
@@ -0,0 +1,33 @@
+from collections import defaultdict
+from typing import Dict
+
+from spear.analysis.alias.pta.objects import Object
+from spear.analysis.alias.pta.pointers import AttrPtr, VarPtr
+
+from spear.analysis.alias.ir.ir_stmts import Variable
+
+
+# Canonical pointers, so that the same variable or (object, attribute) always gets the same pointer object.
+# Looking a pointer up hashes a variable's uid or an object's id, no pointer or id string is created again.
+class PointerPool:
+    varPtrs: Dict[Variable, VarPtr]
+    attrPtrs: Dict[Object, Dict[str, AttrPtr]]
+
+    def __init__(self):
+        self.varPtrs = {}
+        self.attrPtrs = defaultdict(dict)
+
+    def getVarPtr(self, var: Variable) -> VarPtr:
+        try:
+            return self.varPtrs[var]
+        except KeyError:
+            ptr = self.varPtrs[var] = VarPtr.create(var)
+            return ptr
+
+    def getAttrPtr(self, obj: Object, attr: str) -> AttrPtr:
+        ptrs = self.attrPtrs[obj]
+        try:
+            return ptrs[attr]
+        except KeyError:
+            ptr = ptrs[attr] = AttrPtr(obj, attr)
+            return ptr
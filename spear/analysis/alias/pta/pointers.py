@@ -5,7 +5,11 @@ if typing.TYPE_CHECKING:
 from spear.analysis.alias.ir.ir_stmts import Variable
 
 
+# Pointers are created for every variable and attribute the analysis touches, so they are slotted and only
+# keep the id, which is used in comparing and hashing. Readable names are formatted on demand.
 class Pointer:
+    __slots__ = ("id",)
+
     id: str
 
     def __repr__(self) -> str:
@@ -22,17 +26,27 @@ class Pointer:
 
 
 class VarPtr(Pointer):
+    __slots__ = ("var", "_readable_name")
+
+    var: Variable  # None if there is no such variable in IR, e.g. parameters of fake objects
 
-    def __init__(self, id: str, readable_name: str):
+    def __init__(self, id: str, readable_name: str = None, var: Variable = None):
         self.id = id
-        self.readable_name = readable_name
+        self.var = var
+        self._readable_name = readable_name
+
+    @property
+    def readable_name(self) -> str:
+        return self.var.readable_name if self.var is not None else self._readable_name
 
     @staticmethod
     def create(var: Variable):
-        return VarPtr(var.id, var.readable_name)
+        return VarPtr(var.id, var=var)
 
 
 class AttrPtr(Pointer):
+    __slots__ = ("obj", "attr")
+
     obj: 'Object'
     attr: str
 
@@ -40,5 +54,8 @@ class AttrPtr(Pointer):
         self.obj = obj
         self.attr = attr
         self.id = f"<{obj.id}>.{attr}"
-        if hasattr(obj, "readable_name"):
-            self.readable_name = f"<{obj.readable_name}>.{attr}"
+
+    # raise AttributeError when obj doesn't have a readable name
+    @property
+    def readable_name(self) -> str:
+        return f"<{self.obj.readable_name}>.{self.attr}"
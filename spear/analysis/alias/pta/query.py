@@ -0,0 +1,109 @@
+from collections import defaultdict
+from typing import Dict, Set, Union
+
+from spear.analysis.alias.pta.objects import Object
+from spear.analysis.alias.pta.pointers import AttrPtr, Pointer, VarPtr
+
+from spear.analysis.alias.ir.function_code_block import FunctionCodeBlock
+from spear.analysis.alias.ir.ir_stmts import Variable
+
+PointerLike = Union[Pointer, Variable, str]
+ObjectLike = Union[Object, str]
+
+EMPTY = frozenset()
+
+
+# Read-only query layer over a solved Analysis.
+# All the inverted indexes are built once in the constructor, so that each query is a few dict lookups
+# instead of a scan over the point-to sets. Sets returned are shared with the indexes, don't modify them.
+class AnalysisQuery:
+    pointsTo: Dict[Pointer, Set[Object]]
+    pointersByName: Dict[str, Set[Pointer]]
+    objectsByName: Dict[str, Set[Object]]
+    pointersOf: Dict[Object, Set[Pointer]]
+    callees: Dict[str, Set[str]]
+    callers: Dict[str, Set[str]]
+    functions: Dict[str, Set[str]]
+
+    def __init__(self, analysis):
+        self.pointsTo = {}
+        self.pointersByName = defaultdict(set)
+        self.objectsByName = defaultdict(set)
+        self.pointersOf = defaultdict(set)
+        self.callees = analysis.callgraph
+        self.callers = defaultdict(set)
+        self.functions = defaultdict(set)
+
+        point_to_set = analysis.pointToSet
+        for var_ptr, objs in point_to_set.varPtrSet.items():
+            self._addPointer(var_ptr, objs)
+        for obj, d in point_to_set.attrPtrSet.items():
+            for attr, objs in d.items():
+                self._addPointer(AttrPtr(obj, attr), objs)
+
+        for caller, callees in analysis.callgraph.items():
+            for callee in callees:
+                self.callers[callee].add(caller)
+
+        for code_block in analysis.reachable:
+            if isinstance(code_block, FunctionCodeBlock):
+                self.functions[code_block.module.readable_name].add(code_block.readable_name)
+
+    def _addPointer(self, ptr: Pointer, objs: Set[Object]):
+        if not objs:
+            return
+        self.pointsTo[ptr] = objs
+        self.pointersByName[str(ptr)].add(ptr)
+        for obj in objs:
+            self.pointersOf[obj].add(ptr)
+            self.objectsByName[str(obj)].add(obj)
+
+    def _pointers(self, v: PointerLike) -> Set[Pointer]:
+        if isinstance(v, Variable):
+            return {VarPtr.create(v)}
+        elif isinstance(v, Pointer):
+            return {v}
+        else:
+            return self.pointersByName.get(v, EMPTY)
+
+    def _objects(self, o: ObjectLike) -> Set[Object]:
+        if isinstance(o, Object):
+            return {o}
+        else:
+            return self.objectsByName.get(o, EMPTY)
+
+    def getPointsTo(self, v: PointerLike) -> Set[Object]:
+        ptrs = self._pointers(v)
+        if len(ptrs) == 1:
+            return self.pointsTo.get(next(iter(ptrs)), EMPTY)
+        res = set()
+        for ptr in ptrs:
+            res |= self.pointsTo.get(ptr, EMPTY)
+        return res
+
+    # two pointers may alias if their point-to sets share an object
+    def mayAlias(self, v1: PointerLike, v2: PointerLike) -> bool:
+        pts1 = self.getPointsTo(v1)
+        pts2 = self.getPointsTo(v2)
+        if len(pts1) > len(pts2):
+            pts1, pts2 = pts2, pts1
+        return not pts1.isdisjoint(pts2)
+
+    def pointersTo(self, o: ObjectLike) -> Set[Pointer]:
+        objs = self._objects(o)
+        if len(objs) == 1:
+            return self.pointersOf.get(next(iter(objs)), EMPTY)
+        res = set()
+        for obj in objs:
+            res |= self.pointersOf.get(obj, EMPTY)
+        return res
+
+    def calleesOf(self, func: str) -> Set[str]:
+        return self.callees.get(func, EMPTY)
+
+    def callersOf(self, func: str) -> Set[str]:
+        return self.callers.get(func, EMPTY)
+
+    # reachable functions defined in a module, including methods and nested functions
+    def functionsOf(self, module: str) -> Set[str]:
+        return self.functions.get(module, EMPTY)
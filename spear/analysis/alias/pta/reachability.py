@@ -0,0 +1,170 @@
+from typing import Dict, Iterable, List, Set
+
+
+def _bits(x: int) -> Iterable[int]:
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+
+
+# Transitive reachability over a callgraph in the exported format (caller -> callees, by name).
+# The callgraph is condensed into its strongly connected components, and each component keeps two bitsets:
+# the components it reaches and the components that reach it. Bit i stands for component i.
+# Thus "does X reach Y" is a single bit test, and adding an edge only updates the components it affects.
+class CallGraphReachability:
+    sccOf: Dict[str, int]  # function -> component
+    members: List[Set[str]]  # component -> functions, empty if merged into another component
+    reach: List[int]  # component -> bitset of components reachable from it, including itself
+    reachedBy: List[int]  # component -> bitset of components that can reach it, including itself
+
+    def __init__(self, callgraph: Dict[str, Iterable[str]] = None):
+        self.sccOf = {}
+        self.members = []
+        self.reach = []
+        self.reachedBy = []
+        if callgraph:
+            self._build(callgraph)
+
+    def _build(self, callgraph: Dict[str, Iterable[str]]):
+        nodes = {}
+        succs = []
+        for caller, callees in callgraph.items():
+            for name in (caller, *callees):
+                if name not in nodes:
+                    nodes[name] = len(nodes)
+                    succs.append([])
+            succs[nodes[caller]].extend(nodes[callee] for callee in callees)
+        names = list(nodes.keys())
+
+        # iterative Tarjan, components come out in reverse topological order
+        index = [-1] * len(names)
+        low = [0] * len(names)
+        on_stack = [False] * len(names)
+        stack = []
+        comp = [-1] * len(names)
+        counter = 0
+        for root in range(len(names)):
+            if index[root] >= 0:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, i = work.pop()
+                if i == 0:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack[v] = True
+                else:
+                    low[v] = min(low[v], low[succs[v][i - 1]])
+                while i < len(succs[v]):
+                    w = succs[v][i]
+                    i += 1
+                    if index[w] < 0:
+                        work.append((v, i))
+                        work.append((w, 0))
+                        break
+                    elif on_stack[w]:
+                        low[v] = min(low[v], index[w])
+                else:
+                    if low[v] == index[v]:
+                        c = len(self.members)
+                        members = set()
+                        while True:
+                            w = stack.pop()
+                            on_stack[w] = False
+                            comp[w] = c
+                            members.add(names[w])
+                            if w == v:
+                                break
+                        self.members.append(members)
+
+        for v, name in enumerate(names):
+            self.sccOf[name] = comp[v]
+
+        comp_succs = [set() for _ in self.members]
+        for v in range(len(names)):
+            for w in succs[v]:
+                if comp[v] != comp[w]:
+                    comp_succs[comp[v]].add(comp[w])
+
+        # successors always have smaller component ids
+        self.reach = [1 << c for c in range(len(self.members))]
+        for c in range(len(self.members)):
+            for s in comp_succs[c]:
+                self.reach[c] |= self.reach[s]
+        self.reachedBy = [1 << c for c in range(len(self.members))]
+        for c in reversed(range(len(self.members))):
+            for s in comp_succs[c]:
+                self.reachedBy[s] |= self.reachedBy[c]
+
+    def _addNode(self, name: str) -> int:
+        if name in self.sccOf:
+            return self.sccOf[name]
+        c = len(self.members)
+        self.sccOf[name] = c
+        self.members.append({name})
+        self.reach.append(1 << c)
+        self.reachedBy.append(1 << c)
+        return c
+
+    def _functions(self, comps: int) -> Set[str]:
+        res = set()
+        for c in _bits(comps):
+            res |= self.members[c]
+        return res
+
+    def addEdge(self, caller: str, callee: str) -> bool:
+        # return True if reachability changed
+        src = self._addNode(caller)
+        dst = self._addNode(callee)
+        if self.reach[src] >> dst & 1:
+            return False
+
+        if self.reach[dst] >> src & 1:
+            # a new cycle, every component on a path from dst to src collapses into src
+            on_cycle = self.reach[dst] & self.reachedBy[src]
+            for c in _bits(on_cycle):
+                if c == src:
+                    continue
+                for name in self.members[c]:
+                    self.sccOf[name] = src
+                self.members[src] |= self.members[c]
+                self.members[c] = set()
+                self.reach[src] |= self.reach[c]
+                self.reachedBy[src] |= self.reachedBy[c]
+            reach = self.reach[src]
+            reached_by = self.reachedBy[src]
+        else:
+            reach = self.reach[dst]
+            reached_by = self.reachedBy[src]
+
+        for c in _bits(reached_by):
+            self.reach[c] |= reach
+        for c in _bits(reach):
+            self.reachedBy[c] |= reached_by
+        return True
+
+    def addCallgraph(self, callgraph: Dict[str, Iterable[str]]):
+        for caller, callees in callgraph.items():
+            for callee in callees:
+                self.addEdge(caller, callee)
+
+    # a function always reaches itself
+    def isReachable(self, source: str, target: str) -> bool:
+        if source not in self.sccOf or target not in self.sccOf:
+            return source == target
+        return self.reach[self.sccOf[source]] >> self.sccOf[target] & 1 == 1
+
+    def reachableFrom(self, func: str) -> Set[str]:
+        if func not in self.sccOf:
+            return {func}
+        return self._functions(self.reach[self.sccOf[func]])
+
+    def reachingTo(self, func: str) -> Set[str]:
+        if func not in self.sccOf:
+            return {func}
+        return self._functions(self.reachedBy[self.sccOf[func]])
+
+    def sameComponent(self, func1: str, func2: str) -> bool:
+        return func1 in self.sccOf and self.sccOf.get(func1) == self.sccOf.get(func2)
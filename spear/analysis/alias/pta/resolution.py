@@ -0,0 +1,58 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Set, Tuple, Union
+
+from spear.analysis.alias.pta.class_hiearchy import MRO
+from spear.analysis.alias.pta.objects import ClassObject, SuperObject
+from spear.analysis.alias.pta.pointers import VarPtr
+
+Resolver = Union[ClassObject, SuperObject]
+ResolveInfo = Tuple[Resolver, MRO, int]
+
+
+# Resolved attributes, i.e. resolver.$r_attr, and what each of them depends on.
+# For each (resolver, attr), it keeps the classes whose attr already flows into resolver.$r_attr, so walking
+# another MRO only adds flows for classes not seen yet. Each walk stops at the first class that defines attr,
+# and that stop is recorded, so that only the walks stopping at a class are continued when attr is deleted
+# from it. When a class gets new MROs, only the class itself and the super objects bound to it walk them, and
+# when the type of super objects points to new classes, only the super objects that resolved something walk again.
+class ResolutionCache:
+    resolutions: Dict[Resolver, Dict[str, Set[ClassObject]]]
+    supers: Dict[ClassObject, Set[SuperObject]]  # bound class -> super objects which resolve attributes
+    typedSupers: Dict[VarPtr, Set[SuperObject]]  # type -> super objects which resolve attributes
+    dependents: Dict[ClassObject, Dict[str, Set[ResolveInfo]]]  # (class, attr) -> walks stopped at it
+
+    def __init__(self):
+        self.resolutions = defaultdict(dict)
+        self.supers = defaultdict(set)
+        self.typedSupers = defaultdict(set)
+        self.dependents = defaultdict(lambda: defaultdict(set))
+
+    # return None if attr of resolver is already resolved
+    def add(self, resolver: Resolver, attr: str) -> Set[ClassObject]:
+        resolutions = self.resolutions[resolver]
+        if attr in resolutions:
+            return None
+        if isinstance(resolver, SuperObject):
+            self.supers[resolver.bound].add(resolver)
+            self.typedSupers[resolver.type].add(resolver)
+        parents = resolutions[attr] = set()
+        return parents
+
+    def get(self, resolver: Resolver) -> Dict[str, Set[ClassObject]]:
+        return self.resolutions.get(resolver, {})
+
+    # resolvers that should walk the new MROs of class_obj
+    def resolversOf(self, class_obj: ClassObject) -> Iterable[Resolver]:
+        yield class_obj
+        yield from self.supers.get(class_obj, ())
+
+    def supersOfType(self, type: VarPtr) -> Iterable[SuperObject]:
+        return self.typedSupers.get(type, ())
+
+    def depend(self, parent: ClassObject, attr: str, resolve_info: ResolveInfo):
+        self.dependents[parent][attr].add(resolve_info)
+
+    def popDependents(self, parent: ClassObject, attr: str) -> Set[ResolveInfo]:
+        if parent not in self.dependents:
+            return set()
+        return self.dependents[parent].pop(attr, set())
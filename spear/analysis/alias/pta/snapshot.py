@@ -0,0 +1,254 @@
+"""
+Compact binary snapshot of the analysis result.
+
+A snapshot holds three sorted string tables (pointers, objects and functions) and two
+CSR-style adjacency arrays: pointer -> objects (points-to) and function -> functions
+(call edges). Every section is a flat array, so the reader can memory-map the file and
+answer lookups by binary search without deserializing anything.
+
+Layout (native byte order, every section aligned to 8 bytes):
+    header:   magic, version, byte order, section count
+    sections: table of (offset, count) pairs, followed by the section payloads
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from typing import BinaryIO, Dict, Iterable, List, Set, Tuple
+
+from spear.analysis.alias.pta.points_to_set import PointsToSet
+from spear.analysis.alias.pta.pointers import AttrPtr
+
+MAGIC = b"SPEARSNP"
+VERSION = 1
+
+HEADER = struct.Struct("<8sIII")
+SECTION = struct.Struct("<QQ")
+
+# section indexes
+SEC_PTR_OFFSETS = 0
+SEC_PTR_BLOB = 1
+SEC_OBJ_OFFSETS = 2
+SEC_OBJ_BLOB = 3
+SEC_FUNC_OFFSETS = 4
+SEC_FUNC_BLOB = 5
+SEC_PTS_INDPTR = 6
+SEC_PTS_INDICES = 7
+SEC_CG_INDPTR = 8
+SEC_CG_INDICES = 9
+SEC_NUM = 10
+
+BYTE_ORDER = {"little": 0, "big": 1}[sys.byteorder]
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _stringTable(names: Iterable[str]) -> Tuple[List[str], array, bytes]:
+    # sorted by utf-8 bytes, so that the reader can compare raw slices of the mapped file
+    encoded = sorted(set(name.encode("utf-8") for name in names))
+    offsets = array("Q", [0])
+    for s in encoded:
+        offsets.append(offsets[-1] + len(s))
+    return [s.decode("utf-8") for s in encoded], offsets, b"".join(encoded)
+
+
+def _csr(rows: Dict[str, Set[str]], row_names: List[str], col_index: Dict[str, int]) -> Tuple[array, array]:
+    indptr = array("Q", [0])
+    indices = array("I")
+    for name in row_names:
+        indices.extend(sorted(col_index[col] for col in rows.get(name, ())))
+        indptr.append(len(indices))
+    return indptr, indices
+
+
+def dump(point_to_set: PointsToSet, callgraph: Dict[str, Set[str]], fp: BinaryIO):
+    # pointers are named the same way as in PointsToSet.to_json
+    points_to = defaultdict(set)
+    for var_ptr, objs in point_to_set.varPtrSet.items():
+        points_to[str(var_ptr)] |= {str(obj) for obj in objs}
+    for obj, d in point_to_set.attrPtrSet.items():
+        for attr, objs in d.items():
+            points_to[str(AttrPtr(obj, attr))] |= {str(o) for o in objs}
+
+    calls = defaultdict(set)
+    for caller, callees in callgraph.items():
+        calls[caller] |= set(callees)
+
+    ptr_names, ptr_offsets, ptr_blob = _stringTable(points_to.keys())
+    obj_names, obj_offsets, obj_blob = _stringTable(o for objs in points_to.values() for o in objs)
+    func_names, func_offsets, func_blob = _stringTable(
+        list(calls.keys()) + [callee for callees in calls.values() for callee in callees])
+
+    obj_index = {name: i for i, name in enumerate(obj_names)}
+    func_index = {name: i for i, name in enumerate(func_names)}
+    pts_indptr, pts_indices = _csr(points_to, ptr_names, obj_index)
+    cg_indptr, cg_indices = _csr(calls, func_names, func_index)
+
+    sections = [ptr_offsets, ptr_blob, obj_offsets, obj_blob, func_offsets, func_blob,
+                pts_indptr, pts_indices, cg_indptr, cg_indices]
+    assert (len(sections) == SEC_NUM)
+
+    offset = _align(HEADER.size + SECTION.size * SEC_NUM)
+    table = []
+    for section in sections:
+        count = len(section)
+        size = count * section.itemsize if isinstance(section, array) else count
+        table.append((offset, count))
+        offset = _align(offset + size)
+
+    fp.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER, SEC_NUM))
+    for entry in table:
+        fp.write(SECTION.pack(*entry))
+    pos = HEADER.size + SECTION.size * SEC_NUM
+    for (start, _), section in zip(table, sections):
+        fp.write(b"\0" * (start - pos))
+        data = section.tobytes() if isinstance(section, array) else section
+        fp.write(data)
+        pos = start + len(data)
+
+
+def dumpAnalysis(analysis, path: str):
+    with open(path, "wb") as fp:
+        dump(analysis.pointToSet, analysis.callgraph, fp)
+
+
+class StringTable:
+    offsets: memoryview
+    blob: memoryview
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def raw(self, i: int) -> bytes:
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]])
+
+    def index(self, name: str) -> int:
+        # binary search on the raw bytes, -1 if not found
+        key = name.encode("utf-8")
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self.raw(lo) == key:
+            return lo
+        return -1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class SnapshotReader:
+    pointers: StringTable
+    objects: StringTable
+    functions: StringTable
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file = open(path, "rb")
+        self._mmap = None
+        self._view = None
+        self._views = []
+        try:
+            self._load()
+        except BaseException:
+            self.close()
+            raise
+
+    def _load(self):
+        path = self._path
+        if HEADER.size + SECTION.size * SEC_NUM > os.fstat(self._file.fileno()).st_size:
+            raise ValueError(f"{path} is not a valid Spear snapshot, it is empty or truncated.")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, version, byte_order, section_num = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Spear snapshot.")
+        if version != VERSION or section_num != SEC_NUM:
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        if byte_order != BYTE_ORDER:
+            raise ValueError(f"Snapshot {path} was written on a machine with a different byte order.")
+
+        self._sections = [SECTION.unpack_from(self._mmap, HEADER.size + SECTION.size * i) for i in range(SEC_NUM)]
+
+        self.pointers = StringTable(self._array(SEC_PTR_OFFSETS, "Q"), self._bytes(SEC_PTR_BLOB))
+        self.objects = StringTable(self._array(SEC_OBJ_OFFSETS, "Q"), self._bytes(SEC_OBJ_BLOB))
+        self.functions = StringTable(self._array(SEC_FUNC_OFFSETS, "Q"), self._bytes(SEC_FUNC_BLOB))
+        self._ptsIndptr = self._array(SEC_PTS_INDPTR, "Q")
+        self._ptsIndices = self._array(SEC_PTS_INDICES, "I")
+        self._cgIndptr = self._array(SEC_CG_INDPTR, "Q")
+        self._cgIndices = self._array(SEC_CG_INDICES, "I")
+
+    def _bytes(self, section: int) -> memoryview:
+        offset, count = self._sections[section]
+        return self._slice(offset, count)
+
+    def _array(self, section: int, typecode: str) -> memoryview:
+        offset, count = self._sections[section]
+        view = self._slice(offset, count * array(typecode).itemsize)
+        view = view.cast(typecode)
+        self._views.append(view)
+        return view
+
+    def _slice(self, offset: int, size: int) -> memoryview:
+        if offset + size > len(self._view):
+            raise ValueError(f"{self._path} is not a valid Spear snapshot, it is empty or truncated.")
+        view = self._view[offset:offset + size]
+        self._views.append(view)
+        return view
+
+    def pointsTo(self, pointer: str) -> List[str]:
+        i = self.pointers.index(pointer)
+        if i < 0:
+            return []
+        return [self.objects[j] for j in self._ptsIndices[self._ptsIndptr[i]:self._ptsIndptr[i + 1]]]
+
+    def callees(self, caller: str) -> List[str]:
+        i = self.functions.index(caller)
+        if i < 0:
+            return []
+        return [self.functions[j] for j in self._cgIndices[self._cgIndptr[i]:self._cgIndptr[i + 1]]]
+
+    def export(self) -> Dict[str, List[str]]:
+        # the same format as the json callgraph output
+        callgraph = {}
+        for i in range(len(self.functions)):
+            start, end = self._cgIndptr[i], self._cgIndptr[i + 1]
+            if start != end:
+                callgraph[self.functions[i]] = [self.functions[j] for j in self._cgIndices[start:end]]
+        return callgraph
+
+    def close(self):
+        # views must be released before the map can be closed
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
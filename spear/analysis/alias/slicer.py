@@ -0,0 +1,134 @@
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Set
+
+from spear.analysis.alias.ir.code_block import CodeBlock
+from spear.analysis.alias.ir.function_code_block import FunctionCodeBlock
+from spear.analysis.alias.ir.ir_stmts import Assign, Call, DelAttr, GetAttr, IRStmt, NewBuiltin, NewClass, \
+    NewFunction, NewStaticMethod, NewSuper, SetAttr
+
+# Keys that statements can be relevant through, besides variables. Attributes are field-based, i.e. a relevant
+# attribute keeps every SetAttr of it no matter which object is written. Callees are not known before solving,
+# so a relevant parameter keeps the arguments of every call at its position or keyword.
+ATTR = "attr"
+POS = "pos"
+KW = "kw"
+ALL_POS = ("pos",)
+ALL_KW = ("kw",)
+RETURN = ("return",)
+
+Key = Any
+
+
+# Call-relevance slicing on IR, done after IR generation and before PTA.
+# Working backwards from the operands that decide what gets called (callees, bases, and operands of NewSuper and
+# NewStaticMethod), only statements that may transitively affect them are kept. Statements with other effects
+# on the callgraph, i.e. calls, classes and imports, are always kept. The callgraph should not change, but
+# point-to sets are only complete for variables the callgraph depends on.
+class Slicer:
+    codeBlocks: List[CodeBlock]
+    defs: Dict[Key, List[IRStmt]]  # key -> statements defining it
+    uses: Dict[Key, List[Key]]  # key -> keys it depends on, besides those of its definitions
+    relevant: Set[Key]
+    workingList: Deque[Key]
+    kept: Set[IRStmt]
+
+    def __init__(self, code_blocks: List[CodeBlock]):
+        self.codeBlocks = code_blocks
+        self.defs = defaultdict(list)
+        self.uses = defaultdict(list)
+        self.relevant = set()
+        self.workingList = deque()
+        self.kept = set()
+
+    def start(self):
+        self.count()
+        self.process()
+        self.postprocess()
+
+    def count(self):
+        has_call = False
+        for code_block in self.codeBlocks:
+            if isinstance(code_block, FunctionCodeBlock):
+                self.countParams(code_block)
+            for stmt in code_block.stmts:
+                if isinstance(stmt, Assign):
+                    self.defs[stmt.target].append(stmt)
+                elif isinstance(stmt, GetAttr):
+                    self.defs[stmt.target].append(stmt)
+                elif isinstance(stmt, SetAttr):
+                    self.defs[(ATTR, stmt.attr)].append(stmt)
+                elif isinstance(stmt, (NewFunction, NewBuiltin)):
+                    self.defs[stmt.target].append(stmt)
+                elif isinstance(stmt, Call):
+                    has_call = True
+                    self.keep(stmt)
+                    for i, arg in enumerate(stmt.posargs):
+                        self.uses[(POS, i)].append(arg)
+                        self.uses[ALL_POS].append(arg)
+                    for kw, arg in stmt.kwargs.items():
+                        self.uses[(KW, kw)].append(arg)
+                        self.uses[ALL_KW].append(arg)
+                    self.uses[stmt.target].append(RETURN)
+                else:
+                    # NewModule, NewClass, NewStaticMethod, NewSuper and DelAttr
+                    self.keep(stmt)
+        if has_call:
+            # calling a class calls the __init__ along its MRO
+            self.addRelevant((ATTR, "__init__"))
+
+    def countParams(self, func: FunctionCodeBlock):
+        self.uses[RETURN].append(func.returnVariable)
+        for i, param in enumerate(func.posargs):
+            # the first parameter of a method is bound, so arguments are shifted by one
+            self.uses[param].append((POS, i))
+            if i > 0:
+                self.uses[param].append((POS, i - 1))
+        for kw, param in func.kwargs.items():
+            self.uses[param].append((KW, kw))
+        if func.vararg:
+            self.uses[func.vararg].append(ALL_POS)
+        if func.kwarg:
+            self.uses[func.kwarg].append(ALL_KW)
+
+    def keep(self, stmt: IRStmt):
+        self.kept.add(stmt)
+        if isinstance(stmt, Call):
+            self.addRelevant(stmt.callee)
+        elif isinstance(stmt, NewClass):
+            for base in stmt.bases:
+                self.addRelevant(base)
+        elif isinstance(stmt, NewStaticMethod):
+            self.addRelevant(stmt.func)
+        elif isinstance(stmt, NewSuper):
+            self.addRelevant(stmt.type)
+            self.addRelevant(stmt.bound)
+        elif isinstance(stmt, DelAttr):
+            self.addRelevant(stmt.var)
+        elif isinstance(stmt, Assign):
+            self.addRelevant(stmt.source)
+        elif isinstance(stmt, GetAttr):
+            self.addRelevant(stmt.source)
+            self.addRelevant((ATTR, stmt.attr))
+        elif isinstance(stmt, SetAttr):
+            self.addRelevant(stmt.target)
+            self.addRelevant(stmt.source)
+
+    def addRelevant(self, key: Key):
+        if key is not None and key not in self.relevant:
+            self.relevant.add(key)
+            self.workingList.append(key)
+
+    def process(self):
+        while self.workingList:
+            key = self.workingList.popleft()
+            for stmt in self.defs.get(key, ()):
+                if stmt not in self.kept:
+                    self.keep(stmt)
+            for use in self.uses.get(key, ()):
+                self.addRelevant(use)
+
+    def postprocess(self):
+        for code_block in self.codeBlocks:
+            stmts = [stmt for stmt in code_block.stmts if stmt in self.kept]
+            if len(stmts) < len(code_block.stmts):
+                code_block.stmts = stmts
@@ -0,0 +1,75 @@
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+PROGRESS_INTERVAL = 0.5
+
+
+# Progress line overwritten in place, printed at most once per interval.
+class Progress:
+
+    def __init__(self, interval: float = PROGRESS_INTERVAL, file=sys.stdout):
+        self.interval = interval
+        self.file = file
+        self.last = 0.0
+        self.width = 0
+
+    def update(self, message: str):
+        now = time.monotonic()
+        if now - self.last < self.interval:
+            return
+        self.last = now
+        print(f"{message:<{self.width}}\r", end="", file=self.file, flush=True)
+        self.width = len(message)
+
+    def clear(self):
+        if self.width:
+            print(" " * self.width + "\r", end="", file=self.file, flush=True)
+            self.width = 0
+
+
+# Wall and CPU time of each phase, optionally profiled with cProfile into PROFILE_DIR/<phase>.pstats.
+class PhaseTimer:
+    results: Dict[str, dict]
+
+    def __init__(self, profile_dir: str = None):
+        self.profileDir = profile_dir
+        self.results = {}
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    @contextmanager
+    def phase(self, name: str):
+        phase = {}
+        profiler = cProfile.Profile() if self.profileDir else None
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield phase
+        finally:
+            if profiler:
+                profiler.disable()
+            phase["wall_seconds"] = time.perf_counter() - wall
+            phase["cpu_seconds"] = time.process_time() - cpu
+            if profiler:
+                phase["profile"] = os.path.join(self.profileDir, f"{name}.pstats")
+                profiler.dump_stats(phase["profile"])
+            self.results[name] = phase
+
+    def run(self, name: str, func, *args):
+        with self.phase(name):
+            return func(*args)
+
+    def dump(self, path: str):
+        with open(path, "w") as fp:
+            json.dump(self.results, fp, indent=4)
+
+    def summary(self) -> str:
+        return "\n".join(f"{name:<10} wall {phase['wall_seconds']:>8.2f}s, cpu {phase['cpu_seconds']:>8.2f}s"
+                         for name, phase in self.results.items())
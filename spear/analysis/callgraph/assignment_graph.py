@@ -0,0 +1,370 @@
+from collections import defaultdict, deque
+from typing import Dict, Hashable, List, NamedTuple, Set, Tuple, Union
+
+from spear.analysis.alias.ir.class_code_block import ClassCodeBlock
+from spear.analysis.alias.ir.code_block import CodeBlock
+from spear.analysis.alias.ir.function_code_block import FunctionCodeBlock
+from spear.analysis.alias.ir.ir_stmts import Assign, Call, DelAttr, GetAttr, NewBuiltin, NewClass, NewFunction, \
+    NewModule, NewStaticMethod, NewSuper, SetAttr
+from spear.analysis.alias.ir.module_code_block import ModuleCodeBlock
+from spear.analysis.alias.timing import Progress
+
+
+class BoundMethod(NamedTuple):
+    cls: ClassCodeBlock
+    func: FunctionCodeBlock
+
+
+class StaticMethod(NamedTuple):
+    func: FunctionCodeBlock
+
+
+class Super(NamedTuple):
+    type: ClassCodeBlock
+    bound: ClassCodeBlock
+
+
+# Values are definitions: code blocks of modules, classes and functions, names of external modules and their
+# attributes, and the three wrappers above. Builtin objects, mostly containers, are their NewBuiltin statements.
+# Like the PTA, a class also stands for its instances.
+Value = Union[CodeBlock, str, BoundMethod, StaticMethod, Super, NewBuiltin]
+# a variable, or a (value, attr) field
+Node = Hashable
+
+
+# A cheaper call graph engine in the style of PyCG, running on the same IR as the PTA.
+# Assignments, arguments and attributes form a flow-insensitive assignment graph over which only definitions are
+# propagated. Compared with the PTA, values and nodes are plain IR objects and tuples instead of pooled objects and
+# pointers, and an attribute of a class is looked up in all its ancestors up to the first ones that bind it in
+# their bodies, instead of along each MRO, so no class hierarchy is computed. An attribute deleted anywhere
+# doesn't stop a lookup, and super() looks in every ancestor of the bound class that may come after its type.
+# The call graph has the same format as Analysis.callgraph.
+class AssignmentGraph:
+    values: Dict[Node, Set[Value]]
+    flows: Dict[Node, Set[Tuple[Node, ClassCodeBlock]]]  # source -> (target, class that functions are bound to)
+    getAttrs: Dict[Node, List[GetAttr]]
+    setAttrs: Dict[Node, List[SetAttr]]
+    calls: Dict[Node, List[Tuple[Call, Node]]]  # callee -> (call, where the result goes)
+    users: Dict[Node, List[Tuple[str, object]]]  # other statements reading a node
+    bases: Dict[ClassCodeBlock, Set[ClassCodeBlock]]
+    subclasses: Dict[ClassCodeBlock, Set[ClassCodeBlock]]
+    lookups: Dict[ClassCodeBlock, Set[Tuple[str, Node, ClassCodeBlock]]]  # attribute lookups on a class
+    superLookups: Dict[ClassCodeBlock, Set[Tuple[str, Node, ClassCodeBlock]]]  # bound -> (attr, target, type)
+    deletable: Set[str]  # attributes of any DelAttr
+    fakes: Dict[str, Tuple[str, GetAttr]]  # external name -> (prefix, the GetAttr appending the last attr)
+    reachable: Set[CodeBlock]
+    callgraph: Dict[str, Set[str]]
+
+    def __init__(self, verbose=False):
+        self.values = defaultdict(set)
+        self.flows = defaultdict(set)
+        self.getAttrs = defaultdict(list)
+        self.setAttrs = defaultdict(list)
+        self.calls = defaultdict(list)
+        self.users = defaultdict(list)
+        self.bases = defaultdict(set)
+        self.subclasses = defaultdict(set)
+        self.lookups = defaultdict(set)
+        self.superLookups = defaultdict(set)
+        self.deletable = set()
+        self.fakes = {}
+        self.reachable = set()
+        self.callgraph = defaultdict(set)
+        self.pending = {}
+        self.workList = deque()
+        self.verbose = verbose
+        self.progress = Progress() if verbose else None
+
+    def analyze(self, entrys: List[CodeBlock]):
+        for entry in entrys:
+            if isinstance(entry, ModuleCodeBlock):
+                self.addValues(entry.globalVariable, {entry})
+            self.addReachable(entry)
+
+        while self.workList:
+            if self.progress:
+                self.progress.update(f"Assignment graph worklist remains {len(self.workList)} to process.")
+            node = self.workList.popleft()
+            values = self.pending.pop(node)
+
+            for target, bound in self.flows.get(node, ()):
+                self.addValues(target, self.bind(bound, values) if bound else values)
+            for stmt in self.getAttrs.get(node, ()):
+                for value in values:
+                    self.processGetAttr(stmt, value)
+            for stmt in self.setAttrs.get(node, ()):
+                for value in values:
+                    self.addFlow(stmt.source, (value, stmt.attr))
+            for stmt, target in self.calls.get(node, ()):
+                for value in values:
+                    self.processCall(stmt, target, value)
+            for kind, stmt in self.users.get(node, ()):
+                self.processUser(kind, stmt, values)
+
+        if self.progress:
+            self.progress.clear()
+
+    def addValues(self, node: Node, values: Set[Value]):
+        new_values = values - self.values[node]
+        if not new_values:
+            return
+        self.values[node] |= new_values
+        if node in self.pending:
+            self.pending[node] |= new_values
+        else:
+            self.pending[node] = new_values
+            self.workList.append(node)
+
+    def addFlow(self, source: Node, target: Node, bound: ClassCodeBlock = None):
+        flows = self.flows[source]
+        if (target, bound) in flows:
+            return
+        flows.add((target, bound))
+        values = self.values.get(source)
+        if values:
+            self.addValues(target, self.bind(bound, values) if bound else values)
+
+    @staticmethod
+    def bind(cls: ClassCodeBlock, values: Set[Value]) -> Set[Value]:
+        return {BoundMethod(cls, value) if isinstance(value, FunctionCodeBlock) else value for value in values}
+
+    def addReachable(self, code_block: CodeBlock):
+        if code_block in self.reachable:
+            return
+        self.reachable.add(code_block)
+
+        for stmt in code_block.stmts:
+            if isinstance(stmt, Assign):
+                self.addFlow(stmt.source, stmt.target)
+
+            elif isinstance(stmt, GetAttr):
+                self.getAttrs[stmt.source].append(stmt)
+                for value in list(self.values.get(stmt.source, ())):
+                    self.processGetAttr(stmt, value)
+
+            elif isinstance(stmt, SetAttr):
+                self.setAttrs[stmt.target].append(stmt)
+                for value in list(self.values.get(stmt.target, ())):
+                    self.addFlow(stmt.source, (value, stmt.attr))
+
+            elif isinstance(stmt, Call):
+                self.addCallSite(stmt, stmt.callee, stmt.target)
+
+            elif isinstance(stmt, NewModule):
+                if isinstance(stmt.module, ModuleCodeBlock):
+                    self.addValues(stmt.target, {stmt.module})
+                    self.addValues(stmt.module.globalVariable, {stmt.module})
+                    self.addReachable(stmt.module)
+                else:
+                    self.addValues(stmt.target, {stmt.module})
+
+            elif isinstance(stmt, NewFunction):
+                self.addValues(stmt.target, {stmt.codeBlock})
+
+            elif isinstance(stmt, NewClass):
+                cls = stmt.codeBlock
+                self.addValues(stmt.target, {cls})
+                self.addValues(cls.thisClassVariable, {cls})
+                for base in stmt.bases:
+                    self.addUser(base, "base", stmt)
+                self.addReachable(cls)
+                self.addCallEdge(stmt, cls.readable_name)
+
+            elif isinstance(stmt, NewBuiltin):
+                self.addValues(stmt.target, {stmt})
+
+            elif isinstance(stmt, NewStaticMethod):
+                if isinstance(stmt.belongsTo, ClassCodeBlock):
+                    self.addUser(stmt.func, "staticmethod", stmt)
+
+            elif isinstance(stmt, NewSuper):
+                self.addUser(stmt.type, "super", stmt)
+                self.addUser(stmt.bound, "super", stmt)
+
+            elif isinstance(stmt, DelAttr):
+                self.addDeletable(stmt.attr)
+
+    def addUser(self, node: Node, kind: str, stmt):
+        self.users[node].append((kind, stmt))
+        values = self.values.get(node)
+        if values:
+            self.processUser(kind, stmt, set(values))
+
+    def processUser(self, kind: str, stmt, values: Set[Value]):
+        if kind == "base":
+            for value in values:
+                if isinstance(value, ClassCodeBlock):
+                    self.addBase(stmt.codeBlock, value)
+        elif kind == "staticmethod":
+            self.addValues(stmt.target, {StaticMethod(value) for value in values
+                                         if isinstance(value, FunctionCodeBlock)})
+        elif kind == "super":
+            types = self.values.get(stmt.type, ())
+            bounds = self.values.get(stmt.bound, ())
+            self.addValues(stmt.target, {Super(type, bound) for type in types for bound in bounds
+                                         if isinstance(type, ClassCodeBlock) and isinstance(bound, ClassCodeBlock)})
+
+    def addCallSite(self, stmt: Call, callee: Node, target: Node):
+        self.calls[callee].append((stmt, target))
+        for value in list(self.values.get(callee, ())):
+            self.processCall(stmt, target, value)
+
+    def processGetAttr(self, stmt: GetAttr, value: Value):
+        attr = stmt.attr
+        if isinstance(value, ClassCodeBlock):
+            self.lookup(value, attr, stmt.target, value)
+        elif isinstance(value, Super):
+            self.superLookup(value.type, value.bound, attr, stmt.target)
+        else:
+            if isinstance(value, str):
+                self.addValues(stmt.target, {self.fakeAttr(value, stmt)})
+            self.addFlow((value, attr), stmt.target)
+
+    # external names grow along a GetAttr in a loop only once, like FakeObject.cut
+    def fakeAttr(self, prefix: str, stmt: GetAttr) -> str:
+        fake = prefix
+        while fake in self.fakes:
+            fake_prefix, fake_stmt = self.fakes[fake]
+            if fake_stmt is stmt:
+                prefix = fake_prefix
+                break
+            fake = fake_prefix
+        name = f"{prefix}.{stmt.attr}"
+        if name not in self.fakes:
+            self.fakes[name] = (prefix, stmt)
+        return name
+
+    # target <- attr of cls, or of its ancestors up to the ones binding attr
+    def lookup(self, cls: ClassCodeBlock, attr: str, target: Node, bound: ClassCodeBlock):
+        self.lookups[cls].add((attr, target, bound))
+        for definer in self.definers(cls, attr):
+            self.addFlow((definer, attr), target, bound)
+
+    def definers(self, cls: ClassCodeBlock, attr: str) -> List[ClassCodeBlock]:
+        res = []
+        visited = {cls}
+        stack = [cls]
+        while stack:
+            cls = stack.pop()
+            res.append(cls)
+            if attr in cls.attributes and attr not in self.deletable:
+                continue
+            for base in self.bases.get(cls, ()):
+                if base not in visited:
+                    visited.add(base)
+                    stack.append(base)
+        return res
+
+    # target <- attr of the ancestors of bound after type. Without MROs, these are the ancestors which are neither
+    # type nor its subclasses. Only a definer that is an ancestor of type surely comes after type, and ends the walk.
+    def superLookup(self, type: ClassCodeBlock, bound: ClassCodeBlock, attr: str, target: Node):
+        self.superLookups[bound].add((attr, target, type))
+        bound_ancestors = self.closure(bound, self.bases)
+        if type not in bound_ancestors:
+            return
+        type_ancestors = self.closure(type, self.bases)
+        below = self.closure(type, self.subclasses) & bound_ancestors
+        stack = [base for cls in below for base in self.bases.get(cls, ()) if base not in below]
+        visited = below | set(stack)
+        while stack:
+            cls = stack.pop()
+            self.addFlow((cls, attr), target, bound)
+            if attr in cls.attributes and attr not in self.deletable and cls in type_ancestors:
+                continue
+            for base in self.bases.get(cls, ()):
+                if base not in visited:
+                    visited.add(base)
+                    stack.append(base)
+
+    # cls and every class reachable from it along edges
+    @staticmethod
+    def closure(cls: ClassCodeBlock, edges: Dict[ClassCodeBlock, Set[ClassCodeBlock]]) -> Set[ClassCodeBlock]:
+        res = {cls}
+        stack = [cls]
+        while stack:
+            for other in edges.get(stack.pop(), ()):
+                if other not in res:
+                    res.add(other)
+                    stack.append(other)
+        return res
+
+    # lookups of attr don't stop at the classes binding it anymore
+    def addDeletable(self, attr: str):
+        if attr in self.deletable:
+            return
+        self.deletable.add(attr)
+        for cls, lookups in list(self.lookups.items()):
+            for lookup_attr, target, bound in list(lookups):
+                if lookup_attr == attr:
+                    self.lookup(cls, attr, target, bound)
+        for bound, lookups in list(self.superLookups.items()):
+            for lookup_attr, target, type in list(lookups):
+                if lookup_attr == attr:
+                    self.superLookup(type, bound, attr, target)
+
+    def addBase(self, cls: ClassCodeBlock, base: ClassCodeBlock):
+        if base in self.bases[cls]:
+            return
+        self.bases[cls].add(base)
+        self.subclasses[base].add(cls)
+
+        # lookups on cls and its subclasses may reach further now
+        visited = {cls}
+        stack = [cls]
+        while stack:
+            sub = stack.pop()
+            for attr, target, bound in list(self.lookups.get(sub, ())):
+                self.lookup(sub, attr, target, bound)
+            for attr, target, type in list(self.superLookups.get(sub, ())):
+                self.superLookup(type, sub, attr, target)
+            for subclass in self.subclasses.get(sub, ()):
+                if subclass not in visited:
+                    visited.add(subclass)
+                    stack.append(subclass)
+
+    def processCall(self, stmt: Call, target: Node, value: Value):
+        if isinstance(value, FunctionCodeBlock):
+            self.callFunction(stmt, target, value, None)
+        elif isinstance(value, BoundMethod):
+            self.callFunction(stmt, target, value.func, value.cls)
+        elif isinstance(value, StaticMethod):
+            self.callFunction(stmt, target, value.func, None)
+        elif isinstance(value, ClassCodeBlock):
+            if target is not None:
+                self.addValues(target, {value})
+            # calling a class calls its __init__, the result of which is discarded
+            init = (stmt, "$init")
+            self.lookup(value, "__init__", init, value)
+            if init not in self.calls:
+                self.addCallSite(stmt, init, None)
+        elif isinstance(value, str):
+            self.addCallEdge(stmt, value)
+
+    def callFunction(self, stmt: Call, target: Node, func: FunctionCodeBlock, bound: ClassCodeBlock):
+        pos_params = func.posargs
+        if bound:
+            if not pos_params:
+                # not a method, just skip
+                return
+            self.addValues(pos_params[0], {bound})
+            pos_params = pos_params[1:]
+
+        pos_count = len(pos_params)
+        for i, arg in enumerate(stmt.posargs):
+            if i < pos_count:
+                self.addFlow(arg, pos_params[i])
+            elif func.vararg:
+                self.addFlow(arg, func.vararg)
+        for kw, arg in stmt.kwargs.items():
+            if kw in func.kwargs:
+                self.addFlow(arg, func.kwargs[kw])
+            elif func.kwarg:
+                self.addFlow(arg, func.kwarg)
+
+        if target is not None:
+            self.addFlow(func.returnVariable, target)
+        self.addReachable(func)
+        self.addCallEdge(stmt, func.readable_name)
+
+    def addCallEdge(self, callsite, callee: str):
+        self.callgraph[callsite.belongsTo.readable_name].add(callee)
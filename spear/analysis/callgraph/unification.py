@@ -0,0 +1,475 @@
+import gc
+from collections import defaultdict, deque
+from typing import Dict, List, Set, Tuple, Union
+
+from spear.analysis.alias.ir.class_code_block import ClassCodeBlock
+from spear.analysis.alias.ir.code_block import CodeBlock
+from spear.analysis.alias.ir.function_code_block import FunctionCodeBlock
+from spear.analysis.alias.ir.ir_stmts import Assign, Call, GetAttr, NewBuiltin, NewClass, NewFunction, NewModule, \
+    NewStaticMethod, NewSuper, SetAttr, Variable
+from spear.analysis.alias.ir.module_code_block import ModuleCodeBlock
+from spear.analysis.alias.timing import Progress
+
+# code blocks of modules, classes and functions, names of external modules and their attributes, and NewBuiltin
+Value = Union[CodeBlock, str, NewBuiltin]
+
+
+# Parameters shared by everything called through an equivalence class, positions are those seen by callers.
+# Variadic parameters are unified with every position or keyword, and so are the parameters of __init__ if classes
+# are called.
+class Signature:
+    __slots__ = ("pos", "kw", "ret", "varParam", "kwParam", "init")
+
+    pos: List['ECR']
+    kw: Dict[str, 'ECR']
+    ret: 'ECR'
+    varParam: 'ECR'
+    kwParam: 'ECR'
+    init: 'ECR'
+
+    def __init__(self):
+        self.pos = []
+        self.kw = {}
+        self.ret = ECR()
+        self.varParam = None
+        self.kwParam = None
+        self.init = None
+
+
+# An equivalence class of variables and attributes, i.e. a node of the union-find.
+# Only the root keeps values, fields, the signature if it is called, and statements waiting for its values.
+class ECR:
+    __slots__ = ("parent", "rank", "values", "names", "fields", "sig", "getAttrs", "staticMethods")
+
+    parent: 'ECR'
+    rank: int
+    values: Set[Value]
+    names: Set[str]  # external names among values
+    fields: Dict[str, 'ECR']
+    sig: Signature
+    getAttrs: List[GetAttr]  # reading an attribute of this class, which makes new names of external values
+    staticMethods: List[NewStaticMethod]
+
+    def __init__(self):
+        self.parent = self
+        self.rank = 0
+        self.values = set()
+        self.names = set()
+        self.fields = {}
+        self.sig = None
+        self.getAttrs = []
+        self.staticMethods = []
+
+
+# A unification-based (Steensgaard style) call graph engine running on the same IR as the PTA.
+# Every assignment unifies both sides, x = y.attr unifies x with the attr field of y's class, and all variables
+# and fields holding the same value are unified too, so each value has a single class and fields are shared
+# by everything in it. A class is unified with its bases and super() with its type, thus a whole hierarchy shares
+# its attributes. Calls unify arguments with the signature of the callee's class, and so do the parameters of
+# every function in it, instead of matching each call with each function. Each statement is visited once and
+# the rest is union-find, which is near-linear.
+# The call graph has the same format as Analysis.callgraph, and is a superset of the PTA's modulo deletions.
+class Unification:
+    ecrs: Dict[int, ECR]  # uid of a variable -> its ECR, ints hash faster than variables
+    variables: Dict[int, Variable]
+    homes: Dict[Value, ECR]  # value -> an ECR holding it
+    staticFuncs: Set[FunctionCodeBlock]
+    callSites: List[Call]
+    fakes: Dict[str, Tuple[str, GetAttr]]  # external name -> (prefix, the GetAttr appending the last attr)
+    reachable: Set[CodeBlock]
+    callgraph: Dict[str, Set[str]]
+
+    def __init__(self, verbose=False):
+        self.ecrs = {}
+        self.variables = {}
+        self.homes = {}
+        self.staticFuncs = set()
+        self.callSites = []
+        self.fakes = {}
+        self.reachable = set()
+        self.callgraph = defaultdict(set)
+        self.unions = deque()
+        self.unifying = False
+        self.codeBlocks = deque()
+        self.verbose = verbose
+        self.progress = Progress() if verbose else None
+
+    def analyze(self, entrys: List[CodeBlock]):
+        # nothing allocated here becomes garbage before the end, so collections would only rescan the IR
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for entry in entrys:
+                if isinstance(entry, ModuleCodeBlock):
+                    self.addValue(self.ecr(entry.globalVariable), entry)
+                self.addReachable(entry)
+
+            while self.codeBlocks:
+                if self.progress:
+                    self.progress.update(f"Unification remains {len(self.codeBlocks)} code blocks to process.")
+                self.processCodeBlock(self.codeBlocks.popleft())
+
+            self.buildCallGraph()
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if self.progress:
+            self.progress.clear()
+
+    def ecr(self, var: Variable) -> ECR:
+        ecr = self.ecrs.get(var.uid)
+        if ecr is None:
+            ecr = self.ecrs[var.uid] = ECR()
+            self.variables[var.uid] = var
+            return ecr
+        return self.find(ecr)
+
+    # unify var with ecr, most variables are seen first as targets so they simply join ecr
+    def bind(self, var: Variable, ecr: ECR):
+        old = self.ecrs.get(var.uid)
+        if old is None:
+            self.ecrs[var.uid] = ecr
+            self.variables[var.uid] = var
+        else:
+            self.unify(old, ecr)
+
+    @staticmethod
+    def find(ecr: ECR) -> ECR:
+        root = ecr
+        while root.parent is not root:
+            root = root.parent
+        while ecr.parent is not root:
+            ecr.parent, ecr = root, ecr.parent
+        return root
+
+    def field(self, ecr: ECR, attr: str) -> ECR:
+        ecr = self.find(ecr)
+        field = ecr.fields.get(attr)
+        if field is None:
+            field = ecr.fields[attr] = ECR()
+        return self.find(field)
+
+    def unify(self, a: ECR, b: ECR):
+        if self.unifying:
+            # called while unifying, it will be done by the loop below
+            self.unions.append((a, b))
+            return
+        self.unifying = True
+        try:
+            self.union(a, b)
+            while self.unions:
+                self.union(*self.unions.popleft())
+        finally:
+            self.unifying = False
+
+    def union(self, a: ECR, b: ECR):
+        a = self.find(a)
+        b = self.find(b)
+        if a is b:
+            return
+        if a.rank < b.rank:
+            a, b = b, a
+        b.parent = a
+        if a.rank == b.rank:
+            a.rank += 1
+        if not (b.values or b.fields or b.sig or b.getAttrs or b.staticMethods):
+            b.values = b.names = b.fields = b.sig = b.getAttrs = b.staticMethods = None
+            return
+        if not (a.values or a.fields or a.sig or a.getAttrs or a.staticMethods):
+            a.values, a.names, a.fields, a.sig = b.values, b.names, b.fields, b.sig
+            a.getAttrs, a.staticMethods = b.getAttrs, b.staticMethods
+            b.values = b.names = b.fields = b.sig = b.getAttrs = b.staticMethods = None
+            return
+
+        # statements waiting on each side only need the values from the other side, and each value is attached to
+        # a signature once, so only compute what is needed
+        a_called, b_called = a.sig is not None, b.sig is not None
+        a_attach, b_attach = a_called and not b_called, b_called and not a_called
+        a_get_attrs, a_static_methods = a.getAttrs, a.staticMethods
+        b_get_attrs, b_static_methods = b.getAttrs, b.staticMethods
+        names_for_a = b.names - a.names if a_get_attrs else ()
+        names_for_b = a.names - b.names if b_get_attrs else ()
+        values_for_a = b.values - a.values if a_attach or a_static_methods else ()
+        values_for_b = a.values - b.values if b_attach or b_static_methods else ()
+
+        if len(a.values) < len(b.values):
+            a.values, b.values = b.values, a.values
+        a.values |= b.values
+        a.names |= b.names
+        a.getAttrs = a_get_attrs + b_get_attrs
+        a.staticMethods = a_static_methods + b_static_methods
+        for attr, field in b.fields.items():
+            if attr in a.fields:
+                self.unions.append((a.fields[attr], field))
+            else:
+                a.fields[attr] = field
+        if b_called:
+            if a_called:
+                self.mergeSignature(a.sig, b.sig)
+            else:
+                a.sig = b.sig
+        b.values = b.names = b.fields = b.sig = b.getAttrs = b.staticMethods = None
+
+        self.trigger(a, a_get_attrs, names_for_a, a_static_methods, a_attach, values_for_a)
+        self.trigger(a, b_get_attrs, names_for_b, b_static_methods, b_attach, values_for_b)
+
+    def mergeSignature(self, sig: Signature, other: Signature):
+        for i, pos in enumerate(other.pos):
+            if i < len(sig.pos):
+                self.unions.append((sig.pos[i], pos))
+            else:
+                sig.pos.append(pos)
+                self.linkPosition(sig, i)
+        for kw, ecr in other.kw.items():
+            if kw in sig.kw:
+                self.unions.append((sig.kw[kw], ecr))
+            else:
+                sig.kw[kw] = ecr
+                self.linkKeyword(sig, kw)
+        self.unions.append((sig.ret, other.ret))
+        if other.varParam:
+            self.unifyVarParam(sig, other.varParam)
+        if other.kwParam:
+            self.unifyKwParam(sig, other.kwParam)
+        if other.init:
+            self.unifyInit(sig, other.init)
+
+    def unifyVarParam(self, sig: Signature, var_param: ECR):
+        if sig.varParam is None:
+            sig.varParam = var_param
+            for pos in sig.pos:
+                self.unify(pos, var_param)
+        else:
+            self.unify(sig.varParam, var_param)
+
+    def unifyKwParam(self, sig: Signature, kw_param: ECR):
+        if sig.kwParam is None:
+            sig.kwParam = kw_param
+            for ecr in sig.kw.values():
+                self.unify(ecr, kw_param)
+        else:
+            self.unify(sig.kwParam, kw_param)
+
+    def unifyInit(self, sig: Signature, init: ECR):
+        if sig.init is None:
+            sig.init = init
+            # __init__ is called even without arguments
+            self.signature(init)
+            for i in range(len(sig.pos)):
+                self.linkPosition(sig, i)
+            for kw in list(sig.kw):
+                self.linkKeyword(sig, kw)
+        else:
+            self.unify(sig.init, init)
+
+    # a new position or keyword also goes to the variadic parameters and __init__
+    def linkPosition(self, sig: Signature, i: int):
+        if sig.varParam:
+            self.unify(sig.pos[i], sig.varParam)
+        if sig.init:
+            self.unify(sig.pos[i], self.position(sig.init, i))
+
+    def linkKeyword(self, sig: Signature, kw: str):
+        if sig.kwParam:
+            self.unify(sig.kw[kw], sig.kwParam)
+        if sig.init:
+            self.unify(sig.kw[kw], self.keyword(sig.init, kw))
+
+    # linking may unify ecr with another class whose signature takes over, so it is looked up again
+    def position(self, ecr: ECR, i: int) -> ECR:
+        sig = self.signature(ecr)
+        while len(sig.pos) <= i:
+            sig.pos.append(ECR())
+            self.linkPosition(sig, len(sig.pos) - 1)
+            sig = self.signature(ecr)
+        return sig.pos[i]
+
+    def keyword(self, ecr: ECR, kw: str) -> ECR:
+        sig = self.signature(ecr)
+        if kw not in sig.kw:
+            sig.kw[kw] = ECR()
+            self.linkKeyword(sig, kw)
+            sig = self.signature(ecr)
+        return sig.kw[kw]
+
+    def signature(self, ecr: ECR) -> Signature:
+        root = self.find(ecr)
+        if root.sig is None:
+            root.sig = Signature()
+            for value in list(root.values):
+                self.attach(root, value)
+        return self.find(ecr).sig
+
+    def addValue(self, ecr: ECR, value: Value):
+        ecr = self.find(ecr)
+        if value in ecr.values:
+            return
+        home = self.homes.get(value)
+        if home is not None:
+            self.unify(ecr, home)
+            return
+        self.homes[value] = ecr
+        ecr.values.add(value)
+        names = ()
+        if isinstance(value, str):
+            ecr.names.add(value)
+            names = (value,)
+        self.trigger(ecr, ecr.getAttrs, names, ecr.staticMethods, ecr.sig is not None, (value,))
+
+    def trigger(self, ecr: ECR, get_attrs: List[GetAttr], names, static_methods: List[NewStaticMethod],
+                attach: bool, values):
+        for name in names:
+            for stmt in get_attrs:
+                self.addValue(self.ecr(stmt.target), self.fakeAttr(name, stmt))
+        if static_methods:
+            for value in values:
+                if isinstance(value, FunctionCodeBlock):
+                    self.staticFuncs.add(value)
+        if attach:
+            for value in values:
+                self.attach(ecr, value)
+
+    # value is called through ecr
+    def attach(self, ecr: ECR, value: Value):
+        if isinstance(value, FunctionCodeBlock):
+            pos_params = value.posargs
+            if isinstance(value.enclosing, ClassCodeBlock) and value not in self.staticFuncs:
+                pos_params = pos_params[1:]
+            for i, param in enumerate(pos_params):
+                self.bind(param, self.position(ecr, i))
+            for kw, param in value.kwargs.items():
+                self.bind(param, self.keyword(ecr, kw))
+            if value.vararg:
+                self.unifyVarParam(self.signature(ecr), self.ecr(value.vararg))
+            if value.kwarg:
+                self.unifyKwParam(self.signature(ecr), self.ecr(value.kwarg))
+            self.bind(value.returnVariable, self.signature(ecr).ret)
+            self.addReachable(value)
+
+        elif isinstance(value, ClassCodeBlock):
+            # calling a class makes an instance, for which the class stands, and calls its __init__
+            self.unify(self.signature(ecr).ret, ecr)
+            self.unifyInit(self.signature(ecr), self.field(ecr, "__init__"))
+
+    def addReachable(self, code_block: CodeBlock):
+        if code_block not in self.reachable:
+            self.reachable.add(code_block)
+            self.codeBlocks.append(code_block)
+
+    def processCodeBlock(self, code_block: CodeBlock):
+        for stmt in code_block.stmts:
+            if isinstance(stmt, Assign):
+                self.bind(stmt.target, self.ecr(stmt.source))
+
+            elif isinstance(stmt, GetAttr):
+                source = self.ecr(stmt.source)
+                self.bind(stmt.target, self.field(source, stmt.attr))
+                source = self.find(source)
+                source.getAttrs.append(stmt)
+                self.trigger(source, (stmt,), list(source.names), (), False, ())
+
+            elif isinstance(stmt, SetAttr):
+                self.unify(self.field(self.ecr(stmt.target), stmt.attr), self.ecr(stmt.source))
+
+            elif isinstance(stmt, Call):
+                self.processCall(stmt)
+
+            elif isinstance(stmt, NewModule):
+                self.addValue(self.ecr(stmt.target), stmt.module)
+                if isinstance(stmt.module, ModuleCodeBlock):
+                    self.addValue(self.ecr(stmt.module.globalVariable), stmt.module)
+                    self.addReachable(stmt.module)
+
+            elif isinstance(stmt, NewFunction):
+                func = stmt.codeBlock
+                self.addValue(self.ecr(stmt.target), func)
+                if isinstance(code_block, ClassCodeBlock) and func.posargs:
+                    # methods are always bound to their class, which also stands for its instances
+                    self.unify(self.ecr(func.posargs[0]), self.ecr(code_block.thisClassVariable))
+
+            elif isinstance(stmt, NewClass):
+                cls = stmt.codeBlock
+                self.addValue(self.ecr(stmt.target), cls)
+                self.addValue(self.ecr(cls.thisClassVariable), cls)
+                for base in stmt.bases:
+                    self.unify(self.ecr(stmt.target), self.ecr(base))
+                self.addReachable(cls)
+                self.addCallEdge(stmt, cls.readable_name)
+
+            elif isinstance(stmt, NewBuiltin):
+                self.addValue(self.ecr(stmt.target), stmt)
+
+            elif isinstance(stmt, NewStaticMethod):
+                self.unify(self.ecr(stmt.target), self.ecr(stmt.func))
+                if isinstance(code_block, ClassCodeBlock):
+                    func = self.ecr(stmt.func)
+                    func.staticMethods.append(stmt)
+                    self.trigger(func, (), (), (stmt,), False, list(func.values))
+
+            elif isinstance(stmt, NewSuper):
+                if stmt.type:
+                    self.unify(self.ecr(stmt.target), self.ecr(stmt.type))
+
+    def processCall(self, stmt: Call):
+        callee = self.ecr(stmt.callee)
+        for i, arg in enumerate(stmt.posargs):
+            self.bind(arg, self.position(callee, i))
+        for kw, arg in stmt.kwargs.items():
+            self.bind(arg, self.keyword(callee, kw))
+        self.bind(stmt.target, self.signature(callee).ret)
+        self.callSites.append(stmt)
+
+    # external names grow along a GetAttr in a loop only once, like FakeObject.cut
+    def fakeAttr(self, prefix: str, stmt: GetAttr) -> str:
+        fake = prefix
+        while fake in self.fakes:
+            fake_prefix, fake_stmt = self.fakes[fake]
+            if fake_stmt is stmt:
+                prefix = fake_prefix
+                break
+            fake = fake_prefix
+        name = f"{prefix}.{stmt.attr}"
+        if name not in self.fakes:
+            self.fakes[name] = (prefix, stmt)
+        return name
+
+    def buildCallGraph(self):
+        callees = defaultdict(set)
+        for stmt in self.callSites:
+            callees[stmt.belongsTo.readable_name].add(self.ecr(stmt.callee))
+
+        # many callers share an equivalence class, so its callees are collected once
+        names = {}
+        for caller, ecrs in callees.items():
+            edges = self.callgraph[caller]
+            for ecr in ecrs:
+                if ecr not in names:
+                    names[ecr] = self.callees(ecr)
+                edges |= names[ecr]
+
+    def callees(self, ecr: ECR) -> Set[str]:
+        res = set()
+        for value in ecr.values:
+            if isinstance(value, FunctionCodeBlock):
+                res.add(value.readable_name)
+            elif isinstance(value, str):
+                res.add(value)
+            elif isinstance(value, ClassCodeBlock):
+                init = self.find(ecr.fields["__init__"])
+                res.update(func.readable_name for func in init.values if isinstance(func, FunctionCodeBlock))
+        return res
+
+    def addCallEdge(self, callsite, callee: str):
+        self.callgraph[callsite.belongsTo.readable_name].add(callee)
+
+    # variable id -> index of its equivalence class, every class is a set of variables which may point to the same
+    # values, useful as a coarse partition of pointers for the PTA
+    def partition(self) -> Dict[str, int]:
+        indexes = {}
+        res = {}
+        for uid, var in self.variables.items():
+            root = self.find(self.ecrs[uid])
+            if root not in indexes:
+                indexes[root] = len(indexes)
+            res[var.id] = indexes[root]
+        return res
@@ -0,0 +1,172 @@
+"""
+Macro benchmark on a corpus of real projects, compared against stored baselines.
+
+Projects are listed in corpus.json, each one comes from one of these sources:
+    stdlib:         packages of the standard library, pinned by the "python" version of the manifest
+    site-packages:  installed distributions, pinned by their "version"
+    vendored:       directories under --corpus-dir, "path" is relative to it
+A project is skipped when its source is missing or doesn't match the pin.
+
+Each project is analyzed in a fresh process with only its own packages under PATH, so that imports outside
+the project are not loaded. Wall time, propagations and peak RSS are compared with the baseline of the running
+Python, and the exit status is 1 if any of them regresses more than the threshold.
+
+Usage:
+    python -m spear.benchmark.bench [PROJECT ...] [--threshold 0.25] [--update-baseline] [-o results.json]
+"""
+
+import argparse
+import importlib.metadata
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import sysconfig
+import tempfile
+
+from spear.benchmark.suite import Phases, lower, peakRSS, solve
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST = os.path.join(BENCHMARK_DIR, "corpus.json")
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, "corpus")
+
+# metric -> absolute slack, so that tiny projects don't fail on noise
+METRICS = {
+    "wall_seconds": 0.1,
+    "propagations": 0,
+    "peak_rss_bytes": 8 * 2 ** 20,
+}
+
+
+def pythonVersion() -> str:
+    return f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def baselinePath() -> str:
+    return os.path.join(BASELINE_DIR, f"{platform.python_implementation().lower()}-{pythonVersion()}.json")
+
+
+# return the directory holding the project's packages, or the reason it is skipped
+def locate(project: dict, manifest: dict, corpus_dir: str):
+    source = project["source"]
+    if source == "stdlib":
+        if manifest["python"] != pythonVersion():
+            return None, f"manifest pins Python {manifest['python']}"
+        return sysconfig.get_paths()["stdlib"], None
+    elif source == "site-packages":
+        try:
+            version = importlib.metadata.version(project["name"])
+        except importlib.metadata.PackageNotFoundError:
+            return None, "not installed"
+        if version != project["version"]:
+            return None, f"version {version} is installed, {project['version']} is pinned"
+        return sysconfig.get_paths()["purelib"], None
+    elif source == "vendored":
+        path = os.path.join(corpus_dir, project["path"])
+        if not os.path.isdir(path):
+            return None, f"{path} doesn't exist"
+        return path, None
+    return None, f"unknown source {source}"
+
+
+def prepare(project: dict, root: str, tmp: str):
+    for package in project["packages"]:
+        for name in (package, package + ".py"):
+            if os.path.exists(os.path.join(root, name)):
+                os.symlink(os.path.join(root, name), os.path.join(tmp, name))
+                break
+        else:
+            raise FileNotFoundError(f"{package} is not found in {root}")
+    with open(os.path.join(tmp, "main.py"), "w") as f:
+        f.write("".join(f"import {module}\n" for module in project["imports"]))
+
+
+def benchmark(project: dict, root: str) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        prepare(project, root, tmp)
+        phases = Phases(trace_memory=False)
+        module_manager = phases.run("lower", lower, tmp)
+        analysis = phases.run("solve", solve, module_manager)
+
+    return {
+        "modules": len(module_manager.modules),
+        "statements": sum(len(cb.stmts) for cb in module_manager.allCodeBlocks(nested=True)),
+        "callgraph_edges": sum(len(callees) for callees in analysis.callgraph.values()),
+        "propagations": analysis.propagations,
+        "wall_seconds": sum(phase["wall_seconds"] for phase in phases.results.values()),
+        "phases": phases.results,
+        "peak_rss_bytes": peakRSS(),
+    }
+
+
+def compare(name: str, result: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for metric, slack in METRICS.items():
+        if metric not in baseline:
+            continue
+        limit = baseline[metric] * (1 + threshold) + slack
+        if result[metric] > limit:
+            regressions.append(f"{name}: {metric} {result[metric]:.6g} > {baseline[metric]:.6g} "
+                               f"(+{(result[metric] / baseline[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("projects", nargs="*", help="Names of projects to run, all by default.")
+    argparser.add_argument("--manifest", default=MANIFEST)
+    argparser.add_argument("--corpus-dir", default=CORPUS_DIR, help="Where vendored projects are placed.")
+    argparser.add_argument("--baseline", default=baselinePath())
+    argparser.add_argument("--threshold", type=float, default=0.25,
+                           help="Relative increase of a metric that counts as a regression.")
+    argparser.add_argument("--update-baseline", action="store_true", default=False,
+                           help="Store the results as the new baseline instead of comparing.")
+    argparser.add_argument("-o", "--output", help="Write the results as JSON.")
+    args = argparser.parse_args()
+
+    with open(args.manifest) as f:
+        manifest = json.load(f)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    # propagations depend on the iteration order of sets, pin string hashing in the spawned processes
+    os.environ["PYTHONHASHSEED"] = "0"
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for project in manifest["projects"]:
+            name = project["name"]
+            if args.projects and name not in args.projects:
+                continue
+            root, reason = locate(project, manifest, args.corpus_dir)
+            if root is None:
+                print(f"{name:<20} skipped: {reason}")
+                continue
+
+            res = results[name] = pool.apply(benchmark, (project, root))
+            print(f"{name:<20} {res['statements']:>8} stmts  {res['wall_seconds']:>7.2f}s  "
+                  f"{res['propagations']:>9} propagations  {res['peak_rss_bytes'] / 2 ** 20:>6.0f} MB")
+            if name in baseline and not args.update_baseline:
+                regressions += compare(name, res, baseline[name], args.threshold)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
+
+    if args.update_baseline:
+        baseline.update({name: {metric: res[metric] for metric in ("statements", "callgraph_edges", *METRICS)}
+                         for name, res in results.items()})
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=4)
+        print(f"Baseline is written to {args.baseline}")
+    elif regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print("    " + regression)
+        sys.exit(1)
@@ -0,0 +1,89 @@
+"""
+Speed and precision of the call graph engines on spear/tests/resources.
+
+Every resource is lowered once and solved by each engine. Edges are compared with the expected callgraph.json
+of the resource: precision is the share of reported edges that are expected, recall is the share of expected
+edges that are reported, and a resource is exact when both are 1.
+
+Usage:
+    python -m spear.benchmark.engines [-o results.json]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.callgraph.assignment_graph import AssignmentGraph
+from spear.analysis.callgraph.unification import Unification
+
+RESOURCES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "resources")
+
+ENGINES = {
+    "pta": Analysis,
+    "assignment": AssignmentGraph,
+    "unification": Unification,
+}
+
+
+def resources(root: str = RESOURCES) -> list:
+    res = []
+    for category in sorted(os.listdir(root)):
+        if not os.path.isdir(os.path.join(root, category)):
+            continue
+        for name in sorted(os.listdir(os.path.join(root, category))):
+            path = os.path.join(root, category, name)
+            if os.path.exists(os.path.join(path, "main.py")):
+                res.append(path)
+    return res
+
+
+def edges(callgraph: dict) -> set:
+    return {(caller, callee) for caller, callees in callgraph.items() for callee in callees}
+
+
+def compare(engines: dict = ENGINES, root: str = RESOURCES) -> dict:
+    results = {name: {"seconds": 0.0, "exact": 0, "reported": 0, "expected": 0, "true_positives": 0}
+               for name in engines}
+    paths = resources(root)
+    for path in paths:
+        with open(os.path.join(path, "callgraph.json")) as f:
+            expected = edges(json.load(f))
+        module_manager = ModuleManager(path)
+        module_manager.addEntry(file="main.py")
+
+        for name, engine in engines.items():
+            analysis = engine()
+            start = time.perf_counter()
+            analysis.analyze(module_manager.getEntrys())
+            res = results[name]
+            res["seconds"] += time.perf_counter() - start
+
+            reported = edges(analysis.callgraph)
+            res["exact"] += reported == expected
+            res["reported"] += len(reported)
+            res["expected"] += len(expected)
+            res["true_positives"] += len(reported & expected)
+
+    for res in results.values():
+        res["resources"] = len(paths)
+        res["precision"] = res["true_positives"] / res["reported"] if res["reported"] else 1.0
+        res["recall"] = res["true_positives"] / res["expected"] if res["expected"] else 1.0
+    return results
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("-o", "--output", help="Write the results as JSON.")
+    args = argparser.parse_args()
+
+    results = compare()
+    for name, res in results.items():
+        print(f"{name:<12} {res['exact']:>3}/{res['resources']} exact  precision {res['precision']:.3f}  "
+              f"recall {res['recall']:.3f}  {res['seconds']:.3f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=4)
@@ -0,0 +1,206 @@
+"""
+Generator of synthetic Python projects for benchmarking Spear.
+
+A project is a package "proj" with modules proj.m0, proj.m1, ..., and a script main.py which imports every
+module and calls its entry function. Each module contains a class hierarchy, plain functions calling each
+other and functions of the modules it imports, containers of constants and of functions, decorated functions
+and closures. Modules only import modules with smaller indexes, so the import graph is acyclic.
+
+Usage:
+    python -m spear.benchmark.generator OUTPUT_DIR [--loc LINES] [--modules N] [--seed SEED] ...
+"""
+
+import argparse
+import os
+import random
+from typing import List
+
+PACKAGE = "proj"
+
+
+class ProjectShape:
+    modules: int  # number of modules
+    imports: int  # modules imported by each module
+    classDepth: int  # length of inheritance chains
+    classWidth: int  # number of inheritance chains in each module
+    functions: int  # plain functions in each module
+    calls: int  # calls in each function or method
+    containers: int  # list and dict literals in each module
+    containerSize: int  # elements in each container literal
+    decorators: int  # decorated functions in each module
+    closures: int  # closure factories in each module
+
+    def __init__(self, modules: int = 10, imports: int = 3, class_depth: int = 3, class_width: int = 2,
+                 functions: int = 8, calls: int = 3, containers: int = 2, container_size: int = 20,
+                 decorators: int = 2, closures: int = 2):
+        self.modules = modules
+        self.imports = imports
+        self.classDepth = class_depth
+        self.classWidth = class_width
+        self.functions = functions
+        self.calls = calls
+        self.containers = containers
+        self.containerSize = container_size
+        self.decorators = decorators
+        self.closures = closures
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+class ModuleGenerator:
+    index: int
+    shape: ProjectShape
+    rand: random.Random
+    lines: List[str]
+    imported: List[int]  # indexes of imported modules
+
+    def __init__(self, index: int, shape: ProjectShape, rand: random.Random):
+        self.index = index
+        self.shape = shape
+        self.rand = rand
+        self.lines = []
+        self.imported = rand.sample(range(index), min(index, shape.imports))
+
+    def emit(self, line: str = "", indent: int = 0):
+        self.lines.append("    " * indent + line)
+
+    # an expression which is callable without arguments
+    def randomCallee(self) -> str:
+        shape = self.shape
+        choice = self.rand.randrange(4)
+        if choice == 0 and self.imported:
+            return f"m{self.rand.choice(self.imported)}.f{self.rand.randrange(shape.functions)}"
+        elif choice == 1 and shape.classWidth and shape.classDepth:
+            chain = self.rand.randrange(shape.classWidth)
+            level = self.rand.randrange(shape.classDepth)
+            # methods are inherited along the chain
+            method = self.rand.randrange(level + 1)
+            return f"C{chain}_{level}().method{method}"
+        elif choice == 2 and shape.decorators:
+            return f"decorated{self.rand.randrange(shape.decorators)}"
+        else:
+            return f"f{self.rand.randrange(shape.functions)}"
+
+    def emitCalls(self, indent: int):
+        for _ in range(self.shape.calls):
+            self.emit(f"{self.randomCallee()}()", indent)
+
+    def generate(self) -> str:
+        shape = self.shape
+        for i in sorted(self.imported):
+            self.emit(f"from {PACKAGE} import m{i}")
+        self.emit()
+
+        for i in range(shape.functions):
+            self.emit()
+            self.emit(f"def f{i}():")
+            self.emitCalls(1)
+            self.emit(f"return {i}", 1)
+
+        for chain in range(shape.classWidth):
+            for level in range(shape.classDepth):
+                self.emit()
+                base = f"(C{chain}_{level - 1})" if level else ""
+                self.emit(f"class C{chain}_{level}{base}:")
+                self.emit(f"kind = {level}", 1)
+                self.emit()
+                self.emit(f"def method{level}(self):", 1)
+                self.emitCalls(2)
+                self.emit("return self", 2)
+
+        if shape.decorators:
+            self.emit()
+            self.emit("def deco(func):")
+            self.emit("def wrapper(*args, **kwargs):", 1)
+            self.emit("return func(*args, **kwargs)", 2)
+            self.emit("return wrapper", 1)
+        for i in range(shape.decorators):
+            self.emit()
+            self.emit("@deco")
+            self.emit(f"def decorated{i}():")
+            self.emit(f"return f{self.rand.randrange(shape.functions)}()", 1)
+
+        for i in range(shape.closures):
+            self.emit()
+            self.emit(f"def make{i}(func):")
+            self.emit("def inner():", 1)
+            self.emit("return func()", 2)
+            self.emit("return inner", 1)
+
+        for i in range(shape.containers):
+            self.emit()
+            values = ", ".join(str(self.rand.randrange(1000)) for _ in range(shape.containerSize))
+            self.emit(f"values{i} = [{values}]")
+            items = ", ".join(f"\"k{j}\": {self.rand.randrange(1000)}" for j in range(shape.containerSize))
+            self.emit(f"table{i} = {{{items}}}")
+            handlers = ", ".join(f"f{self.rand.randrange(shape.functions)}" for _ in range(4))
+            self.emit(f"handlers{i} = [{handlers}]")
+
+        self.emit()
+        self.emit()
+        self.emit("def entry():")
+        for i in range(shape.containers):
+            self.emit(f"for handler in handlers{i}:", 1)
+            self.emit("handler()", 2)
+        for i in range(shape.closures):
+            self.emit(f"make{i}({self.randomCallee()})()", 1)
+        for i in sorted(self.imported):
+            self.emit(f"m{i}.entry()", 1)
+        self.emitCalls(1)
+        self.emit()
+        return "\n".join(self.lines)
+
+
+# return the number of lines generated
+def generateProject(root: str, shape: ProjectShape, seed: int = 0) -> int:
+    rand = random.Random(seed)
+    package = os.path.join(root, PACKAGE)
+    os.makedirs(package, exist_ok=True)
+    with open(os.path.join(package, "__init__.py"), "w"):
+        pass
+
+    lines = 0
+    for i in range(shape.modules):
+        source = ModuleGenerator(i, shape, rand).generate()
+        lines += source.count("\n")
+        with open(os.path.join(package, f"m{i}.py"), "w") as f:
+            f.write(source)
+
+    main = [f"from {PACKAGE} import m{i}" for i in range(shape.modules)]
+    main += [f"m{i}.entry()" for i in range(shape.modules)]
+    with open(os.path.join(root, "main.py"), "w") as f:
+        f.write("\n".join(main) + "\n")
+    return lines + len(main)
+
+
+# number of modules needed to reach about loc lines with the given shape
+def modulesFor(loc: int, shape: ProjectShape) -> int:
+    sample = ModuleGenerator(shape.imports, shape, random.Random(0)).generate()
+    per_module = sample.count("\n") + 2  # including its lines in main.py
+    return max(1, round(loc / per_module))
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("output")
+    argparser.add_argument("--loc", type=int, help="Approximate lines of code, overrides --modules.")
+    argparser.add_argument("--modules", type=int, default=10)
+    argparser.add_argument("--imports", type=int, default=3)
+    argparser.add_argument("--class-depth", type=int, default=3)
+    argparser.add_argument("--class-width", type=int, default=2)
+    argparser.add_argument("--functions", type=int, default=8)
+    argparser.add_argument("--calls", type=int, default=3)
+    argparser.add_argument("--containers", type=int, default=2)
+    argparser.add_argument("--container-size", type=int, default=20)
+    argparser.add_argument("--decorators", type=int, default=2)
+    argparser.add_argument("--closures", type=int, default=2)
+    argparser.add_argument("--seed", type=int, default=0)
+    args = argparser.parse_args()
+
+    shape = ProjectShape(args.modules, args.imports, args.class_depth, args.class_width, args.functions, args.calls,
+                         args.containers, args.container_size, args.decorators, args.closures)
+    if args.loc:
+        shape.modules = modulesFor(args.loc, shape)
+    lines = generateProject(args.output, shape, args.seed)
+    print(f"Generated {shape.modules} modules, {lines} lines in {args.output}")
@@ -0,0 +1,130 @@
+"""
+Point-to Analysis on synthetic class hierarchies.
+
+Usage:
+    python -m spear.benchmark.hierarchy [--wide LAYERS WIDTH] [--deep DEPTH] [--methods DEPTH METHODS]
+                                        [--supers MIXINS CLASSES] [--max-mros N]
+
+wide: every class has several bases, and every base may be one of two classes of the layer below,
+      so the number of possible MROs multiplies with each layer.
+deep: a single chain of classes, each one inheriting from the previous one.
+methods: a chain of classes that each define several methods, and call all the methods they inherit through self.
+supers: classes combining a few of the mixins, which call the next method along the MRO through a shared helper
+        doing super(mixin, self), so that the helper sees every mixin and every class.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.alias.pta.class_hiearchy import DEFAULT_MAX_MROS
+from spear.analysis.alias.pta.object_pool import OBJ_CLASS_METHOD, OBJ_SUPER
+
+BASES_PER_CLASS = 3
+CHOICES_PER_BASE = 2
+
+
+def wideHierarchy(layers: int, width: int) -> str:
+    lines = []
+    for i in range(width):
+        lines += [f"class C0_{i}:", f"    def m0_{i}(self): pass", ""]
+
+    for layer in range(1, layers):
+        for i in range(width):
+            bases = []
+            for j in range(BASES_PER_CLASS):
+                base = f"B{layer}_{i}_{j}"
+                for k in range(CHOICES_PER_BASE):
+                    parent = (i * BASES_PER_CLASS * CHOICES_PER_BASE + j * CHOICES_PER_BASE + k) % width
+                    lines.append(f"{base} = C{layer - 1}_{parent}")
+                bases.append(base)
+            lines += [f"class C{layer}_{i}({', '.join(bases)}):", f"    def m{layer}_{i}(self): pass", ""]
+
+    for i in range(width):
+        lines.append(f"C{layer}_{i}().m0_{i}()")
+    return "\n".join(lines) + "\n"
+
+
+def deepHierarchy(depth: int) -> str:
+    lines = ["class C0:", "    def m(self): pass", ""]
+    for i in range(1, depth):
+        lines += [f"class C{i}(C{i - 1}):", "    pass", ""]
+    lines.append(f"C{depth - 1}().m()")
+    return "\n".join(lines) + "\n"
+
+
+def methodHierarchy(depth: int, methods: int) -> str:
+    lines = []
+    for i in range(depth):
+        lines.append(f"class C{i}(C{i - 1}):" if i else "class C0:")
+        for j in range(methods):
+            lines += [f"    def f{i}_{j}(self, x):", "        return self.g(x)"]
+        lines += ["    def g(self, x):", "        return x", f"    def run{i}(self):"]
+        lines += [f"        self.f{k}_{j}(self)" for k in range(i + 1) for j in range(methods)]
+        lines.append("")
+    lines += [f"C{i}().run{i}()" for i in range(depth)]
+    return "\n".join(lines) + "\n"
+
+
+def superHierarchy(mixins: int, classes: int) -> str:
+    lines = ["def callNext(mixin, obj):", "    return super(mixin, obj).m()", "",
+             "class Base:", "    def m(self): pass", ""]
+    for i in range(mixins):
+        lines += [f"class M{i}(Base):", f"    def m(self): return callNext(M{i}, self)", ""]
+    for i in range(classes):
+        bases = ", ".join(f"M{(i + j) % mixins}" for j in range(BASES_PER_CLASS))
+        lines += [f"class C{i}({bases}):", "    pass", "", f"C{i}().m()", ""]
+    return "\n".join(lines) + "\n"
+
+
+def run(source: str, max_mros: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "main.py"), "w") as f:
+            f.write(source)
+
+        start = time.perf_counter()
+        module_manager = ModuleManager(tmp, max_depth=0)
+        module_manager.addEntry(file="main.py")
+        lowered = time.perf_counter()
+        analysis = Analysis(max_mros=max_mros)
+        try:
+            analysis.analyze(module_manager.getEntrys())
+            error = None
+        except RecursionError as e:
+            error = repr(e)
+        solved = time.perf_counter()
+
+    mros = analysis.classHiearchy.mros
+    return {
+        "classes": len(mros),
+        "mros": sum(len(m) for m in mros.values()),
+        "max_mros_per_class": max((len(m) for m in mros.values()), default=0),
+        "callgraph_edges": sum(len(callees) for callees in analysis.callgraph.values()),
+        "bound_methods": len(analysis.objectPool.pools[OBJ_CLASS_METHOD]),
+        "super_objects": len(analysis.objectPool.pools[OBJ_SUPER]),
+        "lower_seconds": lowered - start,
+        "solve_seconds": solved - lowered,
+        "error": error,
+    }
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--wide", nargs=2, type=int, default=[4, 12], metavar=("LAYERS", "WIDTH"))
+    argparser.add_argument("--deep", type=int, default=2000, metavar="DEPTH")
+    argparser.add_argument("--methods", nargs=2, type=int, default=[40, 10], metavar=("DEPTH", "METHODS"))
+    argparser.add_argument("--supers", nargs=2, type=int, default=[30, 300], metavar=("MIXINS", "CLASSES"))
+    argparser.add_argument("--max-mros", type=int, default=DEFAULT_MAX_MROS,
+                           help="Cap on MROs kept for one class, past which they are merged.")
+    args = argparser.parse_args()
+
+    print(json.dumps({
+        "wide": run(wideHierarchy(*args.wide), args.max_mros),
+        "deep": run(deepHierarchy(args.deep), args.max_mros),
+        "methods": run(methodHierarchy(*args.methods), args.max_mros),
+        "supers": run(superHierarchy(*args.supers), args.max_mros),
+    }, indent=4))
@@ -0,0 +1,67 @@
+"""
+Memory taken by the IR and by the Point-to Analysis, normalized to one million IR statements.
+
+Usage:
+    python -m spear.benchmark.ir_memory [PATH] [-f FILE ...] [-m MODULE ...]
+
+Without entry points, Spear's own source tree is lowered and analyzed.
+"""
+
+import argparse
+import gc
+import json
+import os
+import tracemalloc
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+
+SPEAR_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SPEAR_MODULES = ["spear.analysis.alias.__main__", "spear.tests.TestOptimizer", "spear.analysis.alias.pta.snapshot",
+                 "spear.analysis.alias.pta.query", "spear.analysis.alias.pta.reachability"]
+
+MILLION = 1000000
+
+
+def measure(path: str, files=(), modules=(), max_depth: int = 0) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    module_manager = ModuleManager(path, max_depth=max_depth)
+    for file in files:
+        module_manager.addEntry(file=file)
+    for module in modules:
+        module_manager.addEntry(module=module)
+    gc.collect()
+    ir_bytes = tracemalloc.get_traced_memory()[0] - base
+    stmt_count = sum(len(cb.stmts) for cb in module_manager.allCodeBlocks(nested=True))
+
+    analysis = Analysis()
+    analysis.analyze(module_manager.getEntrys())
+    gc.collect()
+    total_bytes = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    return {
+        "statements": stmt_count,
+        "ir_bytes": ir_bytes,
+        "pta_bytes": total_bytes - ir_bytes,
+        "ir_mb_per_million_stmts": ir_bytes / stmt_count * MILLION / 2 ** 20,
+        "pta_mb_per_million_stmts": (total_bytes - ir_bytes) / stmt_count * MILLION / 2 ** 20,
+    }
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("path", nargs="?", default=SPEAR_ROOT)
+    argparser.add_argument("-f", "--files", nargs="+", default=[])
+    argparser.add_argument("-m", "--modules", nargs="+", default=[])
+    argparser.add_argument("--max-depth", type=int, default=0,
+                           help="0 means modules outside PATH are not loaded.")
+    args = argparser.parse_args()
+
+    if not args.files and not args.modules:
+        args.modules = SPEAR_MODULES
+
+    print(json.dumps(measure(args.path, args.files, args.modules, args.max_depth), indent=4))
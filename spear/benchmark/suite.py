@@ -0,0 +1,123 @@
+"""
+Scaling benchmark on synthetic projects.
+
+For each size, a project is generated with spear.benchmark.generator, then lowered, analyzed and exported in a
+fresh process, so that peak RSS belongs to that size only. Results are written as JSON, one entry per size.
+
+Usage:
+    python -m spear.benchmark.suite [--loc 1000 10000 100000] [-o results.json] [--trace-memory]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta import snapshot
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.alias.timing import PhaseTimer
+from spear.benchmark.generator import ProjectShape, generateProject, modulesFor
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def peakRSS() -> int:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class Phases(PhaseTimer):
+
+    def __init__(self, trace_memory: bool):
+        super().__init__()
+        self.traceMemory = trace_memory
+
+    @contextmanager
+    def phase(self, name: str):
+        if self.traceMemory:
+            tracemalloc.reset_peak()
+        with super().phase(name) as phase:
+            yield phase
+        if self.traceMemory:
+            phase["traced_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+
+
+def lower(path: str) -> ModuleManager:
+    module_manager = ModuleManager(path, max_depth=0)
+    module_manager.addEntry(file="main.py")
+    return module_manager
+
+
+def solve(module_manager: ModuleManager) -> Analysis:
+    analysis = Analysis()
+    analysis.analyze(module_manager.getEntrys())
+    return analysis
+
+
+def export(analysis: Analysis, path: str):
+    callgraph = {k: list(v) for k, v in analysis.callgraph.items()}
+    with open(os.path.join(path, "callgraph.json"), "w") as fp:
+        json.dump(callgraph, fp)
+    with open(os.path.join(path, "snapshot.bin"), "wb") as fp:
+        snapshot.dump(analysis.pointToSet, callgraph, fp)
+
+
+def benchmark(loc: int, shape: ProjectShape, seed: int, trace_memory: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        shape.modules = modulesFor(loc, shape)
+        lines = generateProject(tmp, shape, seed)
+
+        if trace_memory:
+            tracemalloc.start()
+        phases = Phases(trace_memory)
+        module_manager = phases.run("lower", lower, tmp)
+        analysis = phases.run("solve", solve, module_manager)
+        phases.run("export", export, analysis, tmp)
+        if trace_memory:
+            tracemalloc.stop()
+
+        return {
+            "loc": lines,
+            "shape": shape.to_dict(),
+            "statements": sum(len(cb.stmts) for cb in module_manager.allCodeBlocks(nested=True)),
+            "pointers": len(analysis.pointToSet.varPtrSet) + sum(len(d) for d in analysis.pointToSet.attrPtrSet.values()),
+            "callgraph_edges": sum(len(callees) for callees in analysis.callgraph.values()),
+            "phases": phases.results,
+            "peak_rss_bytes": peakRSS(),
+        }
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument("--loc", type=int, nargs="+", default=DEFAULT_SIZES,
+                           help="Approximate lines of code of each generated project.")
+    argparser.add_argument("-o", "--output", help="Where the JSON results are written, stdout by default.")
+    argparser.add_argument("--seed", type=int, default=0)
+    argparser.add_argument("--trace-memory", action="store_true", default=False,
+                           help="Record tracemalloc peaks for each phase. Timings get slower.")
+    args = argparser.parse_args()
+
+    results = []
+    # a fresh process for each size, maxtasksperchild makes sure it isn't reused
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for loc in args.loc:
+            res = pool.apply(benchmark, (loc, ProjectShape(), args.seed, args.trace_memory))
+            phases = res["phases"]
+            print(f"{res['loc']:>9} lines: lower {phases['lower']['wall_seconds']:.2f}s, "
+                  f"solve {phases['solve']['wall_seconds']:.2f}s, export {phases['export']['wall_seconds']:.2f}s, "
+                  f"peak RSS {res['peak_rss_bytes'] / 2 ** 20:.0f} MB", file=sys.stderr)
+            results.append(res)
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
@@ -0,0 +1,32 @@
+import os
+import unittest
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.callgraph.assignment_graph import AssignmentGraph
+from spear.benchmark.engines import RESOURCES, edges, resources
+
+# no MROs are computed, so lookups and super() may find more than the first class along each MRO
+IMPRECISE = {"mro/diamond", "mro/parallel", "super/bound", "super/diamond"}
+
+
+class TestAssignmentGraph(unittest.TestCase):
+
+    def testAgreesWithPTA(self):
+        for path in resources():
+            name = os.path.relpath(path, RESOURCES)
+            module_manager = ModuleManager(path)
+            module_manager.addEntry(file="main.py")
+            analysis = Analysis()
+            analysis.analyze(module_manager.getEntrys())
+            assignment_graph = AssignmentGraph()
+            assignment_graph.analyze(module_manager.getEntrys())
+
+            with self.subTest(resource=name):
+                self.assertLessEqual(edges(analysis.callgraph), edges(assignment_graph.callgraph))
+                if name not in IMPRECISE:
+                    self.assertEqual(edges(assignment_graph.callgraph), edges(analysis.callgraph))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
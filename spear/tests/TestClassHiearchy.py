@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.alias.pta.class_hiearchy import MergedMRO
+from spear.analysis.alias.pta.object_pool import OBJ_SUPER
+from spear.benchmark.hierarchy import deepHierarchy, methodHierarchy, superHierarchy, wideHierarchy
+
+
+def analyze(source: str, max_mros: int) -> Analysis:
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "main.py"), "w") as f:
+            f.write(source)
+        module_manager = ModuleManager(tmp, max_depth=0)
+        module_manager.addEntry(file="main.py")
+        analysis = Analysis(max_mros=max_mros)
+        analysis.analyze(module_manager.getEntrys())
+        return analysis
+
+
+class TestClassHiearchy(unittest.TestCase):
+
+    def testDeep(self):
+        analysis = analyze(deepHierarchy(1500), 32)
+        self.assertIn("__main__.C0.m", analysis.callgraph["__main__"])
+
+    def testMergedIsSound(self):
+        source = wideHierarchy(2, 12)
+        exact = analyze(source, 1000)
+        merged = analyze(source, 2)
+        self.assertTrue(any(isinstance(mro, MergedMRO) for mros in merged.classHiearchy.mros.values()
+                            for mro in mros))
+        for caller, callees in exact.callgraph.items():
+            self.assertLessEqual(callees, merged.callgraph[caller])
+
+    def testMergedIsNotReal(self):
+        # the merged MRO lists the same classes as one of the real MROs, but must still replace them
+        source = "\n".join(["class A:",
+                             "    def f(self): pass",
+                             "class B:",
+                             "    def f(self): pass",
+                             "x = A",
+                             "y = B",
+                             "class C(x, y):",
+                             "    pass",
+                             "def swap():",
+                             "    global x, y",
+                             "    x = B",
+                             "    y = A",
+                             "swap()",
+                             "C.f()",
+                             ""])
+        analysis = analyze(source, 1)
+        self.assertLessEqual({"__main__.A.f", "__main__.B.f"}, analysis.callgraph["__main__"])
+        mros = [mros for cls, mros in analysis.classHiearchy.mros.items() if cls.readable_name == "__main__.C"]
+        self.assertEqual(len(mros), 1)
+        self.assertTrue(all(isinstance(mro, MergedMRO) for mro in mros[0]))
+
+    def testBoundMethods(self):
+        analysis = analyze(methodHierarchy(6, 3), 32)
+        self.assertEqual(analysis.callgraph["__main__.C0.f0_0"], {"__main__.C" + str(i) + ".g" for i in range(6)})
+
+        # the receiver is carried with the method as it flows through variables, and bound when it is called
+        source = "\n".join(["class A:",
+                             "    def run(self, x):",
+                             "        return self.step(x)",
+                             "    def step(self, x):",
+                             "        pass",
+                             "class B(A):",
+                             "    def step(self, x):",
+                             "        pass",
+                             "def call(f):",
+                             "    return f(1)",
+                             "m = B.run",
+                             "call(m)",
+                             ""])
+        analysis = analyze(source, 32)
+        self.assertEqual(analysis.callgraph["__main__.call"], {"__main__.A.run"})
+        self.assertIn("__main__.B.step", analysis.callgraph["__main__.A.run"])
+
+    def testUncalledMethod(self):
+        # reading a method without calling it doesn't bind the receiver
+        source = "\n".join(["class A:",
+                             "    def m(self):",
+                             "        self.h()",
+                             "    def h(self):",
+                             "        pass",
+                             "class B(A):",
+                             "    def h(self):",
+                             "        pass",
+                             "A().m()",
+                             "cb = B().m",
+                             ""])
+        analysis = analyze(source, 32)
+        self.assertEqual(analysis.callgraph["__main__.A.m"], {"__main__.A.h"})
+
+    def testSuperTypes(self):
+        analysis = analyze(superHierarchy(5, 20), 32)
+        # one super object per bound class, though the helper sees all the mixins as types
+        bounds = {obj.bound for obj in analysis.objectPool.pools[OBJ_SUPER].values()}
+        self.assertEqual(len(analysis.objectPool.pools[OBJ_SUPER]), len(bounds))
+        # every class is M{i}, M{i+1}, M{i+2} and Base, so super() of the last mixin reaches Base.m
+        self.assertEqual(analysis.callgraph["__main__.callNext"],
+                         {"__main__.Base.m"} | {f"__main__.M{i}.m" for i in range(5)})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+
+from spear.analysis.alias.corpus import analyzeCorpus
+from spear.analysis.alias.module_manager import LoweringCache, ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+
+FILES = {
+    os.path.join("ext", "extlib", "__init__.py"): "from extlib.util import helper\ndef run(f):\n    return f()\n",
+    os.path.join("ext", "extlib", "util.py"): "def helper():\n    return 1\n",
+    os.path.join("project_a", "main.py"): "import extlib\ndef job():\n    extlib.helper()\nextlib.run(job)\n",
+    os.path.join("project_b", "main.py"): "from extlib import util\nutil.helper()\n",
+}
+
+
+def getCallgraph(path: str, external_path: str, cache: LoweringCache = None):
+    module_manager = ModuleManager(path, cache=cache)
+    module_manager.externalPath = [external_path]
+    module_manager.addEntry(file="main.py")
+    analysis = Analysis()
+    analysis.analyze(module_manager.getEntrys())
+    return {k: sorted(v) for k, v in analysis.callgraph.items()}
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for name, source in FILES.items():
+            os.makedirs(os.path.dirname(os.path.join(self.tmp.name, name)), exist_ok=True)
+            with open(os.path.join(self.tmp.name, name), "w") as f:
+                f.write(source)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # external modules lowered for one project are reused by the next, and callgraphs don't change
+    def testCache(self):
+        ext = os.path.join(self.tmp.name, "ext")
+        cache = LoweringCache()
+        for project in ("project_a", "project_b", "project_a"):
+            path = os.path.join(self.tmp.name, project)
+            self.assertEqual(getCallgraph(path, ext, cache), getCallgraph(path, ext))
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.hits, 2)
+
+        with self.assertRaises(ValueError):
+            ModuleManager(os.path.join(self.tmp.name, "project_a"), max_depth=0, cache=cache)
+
+    def testAnalyzeCorpus(self):
+        projects = [{"name": project, "path": os.path.join(self.tmp.name, project), "files": ["main.py"]}
+                    for project in ("project_a", "project_b")]
+        projects.append({"name": "empty", "path": self.tmp.name})
+        output = os.path.join(self.tmp.name, "out")
+        results = analyzeCorpus(projects, output, jobs=1, timeout=60, no_dependency=True)
+
+        self.assertEqual([res["name"] for res in results], ["project_a", "project_b", "empty"])
+        self.assertEqual([res["status"] for res in results], ["ok", "ok", "error"])
+        with open(os.path.join(output, "project_a.json")) as f:
+            callgraph = {k: sorted(v) for k, v in json.load(f).items()}
+        # extlib is not analyzed with no_dependency, so job is never called
+        self.assertEqual(callgraph["__main__"], ["extlib.run"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+import unittest
+
+from spear.analysis.alias.entries import solveEntries
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+
+SCRIPTS = {
+    "job_a.py": "from lib import helper\nhelper()\n",
+    "job_b.py": "import lib\ndef run():\n    lib.other()\nrun()\n",
+    os.path.join("lib", "__init__.py"): "def helper():\n    return 1\ndef other():\n    return helper()\n",
+}
+
+
+def getCallgraph(path: str, file: str):
+    module_manager = ModuleManager(path)
+    module_manager.addEntry(file=file)
+    analysis = Analysis()
+    analysis.analyze(module_manager.getEntrys())
+    return {k: sorted(v) for k, v in analysis.callgraph.items()}
+
+
+# each entry gets the callgraph it would get if it was analyzed alone
+class TestEntries(unittest.TestCase):
+
+    def testPerEntry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "lib"))
+            for name, source in SCRIPTS.items():
+                with open(os.path.join(tmp, name), "w") as f:
+                    f.write(source)
+
+            module_manager = ModuleManager(tmp)
+            module_manager.addEntry(file="job_a.py")
+            module_manager.addEntry(file="job_b.py")
+            output_dir = os.path.join(tmp, "out")
+            results = solveEntries(module_manager, output_dir, jobs=2)
+            self.assertEqual([res["entry"] for res in results], ["job_a", "job_b"])
+
+            for file in ("job_a.py", "job_b.py"):
+                with open(os.path.join(output_dir, file[:-3] + ".json")) as f:
+                    callgraph = {k: sorted(v) for k, v in json.load(f).items()}
+                self.assertEqual(callgraph, getCallgraph(tmp, file))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from spear.analysis.alias.ir.ir_stmts import NewBuiltin, SetAttr
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+
+ROWS = ",\n".join(f"    ({i}, 'row{i}', [{i}, -{i}], {{'id': {i}}})" for i in range(200))
+TABLE = f"TABLE = [\n{ROWS}\n]\nFLAT = {{{', '.join(str(i) for i in range(200))}}}\n"
+FUNCS = "".join(f"def f{i}():\n    pass\n" for i in range(40))
+TUPLE = FUNCS + f"""t = ({', '.join(f'f{i}' for i in range(40))})
+def near():
+    t[1]()
+def far():
+    t[30]()
+def unpack():
+    *_, last = t
+    last()
+near()
+far()
+unpack()
+"""
+MAIN = """from table import TABLE
+def handler():
+    pass
+TABLE[0][2][0] = handler
+for row in TABLE:
+    row[2][1]()
+"""
+
+
+class TestLiterals(unittest.TestCase):
+
+    def _lower(self, path: str, literal_limit: int):
+        module_manager = ModuleManager(path, max_depth=0, literal_limit=literal_limit)
+        module_manager.addEntry(file="main.py")
+        return module_manager
+
+    def testCollapse(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, source in (("table.py", TABLE), ("main.py", MAIN)):
+                with open(os.path.join(tmp, name), "w") as f:
+                    f.write(source)
+            full = self._lower(tmp, 0).modules["table"].__codeBlock__
+            collapsed = self._lower(tmp, 100).modules["table"].__codeBlock__
+            self.assertGreater(len(full.stmts), 1000)
+            # TABLE is one object holding itself, FLAT is one object
+            news = [stmt for stmt in collapsed.stmts if isinstance(stmt, NewBuiltin)]
+            self.assertEqual([stmt.type for stmt in news], ["list", "list"])
+            stores = [stmt for stmt in collapsed.stmts if isinstance(stmt, SetAttr) and stmt.attr == "$values"]
+            self.assertEqual([(stmt.target, stmt.source) for stmt in stores], [(news[0].target, news[0].target)])
+
+            module_manager = self._lower(tmp, 100)
+            analysis = Analysis()
+            analysis.analyze(module_manager.getEntrys())
+            self.assertEqual(analysis.callgraph["__main__"], {"__main__.handler"})
+
+    def testTupleIndexLimit(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "main.py"), "w") as f:
+                f.write(TUPLE)
+            module_manager = ModuleManager(tmp, tuple_index_limit=4)
+            module_manager.addEntry(file="main.py")
+            analysis = Analysis()
+            analysis.analyze(module_manager.getEntrys())
+
+            fields = set().union(*(attrs for attrs in analysis.pointToSet.attrPtrSet.values()))
+            self.assertEqual({field for field in fields if field[0] == "$" and field[1:].lstrip("-").isdigit()},
+                             {"$0", "$1", "$2", "$3", "$-1", "$-2", "$-3", "$-4"})
+            # within the limit an index is exact, beyond it every element may be called
+            self.assertEqual(analysis.callgraph["__main__.near"], {"__main__.f1"})
+            self.assertEqual(analysis.callgraph["__main__.far"], {f"__main__.f{i}" for i in range(40)})
+            self.assertEqual(analysis.callgraph["__main__.unpack"], {"__main__.f39"})
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
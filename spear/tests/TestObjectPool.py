@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.alias.pta.object_pool import OBJ_FAKE
+
+
+def analyze(source: str) -> Analysis:
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "main.py"), "w") as f:
+            f.write(source)
+        module_manager = ModuleManager(tmp, max_depth=0)
+        module_manager.addEntry(file="main.py")
+        analysis = Analysis()
+        analysis.analyze(module_manager.getEntrys())
+        return analysis
+
+
+class TestObjectPool(unittest.TestCase):
+
+    def testFakeModules(self):
+        # extmod can't be found, so extmod.sub is reached both by its name and as an attribute of extmod
+        source = "\n".join(["import extmod.sub as s",
+                            "from extmod import sub",
+                            "import extmod",
+                            "x = extmod.sub",
+                            "s()",
+                            "sub()",
+                            "x()"])
+        pool = analyze(source).objectPool.pools[OBJ_FAKE]
+        self.assertIn("Fake(extmod.sub)", {o.id for o in pool.values()})
+        self.assertEqual(len({o.id for o in pool.values()}), len(pool))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
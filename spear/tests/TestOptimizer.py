@@ -0,0 +1,47 @@
+import os
+import unittest
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.optimizer import Optimizer
+from spear.analysis.alias.pta.analysis import Analysis
+
+resourcePath = os.path.join(os.path.dirname(__file__), "resources")
+
+
+def getCallgraph(path: str, optimize: bool):
+    module_manager = ModuleManager(path)
+    module_manager.addEntry(file="main.py")
+    if optimize:
+        Optimizer(module_manager.allCodeBlocks(nested=True)).start()
+    analysis = Analysis()
+    analysis.analyze(module_manager.getEntrys())
+    return {k: sorted(v) for k, v in analysis.callgraph.items() if v}
+
+
+# IR optimization should never change the callgraph
+class TestOptimizer(unittest.TestCase):
+
+    def testResources(self):
+        for item in sorted(os.listdir(resourcePath)):
+            item_path = os.path.join(resourcePath, item)
+            if not os.path.isdir(item_path):
+                continue
+            for subitem in sorted(os.listdir(item_path)):
+                subitem_path = os.path.join(item_path, subitem)
+                if not os.path.isdir(subitem_path) or subitem == "__pycache__":
+                    continue
+                with self.subTest(f"{item}/{subitem}"):
+                    self.assertEqual(getCallgraph(subitem_path, True), getCallgraph(subitem_path, False))
+
+    def testRemoveStmts(self):
+        module_manager = ModuleManager(os.path.join(resourcePath, "class", "nested_call"))
+        module_manager.addEntry(file="main.py")
+        code_blocks = module_manager.allCodeBlocks(nested=True)
+        before = sum(len(cb.stmts) for cb in code_blocks)
+        Optimizer(code_blocks).start()
+        after = sum(len(cb.stmts) for cb in code_blocks)
+        self.assertLess(after, before)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
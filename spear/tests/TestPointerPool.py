@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+
+
+def analyze(source: str) -> Analysis:
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "main.py"), "w") as f:
+            f.write(source)
+        module_manager = ModuleManager(tmp, max_depth=0)
+        module_manager.addEntry(file="main.py")
+        analysis = Analysis()
+        analysis.analyze(module_manager.getEntrys())
+        return analysis
+
+
+class TestPointerPool(unittest.TestCase):
+
+    def testInitCalls(self):
+        analysis = analyze("class A:\n    def __init__(self): pass\nA()\n")
+        (call, cls), = analysis.initCalls
+        pointers = len(analysis.pointerPool.varPtrs)
+        stmts = len(call.belongsTo.stmts)
+        # the same class reaching the same call again doesn't make another __init__ call
+        analysis.processCall((call,), {cls})
+        self.assertEqual(len(analysis.pointerPool.varPtrs), pointers)
+        self.assertEqual(len(call.belongsTo.stmts), stmts)
+        self.assertEqual(analysis.callgraph["__main__"], {"__main__.A", "__main__.A.__init__"})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,49 @@
+import os
+import unittest
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.alias.pta.pointers import VarPtr
+from spear.analysis.alias.pta.query import AnalysisQuery
+
+resourcePath = os.path.join(os.path.dirname(__file__), "resources")
+
+
+class TestQuery(unittest.TestCase):
+
+    def setUp(self) -> None:
+        module_manager = ModuleManager(os.path.join(resourcePath, "mro", "diamond"))
+        module_manager.addEntry(file="main.py")
+        self.entry = module_manager.getEntrys()[0]
+        self.analysis = Analysis()
+        self.analysis.analyze([self.entry])
+        self.query = AnalysisQuery(self.analysis)
+
+    def testCalls(self):
+        self.assertEqual(self.query.callersOf("__main__.C.func"), {"__main__"})
+        self.assertIn("__main__.A.__init__", self.query.calleesOf("__main__"))
+        self.assertEqual(self.query.callersOf("__main__.A.func"), set())
+        self.assertEqual(self.query.calleesOf("no.such.func"), set())
+
+    def testPointsTo(self):
+        global_ptr = VarPtr.create(self.entry.globalVariable)
+        module_objs = self.query.getPointsTo(global_ptr)
+        self.assertEqual(len(module_objs), 1)
+        module_obj = next(iter(module_objs))
+        self.assertIn(global_ptr, self.query.pointersTo(module_obj))
+        self.assertEqual(self.query.pointersTo(str(module_obj)), self.query.pointersTo(module_obj))
+        self.assertEqual(self.query.getPointsTo(self.entry.globalVariable), module_objs)
+
+    def testMayAlias(self):
+        for ptr, objs in self.analysis.pointToSet.varPtrSet.items():
+            if objs:
+                self.assertTrue(self.query.mayAlias(ptr, ptr))
+        global_ptr = VarPtr.create(self.entry.globalVariable)
+        self.assertFalse(self.query.mayAlias(global_ptr, "not-a-pointer"))
+
+    def testFunctionsOf(self):
+        self.assertEqual(self.query.functionsOf("__main__"), {"__main__.A.__init__", "__main__.C.func"})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
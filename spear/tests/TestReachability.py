@@ -0,0 +1,71 @@
+import random
+import unittest
+from collections import defaultdict
+
+from spear.analysis.alias.pta.reachability import CallGraphReachability
+
+
+def bfs(callgraph, source):
+    seen = {source}
+    worklist = [source]
+    while worklist:
+        for callee in callgraph.get(worklist.pop(), ()):
+            if callee not in seen:
+                seen.add(callee)
+                worklist.append(callee)
+    return seen
+
+
+class TestReachability(unittest.TestCase):
+
+    def assertAgrees(self, reachability, callgraph, nodes):
+        for source in nodes:
+            expected = bfs(callgraph, source)
+            self.assertEqual(reachability.reachableFrom(source), expected)
+            for target in nodes:
+                self.assertEqual(reachability.isReachable(source, target), target in expected)
+                self.assertEqual(source in reachability.reachingTo(target), target in expected)
+
+    def testBuild(self):
+        callgraph = {
+            "main": ["a", "b"],
+            "a": ["c"],
+            "c": ["a", "d"],
+            "b": [],
+        }
+        reachability = CallGraphReachability(callgraph)
+        self.assertTrue(reachability.sameComponent("a", "c"))
+        self.assertFalse(reachability.sameComponent("a", "d"))
+        self.assertEqual(reachability.reachableFrom("a"), {"a", "c", "d"})
+        self.assertEqual(reachability.reachingTo("d"), {"main", "a", "c", "d"})
+        self.assertFalse(reachability.isReachable("b", "a"))
+        self.assertAgrees(reachability, callgraph, ["main", "a", "b", "c", "d"])
+
+    def testIncremental(self):
+        rand = random.Random(0)
+        nodes = [f"f{i}" for i in range(30)]
+        for _ in range(20):
+            callgraph = defaultdict(list)
+            for _ in range(20):
+                callgraph[rand.choice(nodes)].append(rand.choice(nodes))
+            reachability = CallGraphReachability(callgraph)
+            self.assertAgrees(reachability, callgraph, nodes)
+
+            for _ in range(15):
+                caller, callee = rand.choice(nodes), rand.choice(nodes)
+                reachability.addEdge(caller, callee)
+                callgraph[caller].append(callee)
+            self.assertAgrees(reachability, callgraph, nodes)
+
+    def testIncrementalFromEmpty(self):
+        reachability = CallGraphReachability()
+        self.assertTrue(reachability.addEdge("a", "b"))
+        self.assertTrue(reachability.addEdge("b", "c"))
+        self.assertFalse(reachability.addEdge("a", "c"))
+        self.assertTrue(reachability.addEdge("c", "a"))
+        self.assertTrue(reachability.sameComponent("a", "c"))
+        self.assertEqual(reachability.reachingTo("b"), {"a", "b", "c"})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,52 @@
+import ast
+import unittest
+
+from spear.analysis.alias.ir_generation.scope_scanner import ScopeScanner
+
+SOURCE = """
+import os.path
+def outer(a, b=lambda c: c):
+    global g
+    g = x = 1
+    from m import y as z
+    def inner():
+        nonlocal x
+        x = w = 2
+    class C:
+        attr = 1
+        def method(self):
+            pass
+    f = lambda: (v := 3)
+"""
+
+
+class TestScopeScanner(unittest.TestCase):
+
+    def testScopes(self):
+        tree = ast.parse(SOURCE)
+        scopes = ScopeScanner().scan(tree)
+        outer = tree.body[1]
+        default, = outer.args.defaults
+        inner, cls = outer.body[3], outer.body[4]
+        method = cls.body[1]
+        func = outer.body[5].value
+        self.assertEqual(len(scopes), 6)
+
+        self.assertEqual(scopes[outer].declaredGlobal, {"g"})
+        # the walrus inside the lambda binds in the enclosing scope as well
+        self.assertEqual(scopes[outer].boundNames, {"x", "z", "inner", "C", "f", "v"})
+        self.assertEqual(scopes[inner].declaredNonlocal, {"x"})
+        self.assertEqual(scopes[inner].boundNames, {"w"})
+        self.assertEqual(scopes[cls].boundNames, {"attr", "method"})
+        self.assertEqual(scopes[method].boundNames, set())
+        self.assertEqual(scopes[func].boundNames, {"v"})
+        self.assertEqual(scopes[default].boundNames, set())
+
+    def testScanDefinition(self):
+        func = ast.parse(SOURCE).body[1]
+        scopes = ScopeScanner().scan(func)
+        self.assertEqual(scopes[func].boundNames, {"x", "z", "inner", "C", "f", "v"})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
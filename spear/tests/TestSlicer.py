@@ -0,0 +1,43 @@
+import os
+import unittest
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.optimizer import Optimizer
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.alias.slicer import Slicer
+from spear.benchmark.engines import RESOURCES, resources
+
+
+def getCallgraph(path: str, slice: bool, optimize: bool = False):
+    module_manager = ModuleManager(path)
+    module_manager.addEntry(file="main.py")
+    if optimize:
+        Optimizer(module_manager.allCodeBlocks(nested=True)).start()
+    if slice:
+        Slicer(module_manager.allCodeBlocks(nested=True)).start()
+    analysis = Analysis()
+    analysis.analyze(module_manager.getEntrys())
+    return {k: sorted(v) for k, v in analysis.callgraph.items() if v}
+
+
+# slicing should never change the callgraph
+class TestSlicer(unittest.TestCase):
+
+    def testResources(self):
+        for path in resources():
+            with self.subTest(os.path.relpath(path, RESOURCES)):
+                self.assertEqual(getCallgraph(path, True), getCallgraph(path, False))
+                self.assertEqual(getCallgraph(path, True, optimize=True), getCallgraph(path, False))
+
+    def testRemoveStmts(self):
+        module_manager = ModuleManager(os.path.join(RESOURCES, "assignment", "tuple"))
+        module_manager.addEntry(file="main.py")
+        code_blocks = module_manager.allCodeBlocks(nested=True)
+        before = sum(len(cb.stmts) for cb in code_blocks)
+        Slicer(code_blocks).start()
+        after = sum(len(cb.stmts) for cb in code_blocks)
+        self.assertLess(after, before)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
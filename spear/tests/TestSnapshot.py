@@ -0,0 +1,89 @@
+import io
+import os
+import tempfile
+import unittest
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta import snapshot
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.alias.pta.pointers import AttrPtr
+
+resourcePath = os.path.join(os.path.dirname(__file__), "resources")
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def _analyze(self, path: str) -> Analysis:
+        module_manager = ModuleManager(os.path.join(resourcePath, path))
+        module_manager.addEntry(file="main.py")
+        analysis = Analysis()
+        analysis.analyze(module_manager.getEntrys())
+        return analysis
+
+    def _roundTrip(self, analysis: Analysis):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "result.snapshot")
+            snapshot.dumpAnalysis(analysis, path)
+            with snapshot.SnapshotReader(path) as reader:
+                callgraph = reader.export()
+                points_to = {ptr: set(reader.pointsTo(ptr)) for ptr in reader.pointers}
+        return callgraph, points_to
+
+    def testRoundTrip(self):
+        for path in ["class/method_call", "mro/diamond", "super/basic", "import/chained_import"]:
+            analysis = self._analyze(path)
+            callgraph, points_to = self._roundTrip(analysis)
+
+            expected = {k: sorted(v) for k, v in analysis.callgraph.items() if v}
+            self.assertEqual({k: sorted(v) for k, v in callgraph.items()}, expected)
+
+            for var_ptr, objs in analysis.pointToSet.varPtrSet.items():
+                self.assertTrue({str(obj) for obj in objs} <= points_to[str(var_ptr)])
+            for obj, d in analysis.pointToSet.attrPtrSet.items():
+                for attr, objs in d.items():
+                    self.assertTrue({str(o) for o in objs} <= points_to[str(AttrPtr(obj, attr))])
+
+    def testMissingName(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "result.snapshot")
+            snapshot.dumpAnalysis(self._analyze("call/call"), path)
+            with snapshot.SnapshotReader(path) as reader:
+                self.assertEqual(reader.callees("not.a.function"), [])
+                self.assertEqual(reader.pointsTo("not-a-pointer"), [])
+                self.assertEqual(reader.functions.index("__main__.func"), list(reader.functions).index("__main__.func"))
+
+    def testEmpty(self):
+        fp = io.BytesIO()
+        snapshot.dump(Analysis().pointToSet, {}, fp)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "empty.snapshot")
+            with open(path, "wb") as f:
+                f.write(fp.getvalue())
+            with snapshot.SnapshotReader(path) as reader:
+                self.assertEqual(reader.export(), {})
+                self.assertEqual(len(reader.pointers), 0)
+
+    def testNotASnapshot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bad.snapshot")
+            with open(path, "wb") as f:
+                f.write(b"\0" * 64)
+            with self.assertRaises(ValueError):
+                snapshot.SnapshotReader(path)
+
+    def testTruncated(self):
+        fp = io.BytesIO()
+        analysis = self._analyze("call/call")
+        snapshot.dump(analysis.pointToSet, analysis.callgraph, fp)
+        data = fp.getvalue()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "truncated.snapshot")
+            for size in [0, 16, len(data) // 2, len(data) - 1]:
+                with open(path, "wb") as f:
+                    f.write(data[:size])
+                with self.assertRaisesRegex(ValueError, "not a valid Spear snapshot"):
+                    snapshot.SnapshotReader(path)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
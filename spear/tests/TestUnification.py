@@ -0,0 +1,37 @@
+import os
+import unittest
+
+from spear.analysis.alias.module_manager import ModuleManager
+from spear.analysis.alias.pta.analysis import Analysis
+from spear.analysis.callgraph.unification import Unification
+from spear.benchmark.engines import RESOURCES, edges, resources
+
+
+class TestUnification(unittest.TestCase):
+
+    # every edge found by the PTA is found too
+    def testOverApproximatesPTA(self):
+        for path in resources():
+            name = os.path.relpath(path, RESOURCES)
+            module_manager = ModuleManager(path)
+            module_manager.addEntry(file="main.py")
+            analysis = Analysis()
+            analysis.analyze(module_manager.getEntrys())
+            unification = Unification()
+            unification.analyze(module_manager.getEntrys())
+
+            with self.subTest(resource=name):
+                self.assertLessEqual(edges(analysis.callgraph), edges(unification.callgraph))
+
+    def testPartition(self):
+        module_manager = ModuleManager(os.path.join(RESOURCES, "class", "self_assignment"))
+        module_manager.addEntry(file="main.py")
+        unification = Unification()
+        unification.analyze(module_manager.getEntrys())
+        partition = unification.partition()
+        # self of every method is the class itself
+        self.assertEqual(partition["self@__main__.$0.$0"], partition["self@__main__.$0.$2"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,23 @@
+class A:
+    def f(self):
+        pass
+
+
+class B:
+    def f(self):
+        pass
+
+
+def getBase():
+    return B
+
+
+Base = A
+
+
+class C(Base):
+    pass
+
+
+super(C, C).f(C)
+Base = getBase()